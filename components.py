@@ -0,0 +1,93 @@
+"""Reusable Streamlit widgets shared by the pages in app.py."""
+
+import hashlib
+
+import streamlit as st
+
+from movierec.export import FORMATS, export_bytes, result_hash
+
+PAGE_SIZES = (10, 25, 50, 100)
+
+FORMAT_LABELS = {'csv': "CSV", 'parquet': "Parquet", 'jsonl': "JSON Lines"}
+
+
+def page_bounds(total, page, page_size):
+    """Return (start, stop, page count) for 1-based ``page``, clamped to the valid range."""
+    pages = max(1, -(-total // page_size))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), pages
+
+
+def paginate(ids, key, page_size=25, page_sizes=PAGE_SIZES):
+    """Render pager controls and return the slice of ``ids`` on the current page.
+
+    ``ids`` must already be in display order. The current page lives in
+    session state under ``key`` and jumps back to the first page whenever
+    the result set changes, so a new filter never lands on an empty page.
+
+    Returns ``(page_ids, start)`` where ``start`` is the offset of the
+    first id on the page, for numbering rows.
+    """
+    page_key, size_key, signature_key = f'{key}_page', f'{key}_page_size', f'{key}_signature'
+    signature = hashlib.sha1(ids.tobytes()).hexdigest()
+    if st.session_state.get(signature_key) != signature:
+        st.session_state[signature_key] = signature
+        st.session_state[page_key] = 1
+
+    if len(ids) <= min(page_sizes):
+        return ids, 0
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if size_key not in st.session_state:
+            st.session_state[size_key] = page_size
+        size = st.selectbox("Per page", page_sizes, key=size_key)
+    _, _, pages = page_bounds(len(ids), 1, size)
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), pages)
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    start, stop, _ = page_bounds(len(ids), page, size)
+    with col3:
+        st.caption(f"Showing {start + 1}–{stop} of {len(ids)} (page {page} of {pages})")
+    return ids[start:stop], start
+
+
+def download_export(catalog, ids, key, file_stem, label="📥 Download"):
+    """Render a format picker and a download button for the movies ``ids``.
+
+    Nothing is encoded until the user asks for the file: the first click
+    prepares it (see ``movierec.export``), after which the download button
+    is shown for as long as the result set and format stay the same.
+    """
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        choice = st.selectbox("Format", [FORMAT_LABELS[fmt] for fmt in FORMATS], key=f'{key}_format',
+                              label_visibility="collapsed")
+    fmt = next(fmt for fmt in FORMATS if FORMAT_LABELS[fmt] == choice)
+    extension, mime = FORMATS[fmt]
+
+    ready_key = f'{key}_export'
+    signature = (catalog.version, result_hash(ids), fmt)
+    data = None
+    if st.session_state.get(ready_key) == signature:
+        data = export_bytes(catalog, ids, fmt)
+
+    with col2:
+        # The download button takes the prepare button's place once the file exists
+        slot = st.empty()
+        if data is None and slot.button(f"⚙️ Prepare {FORMAT_LABELS[fmt]} of {len(ids)} movies",
+                                        key=f'{key}_prepare', use_container_width=True):
+            st.session_state[ready_key] = signature
+            data = export_bytes(catalog, ids, fmt)
+        if data is not None:
+            slot.download_button(f"{label} ({FORMAT_LABELS[fmt]}, {len(data) / 1024:,.0f} KiB)", data,
+                               file_name=f"{file_stem}.{extension}", mime=mime, key=f'{key}_download',
+                               use_container_width=True)
+
+
+def static_chart(catalog, chart_id, use_container_width=True):
+    """Render a chart registered in ``movierec.charts`` from its cached figure."""
+    from movierec.charts import figure  # imports Plotly; only pages with charts pay for it
+
+    return st.plotly_chart(figure(catalog, chart_id), use_container_width=use_container_width)
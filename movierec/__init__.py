@@ -0,0 +1,6 @@
+"""Data layer for the IMDB Top 250 Movie Recommender."""
+
+from .catalog import Catalog, MultiValued, load_catalog
+from .index import InvertedIndex, intersect, union
+
+__all__ = ["Catalog", "InvertedIndex", "MultiValued", "intersect", "load_catalog", "union"]
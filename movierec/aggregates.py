@@ -0,0 +1,92 @@
+"""Summary tables behind the Home and Analytics pages.
+
+All tables are derived from the catalog's typed columns and computed once
+per dataset version; ``get_aggregates`` serves them from a small cache
+keyed by ``catalog.version``.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+
+# Number of dataset versions kept in the cache (current + the one being replaced)
+MAX_VERSIONS = 2
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _ranked(values, labels, name):
+    """Series of ``values`` indexed by ``labels``, largest first (ties alphabetical)."""
+    series = pd.Series(values, index=pd.Index(labels, name=name))
+    return series.sort_values(ascending=False, kind='stable')
+
+
+class Aggregates:
+    """Precomputed tables for one dataset version."""
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.total_movies = len(catalog)
+
+        rating = np.asarray(catalog.rating, dtype=np.float64)
+        self.rating_stats = {
+            'mean': float(rating.mean()) if len(rating) else 0.0,
+            'median': float(np.median(rating)) if len(rating) else 0.0,
+            'std': float(rating.std(ddof=1)) if len(rating) > 1 else 0.0,
+            'min': float(rating.min()) if len(rating) else 0.0,
+            'max': float(rating.max()) if len(rating) else 0.0,
+        }
+        self.year_range = (int(catalog.year.min()), int(catalog.year.max())) if len(catalog) else (0, 0)
+
+        years, year_counts = np.unique(catalog.year, return_counts=True)
+        self.movies_per_year = pd.DataFrame({'year': years, 'count': year_counts})
+
+        decades, decade_codes, decade_counts = np.unique(catalog.decade, return_inverse=True, return_counts=True)
+        self.decade_counts = pd.Series(decade_counts, index=pd.Index(decades, name='decade'), name='count')
+        self.decade_rating = pd.DataFrame({
+            'decade': decades,
+            'rating': np.bincount(decade_codes, weights=rating, minlength=len(decades)) / decade_counts,
+        })
+
+        genres = catalog.genres
+        self.unique_genres = len(genres.vocab)
+        self.genre_counts = _ranked(genres.counts(), genres.vocab, 'genre')
+
+        # A combination is the set of genres on a movie, regardless of listing order
+        combos = [
+            ', '.join(sorted(genres.vocab[genres.codes[genres.offsets[i]:genres.offsets[i + 1]]]))
+            for i in range(len(genres))
+        ]
+        combo_counts = pd.Series(combos, dtype=object).value_counts()
+        self.genre_combinations = combo_counts.rename_axis('Genre Combination').reset_index(name='Count')
+
+        directors = catalog.directors
+        counts = directors.counts()
+        sums = np.bincount(directors.codes, weights=rating[directors.row_ids], minlength=len(directors.vocab))
+        self.director_counts = _ranked(counts, directors.vocab, 'director')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = sums / counts
+        self.director_ratings = pd.DataFrame({'count': counts, 'average': averages},
+                                             index=pd.Index(directors.vocab, name='director'))
+
+    def top_directors_by_rating(self, n=10, min_movies=2):
+        eligible = self.director_ratings[self.director_ratings['count'] >= min_movies]
+        return eligible['average'].sort_values(ascending=False, kind='stable').head(n)
+
+
+def get_aggregates(catalog):
+    """Return the Aggregates for ``catalog``, computing them on first use of its version."""
+    key = catalog.version or id(catalog)
+    with _lock:
+        aggregates = _cache.get(key)
+        if aggregates is None:
+            with metrics.timer('movierec_aggregates_seconds'):
+                aggregates = Aggregates(catalog)
+            _cache[key] = aggregates
+            while len(_cache) > MAX_VERSIONS:
+                _cache.pop(next(iter(_cache)))
+        return aggregates
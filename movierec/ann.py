@@ -0,0 +1,318 @@
+"""Approximate nearest-neighbour search over dense movie embeddings.
+
+Every movie becomes a unit vector of ``DIM`` floats: the same TF-IDF
+genre, director and star blocks and one-hot decade and runtime blocks as
+``movierec.similarity``, each randomly projected (two signed buckets per
+label) into a shared space, plus two dimensions placing the rating on a
+quarter circle. Quiz answers and sets of movies are embedded the same way,
+so one index answers "more like this movie", "in between these movies"
+and "close to these answers".
+
+The index is an inverted file (IVF): spherical k-means splits the
+vectors into about ``sqrt(n)`` lists stored contiguously, and a query
+scores only the ``nprobe`` lists whose centroids are closest. Build cost is
+a few k-means passes instead of the all-pairs comparison of the exact
+similarity index, and query cost grows with ``sqrt(n)``, not ``n``.
+``exact`` brute-forces the same vectors for recall measurements (see
+``movierec.bench``).
+"""
+
+import os
+import tempfile
+from functools import cached_property
+
+import numpy as np
+from scipy import sparse
+
+from . import metrics
+from .engine import DURATIONS, MOOD_GENRES, STORY_GENRES
+from .similarity import (BLOCK_WEIGHTS, FEATURE_COLUMNS, MAX_BLOCK_CELLS, RUNTIME_BINS, _normalize_rows,
+                         _one_hot_block, _tfidf_block, fingerprint)
+
+DIM = 64
+HASHES = 2  # buckets each label is spread over
+RATING_WEIGHT = 0.3
+
+# Lists probed per query unless the caller asks otherwise; see the recall table of movierec.bench
+NPROBE = 32
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 64  # training points per list
+
+# The embedding also reads the rating, which the neighbour table does not
+VECTOR_COLUMNS = FEATURE_COLUMNS + ('rating',)
+
+
+def _projection(size, seed):
+    """(size x DIM - 2) sparse random projection; the first two dimensions hold the rating."""
+    rng = np.random.default_rng(seed)
+    buckets = rng.integers(2, DIM, (size, HASHES))
+    signs = rng.choice([-1.0, 1.0], (size, HASHES)) / np.sqrt(HASHES)
+    rows = np.repeat(np.arange(size), HASHES)
+    return sparse.csr_matrix((signs.ravel(), (rows, buckets.ravel())), shape=(size, DIM))
+
+
+class Embedder:
+    """Maps movies and queries into the DIM-dimensional embedding space of one catalog."""
+
+    def __init__(self, catalog, seed=0):
+        self.catalog = catalog
+        self.decades, self.decade_codes = np.unique(catalog.decade, return_inverse=True)
+        self.runtime_codes = np.where(catalog.minutes >= 0,
+                                      np.searchsorted(RUNTIME_BINS, catalog.minutes, side='right'), -1)
+        self.blocks = {
+            'genres': len(catalog.genres.vocab),
+            'directors': len(catalog.directors.vocab),
+            'stars': len(catalog.stars.vocab),
+            'decade': len(self.decades),
+            'runtime': len(RUNTIME_BINS) + 1,
+        }
+        self.projections = {name: _projection(size, seed + i) for i, (name, size) in enumerate(self.blocks.items())}
+        n = len(catalog)
+        self.idf = {
+            name: np.log((1 + n) / (1 + getattr(catalog, name).counts())) + 1.0
+            for name in ('genres', 'directors', 'stars')
+        }
+        rating = catalog.rating
+        self.rating_range = (float(rating.min()), float(rating.max())) if n else (0.0, 1.0)
+
+    def _rating(self, ratings):
+        low, high = self.rating_range
+        angle = (np.asarray(ratings, dtype=np.float64) - low) / ((high - low) or 1.0) * np.pi / 2
+        return np.stack([np.cos(angle), np.sin(angle)], axis=-1) * np.sqrt(RATING_WEIGHT)
+
+    def _combine(self, blocks, ratings):
+        """Project row-normalized sparse ``blocks`` and add the rating dimensions."""
+        vectors = sum(
+            (_normalize_rows(block) * np.sqrt(BLOCK_WEIGHTS[name])) @ self.projections[name]
+            for name, block in blocks.items()
+        )
+        vectors = vectors.toarray()
+        if ratings is not None:
+            vectors[:, :2] = self._rating(ratings)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def movies(self):
+        """(movies x DIM) unit embeddings, in id order."""
+        catalog = self.catalog
+        blocks = {
+            'genres': _tfidf_block(catalog.genres),
+            'directors': _tfidf_block(catalog.directors),
+            'stars': _tfidf_block(catalog.stars),
+            'decade': _one_hot_block(self.decade_codes, self.blocks['decade']),
+            'runtime': _one_hot_block(self.runtime_codes, self.blocks['runtime']),
+        }
+        return self._combine(blocks, catalog.rating)
+
+    def query(self, labels, rating=None):
+        """Embed ``labels`` ({block: vocabulary codes}) and an optional rating as one unit vector."""
+        blocks = {}
+        for name, codes in labels.items():
+            codes = np.unique(np.asarray(codes, dtype=np.int64))
+            codes = codes[codes >= 0]
+            if len(codes):
+                weights = self.idf[name][codes] if name in self.idf else np.ones(len(codes))
+                blocks[name] = sparse.csr_matrix((weights, (np.zeros(len(codes)), codes)),
+                                                 shape=(1, self.blocks[name]))
+        if not blocks and rating is None:
+            return np.zeros(DIM, dtype=np.float32)
+        if not blocks:
+            blocks = {'genres': sparse.csr_matrix((1, self.blocks['genres']))}
+        return self._combine(blocks, None if rating is None else [rating])[0]
+
+    def answers(self, answers):
+        """Embed Movie Quiz answers: the genres, era, length, minimum rating and people asked for."""
+        catalog = self.catalog
+        genres = catalog.index['genres']
+        terms = list(MOOD_GENRES.get(answers.get('mood'), []))
+        for story in answers.get('story_type') or []:
+            terms += STORY_GENRES.get(story, [])
+        labels = {'genres': [catalog.genres.code(label) for label in genres.resolve(terms)]}
+
+        era = catalog.era_code(answers.get('era'))
+        if era >= 0:
+            _, first, last = catalog.eras[era]
+            decades = (self.decades >= (first // 10 * 10 if first is not None else -np.inf)) \
+                & (self.decades <= (last if last is not None else np.inf))
+            labels['decade'] = np.flatnonzero(decades)
+
+        bounds = DURATIONS.get(answers.get('duration'))
+        if bounds is not None:
+            low, high = bounds
+            first = np.searchsorted(RUNTIME_BINS, low, side='right')
+            last = np.searchsorted(RUNTIME_BINS, high, side='right') if high is not None else len(RUNTIME_BINS)
+            labels['runtime'] = np.arange(first, last + 1)
+
+        director = answers.get('director')
+        if director and director != "Any":
+            labels['directors'] = [catalog.directors.code(director)]
+
+        actor = (answers.get('actor') or '').strip()
+        if actor:
+            labels['stars'] = [catalog.stars.code(label) for label in catalog.search_index.people('stars', actor)]
+
+        # Aim between the minimum asked for and the best rating in the catalog
+        min_rating = answers.get('rating')
+        rating = None if min_rating is None else (max(min_rating, self.rating_range[0]) + self.rating_range[1]) / 2
+        return self.query(labels, rating)
+
+
+def _assign(vectors, centroids):
+    """Index of the closest centroid of every vector, in blocks to bound memory."""
+    assignment = np.zeros(len(vectors), dtype=np.int32)
+    block = max(1, MAX_BLOCK_CELLS // max(len(centroids), 1))
+    for start in range(0, len(vectors), block):
+        assignment[start:start + block] = np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+    return assignment
+
+
+def kmeans(vectors, lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """Spherical k-means; returns (lists x DIM) unit centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _assign(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=lists)
+        used = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[used]
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+        empty = np.flatnonzero(counts == 0)
+        centroids[used] = sums
+        # Restart empty lists from random points
+        centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids /= norms
+    return centroids.astype(np.float32)
+
+
+def _top(ids, scores, k):
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return ids[top].astype(np.int32), scores[top]
+
+
+class AnnIndex:
+    """IVF index over the embeddings of every movie in a catalog.
+
+    ``vectors`` are stored grouped by list: list ``l`` holds rows
+    ``offsets[l]:offsets[l + 1]``, whose movie ids are the same slice of
+    ``ids``.
+    """
+
+    def __init__(self, catalog, centroids, offsets, ids, vectors, nprobe=NPROBE):
+        self.catalog = catalog
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+        self.nprobe = nprobe
+
+    @classmethod
+    def build(cls, catalog, lists=None, seed=0, **options):
+        vectors = Embedder(catalog).movies()
+        n = len(vectors)
+        lists = max(1, min(lists or int(round(np.sqrt(n))), n))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, min(n, lists * KMEANS_SAMPLE), replace=False)] if n else vectors
+        centroids = kmeans(sample, lists, seed=seed) if n else np.zeros((1, DIM), dtype=np.float32)
+
+        assignment = _assign(vectors, centroids)
+        ids = np.argsort(assignment, kind='stable').astype(np.int32)
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=offsets[1:])
+        return cls(catalog, centroids, offsets, ids, vectors[ids], **options)
+
+    @classmethod
+    def load(cls, path, catalog, **options):
+        """Load an index saved by ``save``; returns None if missing or built for other data."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if str(data['fingerprint']) != fingerprint(catalog, VECTOR_COLUMNS) or data['vectors'].shape[1] != DIM:
+                return None
+            return cls(catalog, data['centroids'], data['offsets'], data['ids'], data['vectors'], **options)
+
+    @classmethod
+    def load_or_build(cls, path, catalog, **options):
+        index = cls.load(path, catalog, **options)
+        if index is None:
+            index = cls.build(catalog, **options)
+            index.save(path)
+        return index
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as f:
+            np.savez(f, centroids=self.centroids, offsets=self.offsets, ids=self.ids, vectors=self.vectors,
+                     fingerprint=fingerprint(self.catalog, VECTOR_COLUMNS))
+        os.replace(f.name, path)
+
+    @property
+    def lists(self):
+        return len(self.centroids)
+
+    @cached_property
+    def embedder(self):
+        return Embedder(self.catalog)
+
+    @cached_property
+    def positions(self):
+        """Row of every movie id in ``vectors``."""
+        positions = np.empty(len(self.ids), dtype=np.int64)
+        positions[self.ids] = np.arange(len(self.ids))
+        return positions
+
+    def vector(self, movie_ids):
+        """Unit mean of the embeddings of ``movie_ids``."""
+        vector = self.vectors[self.positions[np.asarray(movie_ids)]].mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @metrics.timer('movierec_ann_seconds')
+    def search(self, query, k=10, nprobe=None, exclude=()):
+        """(ids, cosine scores) of about the ``k`` movies closest to ``query``, searching ``nprobe`` lists."""
+        nprobe = min(nprobe or self.nprobe, self.lists)
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        # Lists are contiguous, so each one is scored straight from a slice
+        bounds = list(zip(self.offsets[probe], self.offsets[probe + 1]))
+        ids = np.concatenate([self.ids[a:b] for a, b in bounds])
+        scores = np.concatenate([self.vectors[a:b] @ query for a, b in bounds])
+        if len(exclude):
+            keep = ~np.isin(ids, exclude)
+            ids, scores = ids[keep], scores[keep]
+        return _top(ids, scores, k)
+
+    def exact(self, query, k=10, exclude=()):
+        """Brute-force counterpart of ``search``, scoring every movie."""
+        scores = self.vectors @ query
+        scores[self.positions[np.asarray(exclude, dtype=np.int64)]] = -np.inf
+        return _top(self.ids, scores, min(k, len(scores) - len(exclude)))
+
+    def similar_ids(self, movie_id, k=10):
+        """Return (ids, scores) of the ``k`` movies most similar to ``movie_id``."""
+        return self.search(self.vector([movie_id]), k, exclude=[movie_id])
+
+    def similar(self, title, k=10):
+        """Movies most similar to ``title`` as catalog rows with a ``similarity`` column."""
+        movie_id = self.catalog.find(title)
+        if movie_id < 0:
+            raise KeyError(f"Unknown movie title: {title!r}")
+        ids, scores = self.similar_ids(movie_id, k)
+        result = self.catalog.df.iloc[ids].copy()
+        result['similarity'] = scores
+        return result
+
+    def between_ids(self, movie_ids, k=10):
+        """Movies closest to all of ``movie_ids`` at once, excluding them."""
+        return self.search(self.vector(movie_ids), k, exclude=movie_ids)
+
+    def answer_ids(self, answers, k=10, exclude=()):
+        """Movies closest to the Movie Quiz ``answers``."""
+        return self.search(self.embedder.answers(answers), k, exclude=exclude)
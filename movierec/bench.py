@@ -0,0 +1,297 @@
+"""Benchmarks for every page's data path on synthetic catalogs.
+
+Each size gets a fresh synthetic catalog (see ``movierec.synthetic``).
+The one-off startup work (aggregates, search index, quiz engine,
+similarity index) is timed once; the per-rerun queries of each page are
+timed over ``--repeat`` calls with varied, seeded inputs. Results go to a
+JSON file that can be compared with one from another commit::
+
+    python -m movierec.bench --sizes 10000 100000 1000000 --output new.json
+    python -m movierec.bench --sizes 10000 --baseline old.json
+
+Latencies are per call in milliseconds. The peak memory of a query is
+the largest traced allocation (NumPy buffers included) during one call.
+The ANN index is also swept over ``NPROBES``, reporting its recall@10
+against exact search over the same embeddings next to the latency of both.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import core
+from .aggregates import Aggregates
+from .ann import AnnIndex
+from .catalog import load_catalog, peak_rss
+from .compare import Comparison
+from .engine import DURATIONS, MOOD_GENRES, STORY_GENRES, QuizEngine
+from .pipeline import FilterPipeline, filter_ids
+from .ranked import get_ranked
+from .similarity import SimilarityIndex
+from .synthetic import synthetic_catalog
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# The similarity build compares every movie with every other one; beyond
+# this size it takes too long to run as part of the suite.
+SIMILARITY_LIMIT = core.EXACT_SIMILARITY_LIMIT
+
+# Lists probed in the ANN recall-vs-latency sweep
+NPROBES = (1, 4, 16, 32, 64, 128)
+
+SORTS = (('rating', True), ('year', False), ('title', False), (None, False))
+
+
+def _percentiles(times):
+    times = np.asarray(times) * 1000
+    return {
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'p99_ms': float(np.percentile(times, 99)),
+        'mean_ms': float(times.mean()),
+        'max_ms': float(times.max()),
+    }
+
+
+def _peak_memory(call):
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(call, inputs, repeat):
+    """Time ``call(*inputs[i % len(inputs)])`` ``repeat`` times after one warm-up call."""
+    call(*inputs[0])
+    times = []
+    for i in range(repeat):
+        args = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        call(*args)
+        times.append(time.perf_counter() - start)
+    result = _percentiles(times)
+    result['calls'] = repeat
+    result['throughput_per_s'] = repeat / sum(times) if sum(times) else float('inf')
+    result['peak_bytes'] = _peak_memory(lambda: call(*inputs[0]))
+    return result
+
+
+def measure_once(build):
+    """Time a single call of ``build``; returns (result, timing).
+
+    Startup work is mostly Python-level, which tracing would slow down
+    several times, so its memory is the growth of the process's peak RSS.
+    """
+    rss = peak_rss()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    return result, {'seconds': elapsed, 'peak_rss_growth_bytes': peak_rss() - rss}
+
+
+def _quiz_answers(catalog, rng, count):
+    directors = catalog.directors.vocab[np.argsort(-catalog.directors.counts(), kind='stable')[:50]]
+    stars = catalog.stars.vocab[np.argsort(-catalog.stars.counts(), kind='stable')[:50]]
+    answers = []
+    for _ in range(count):
+        answers.append(({
+            'mood': rng.choice(list(MOOD_GENRES)),
+            'story_type': list(rng.choice(list(STORY_GENRES), size=rng.integers(0, 3), replace=False)),
+            'duration': rng.choice(list(DURATIONS)),
+            'era': rng.choice(catalog.era_labels + ["Any era"]),
+            'rating': float(rng.choice([8.0, 8.5, 9.0])),
+            'director': str(rng.choice(directors)) if rng.random() < 0.3 else "Any",
+            'actor': str(rng.choice(stars)).split()[-1] if rng.random() < 0.3 else "",
+        },))
+    return answers
+
+
+def _find_filters(catalog, rng, count, text):
+    genres = catalog.genres.vocab[np.argsort(-catalog.genres.counts(), kind='stable')[:20]]
+    first, last = int(catalog.year.min()), int(catalog.year.max())
+    filters = []
+    for _ in range(count):
+        lo = int(rng.integers(first, last + 1))
+        sort_by, descending = SORTS[rng.integers(len(SORTS))]
+        filters.append(({
+            'genres': list(rng.choice(genres, size=rng.integers(0, 4), replace=False)),
+            'match_all': bool(rng.random() < 0.5),
+            'years': (lo, int(rng.integers(lo, last + 1))),
+            'min_rating': float(rng.choice([0.0, 8.0, 8.5])),
+            'search': str(rng.choice(text)) if rng.random() < 0.3 else '',
+            'sort_by': sort_by,
+            'descending': descending,
+        },))
+    return filters
+
+
+def _typo(word, rng):
+    if len(word) < 5:
+        return word
+    i = int(rng.integers(1, len(word) - 1))
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def _queries(catalog, rng, count):
+    """Search strings: title words, partial titles, people and misspellings of them."""
+    queries = []
+    for _ in range(count):
+        movie = int(rng.integers(len(catalog)))
+        words = catalog.title[movie].split()
+        kind = rng.integers(4)
+        if kind == 0:
+            queries.append(' '.join(words[:2]))
+        elif kind == 1:
+            queries.append(_typo(max(words, key=len), rng))
+        else:
+            people = catalog.stars.row(movie) if kind == 2 else catalog.directors.row(movie)
+            queries.append(people[0].split()[-1] if people else words[0])
+    return queries
+
+
+def ann_recall(index, movies, k=10, nprobes=NPROBES):
+    """Recall@k and latency of the ANN index per nprobe, and of exact search, on "more like this" queries."""
+    queries = [(index.vector([i]), [i]) for i in movies]
+    truth = [index.exact(query, k, exclude)[0] for query, exclude in queries]
+    timing = measure(lambda query, exclude: index.exact(query, k, exclude), queries, len(queries))
+    rows = [{'nprobe': None, 'recall': 1.0, 'p50_ms': timing['p50_ms'], 'mean_ms': timing['mean_ms']}]
+    for nprobe in nprobes:
+        if nprobe > index.lists:
+            break
+        found = [index.search(query, k, nprobe, exclude)[0] for query, exclude in queries]
+        recall = np.mean([len(np.intersect1d(a, b)) / max(len(b), 1) for a, b in zip(found, truth)])
+        timing = measure(lambda query, exclude: index.search(query, k, nprobe, exclude), queries, len(queries))
+        rows.append({'nprobe': nprobe, 'recall': float(recall), 'p50_ms': timing['p50_ms'],
+                     'mean_ms': timing['mean_ms']})
+    return rows
+
+
+def bench_size(n, template, repeat, seed=0, log=print):
+    """Run every case on a synthetic catalog of ``n`` movies."""
+    rng = np.random.default_rng(seed)
+    results = {'size': n, 'startup': {}, 'cases': {}}
+
+    catalog, results['startup']['synthetic catalog'] = measure_once(lambda: synthetic_catalog(n, template, seed))
+    _, results['startup']['search index'] = measure_once(lambda: catalog.search_index)
+    engine, results['startup']['quiz engine'] = measure_once(lambda: QuizEngine(catalog))
+    aggregates, results['startup']['aggregates'] = measure_once(lambda: Aggregates(catalog))
+    _, results['startup']['ranked lists'] = measure_once(lambda: get_ranked(catalog))
+    ann, results['startup']['ann index'] = measure_once(lambda: AnnIndex.build(catalog))
+    similarity = None
+    if n <= SIMILARITY_LIMIT:
+        similarity, results['startup']['similarity index'] = measure_once(lambda: SimilarityIndex.build(catalog))
+    for name, timing in results['startup'].items():
+        log(f"  startup  {name:<28} {timing['seconds'] * 1000:10.1f} ms")
+
+    queries = _queries(catalog, rng, 100)
+    directors = [str(d) for d in rng.choice(catalog.directors.vocab, 50)]
+    genres = [str(g) for g in rng.choice(catalog.genres.vocab, 50)]
+    decades = [int(d) for d in rng.choice(np.unique(catalog.decade), 50)]
+    movies = [int(i) for i in rng.integers(0, len(catalog), 100)]
+    pipeline = FilterPipeline(catalog)
+
+    cases = {
+        'quiz/recommend': (lambda answers: engine.recommend(answers, k=10), _quiz_answers(catalog, rng, 50)),
+        'find/filter': (lambda filters: filter_ids(catalog, **filters), _find_filters(catalog, rng, 50, queries)),
+        'find/filter (memoized)': (lambda filters: pipeline.run(**filters), _find_filters(catalog, rng, 10, queries)),
+        'find/search': (lambda q: catalog.search_index.search(q, limit=100), [(q,) for q in queries]),
+        'find/suggest': (lambda q: catalog.search_index.suggest(q[:3]), [(q,) for q in queries]),
+        'analytics/top directors': (lambda: aggregates.top_directors_by_rating(10, 2), [()]),
+        'top/rating': (lambda: core.top_ids(catalog, 'rating', n=100), [()]),
+        'top/decade': (lambda d: core.top_ids(catalog, 'decade', d, n=100), [(d,) for d in decades]),
+        'top/genre': (lambda g: core.top_ids(catalog, 'genre', g, n=100), [(g,) for g in genres]),
+        'top/director': (lambda d: core.top_ids(catalog, 'director', d, n=100), [(d,) for d in directors]),
+        'top/genre x decade': (lambda g, d: core.top_ids(catalog, 'genre', g, n=100, decade=d),
+                               list(zip(genres, decades))),
+        'compare/lookup': (lambda i: catalog.find(catalog.titles.label(i)), [(i,) for i in movies]),
+        'compare/matrix (2)': (lambda i, j: Comparison(catalog, [i, j]).similarity, list(zip(movies, movies[::-1]))),
+        'compare/matrix (20)': (lambda i: Comparison(catalog, movies[i:i + 20]).similarity, [(i,) for i in range(50)]),
+    }
+    if similarity is not None:
+        cases['compare/similar'] = (lambda i: similarity.similar_ids(i, 10), [(i,) for i in movies])
+    cases['compare/similar (ann)'] = (lambda i: ann.similar_ids(i, 10), [(i,) for i in movies])
+    cases['compare/between (ann)'] = (lambda i, j: ann.between_ids([i, j], 10), list(zip(movies, movies[::-1])))
+    cases['quiz/nearby (ann)'] = (lambda answers: ann.answer_ids(answers, 10), _quiz_answers(catalog, rng, 50))
+
+    for name, (call, inputs) in cases.items():
+        result = measure(call, inputs, repeat)
+        results['cases'][name] = result
+        log(f"  {name:<37} p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms"
+            f"  {result['throughput_per_s']:10.0f}/s  {result['peak_bytes'] / 1e6:8.1f} MB")
+
+    results['ann'] = ann_recall(ann, movies)
+    for row in results['ann']:
+        label = 'exact' if row['nprobe'] is None else f"nprobe {row['nprobe']}"
+        log(f"  ann {label:<33} recall@10 {row['recall']:6.3f}  p50 {row['p50_ms']:9.3f} ms")
+
+    results['memory_usage'] = catalog.memory_usage()
+    results['peak_rss_bytes'] = peak_rss()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, repeat=200, seed=0, log=print):
+    template = load_catalog()
+    report = {
+        'commit': _git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': [],
+    }
+    for n in sizes:
+        log(f"{n:,} movies")
+        report['results'].append(bench_size(n, template, repeat, seed, log))
+    return report
+
+
+def compare(report, baseline, log=print):
+    """Print the p50 change of every case present in both reports."""
+    old = {(r['size'], name): case for r in baseline['results'] for name, case in r['cases'].items()}
+    log(f"p50 vs baseline {baseline.get('commit')}:")
+    for r in report['results']:
+        for name, case in r['cases'].items():
+            before = old.get((r['size'], name))
+            if before and before['p50_ms']:
+                change = case['p50_ms'] / before['p50_ms'] - 1
+                log(f"  {r['size']:>9,} {name:<37} {before['p50_ms']:9.3f} -> {case['p50_ms']:9.3f} ms ({change:+.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=200, help="timed calls per case")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""Typed movie catalog built once from the scraped CSV.
+
+The CSV stores runtimes as strings ("2h 22m") and genres, directors and
+stars as comma-joined strings. Everything the pages filter on is parsed
+here into NumPy columns so a rerun never touches those strings again.
+"""
+
+import hashlib
+import mmap
+import sys
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .index import InvertedIndex
+from .search import SearchIndex
+from .titles import TitleIndex
+
+DATA_PATH = 'imdb_top_250_movies_with_ratings.csv'
+
+MULTI_VALUED = ('genres', 'directors', 'stars')
+
+# Era buckets used by the quiz, as (label, first year, last year)
+ERAS = (
+    ("Classic (Before 1980)", None, 1979),
+    ("Golden Age (1980-1999)", 1980, 1999),
+    ("Modern (2000-2009)", 2000, 2009),
+    ("Recent (2010+)", 2010, None),
+)
+
+
+def parse_minutes(durations):
+    """Convert runtimes like '2h 22m', '2h' or '45m' into integer minutes (-1 if unknown)."""
+    parts = pd.Series(durations, dtype=object).astype(str).str.extract(r'^\s*(?:(\d+)h)?\s*(?:(\d+)m)?\s*$')
+    hours = pd.to_numeric(parts[0], errors='coerce')
+    minutes = pd.to_numeric(parts[1], errors='coerce')
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    total[hours.isna() & minutes.isna()] = -1
+    return total.to_numpy(dtype=np.int32)
+
+
+def era_codes(years):
+    """Map release years to indexes into ERAS."""
+    bounds = np.array([first for _, first, _ in ERAS[1:]])
+    return np.searchsorted(bounds, years, side='right').astype(np.int8)
+
+
+class MultiValued:
+    """A comma-joined column exploded into CSR form.
+
+    Row ``i`` holds the label ids ``codes[offsets[i]:offsets[i + 1]]``, which
+    index into the sorted ``vocab`` array.
+    """
+
+    def __init__(self, vocab, offsets, codes):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.codes = codes
+
+    @classmethod
+    def from_strings(cls, values, sep=','):
+        rows = [
+            [item.strip() for item in str(value).split(sep) if item.strip()]
+            if isinstance(value, str) and value != 'N/A' else []
+            for value in values
+        ]
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        flat = [item for row in rows for item in row]
+        vocab, codes = np.unique(np.array(flat, dtype=object), return_inverse=True)
+        return cls(vocab, offsets, codes.astype(np.int32))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @property
+    def row_ids(self):
+        """Row index of every entry in ``codes``."""
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.lengths)
+
+    def code(self, label):
+        """Return the id of ``label``, or -1 if it never occurs."""
+        # Binary search of the sorted vocabulary: a dict over it would cost every process
+        # ~100 bytes per label, more than the mapped codes themselves
+        if not isinstance(label, str):
+            return -1
+        i = int(np.searchsorted(self.vocab, label))
+        return i if i < len(self.vocab) and self.vocab[i] == label else -1
+
+    def row(self, i):
+        return self.vocab[self.codes[self.offsets[i]:self.offsets[i + 1]]].tolist()
+
+    def counts(self):
+        """Number of rows each label appears in."""
+        return np.bincount(self.codes, minlength=len(self.vocab))
+
+
+class Catalog:
+    """Read-only movie table with pre-parsed, typed columns.
+
+    ``df`` keeps the original string columns for display and gains
+    ``minutes``, ``decade`` and ``era`` columns; the same data is exposed as
+    NumPy arrays for filtering. Row positions double as movie ids, and
+    ``index`` holds an ``InvertedIndex`` per multi-valued column, and
+    ``version`` identifies the source data (None if unknown).
+    """
+
+    def __init__(self, df, version=None):
+        df = df.reset_index(drop=True)
+        self._setup(
+            df,
+            year=df['year'].to_numpy(dtype=np.int32),
+            rating=df['rating'].to_numpy(dtype=np.float64),
+            minutes=parse_minutes(df['duration']),
+            genres=MultiValued.from_strings(df['genres']),
+            directors=MultiValued.from_strings(df['directors']),
+            stars=MultiValued.from_strings(df['stars']),
+            version=version,
+        )
+
+    @classmethod
+    def from_columns(cls, df, year, rating, minutes, genres, directors, stars, version=None,
+                     decade=None, era=None, index=None):
+        """Build a catalog from already-parsed columns, skipping all string parsing.
+
+        ``decade``, ``era`` and the inverted ``index`` are derived from the
+        other columns when not given.
+        """
+        catalog = cls.__new__(cls)
+        catalog._setup(df, year, rating, minutes, genres, directors, stars, version, decade, era, index)
+        return catalog
+
+    def _setup(self, df, year, rating, minutes, genres, directors, stars, version,
+               decade=None, era=None, index=None):
+        self.version = version
+        self.title = df['title'].astype(str).to_numpy(dtype=object)
+        self.year = year
+        self.rating = rating
+        self.minutes = minutes
+        self.decade = decade if decade is not None else (self.year // 10 * 10).astype(np.int32)
+        self.era = era if era is not None else era_codes(self.year)
+
+        self.genres = genres
+        self.directors = directors
+        self.stars = stars
+        if index is None:
+            index = {name: InvertedIndex(getattr(self, name)) for name in MULTI_VALUED}
+        self.index = index
+
+        for name in ('minutes', 'decade'):
+            # A frame built around memory-mapped columns already holds them; assigning would copy
+            if name not in df or not np.may_share_memory(df[name].to_numpy(), getattr(self, name)):
+                df[name] = getattr(self, name)
+        df['era'] = np.array([label for label, _, _ in ERAS], dtype=object)[self.era]
+        self.df = df
+
+        # The catalog is shared by every session, so make accidental writes fail loudly
+        for array in self._arrays().values():
+            array.flags.writeable = False
+
+    eras = ERAS
+
+    def __len__(self):
+        return len(self.title)
+
+    @property
+    def ids(self):
+        return np.arange(len(self), dtype=np.int32)
+
+    @property
+    def era_labels(self):
+        return [label for label, _, _ in self.eras]
+
+    @cached_property
+    def search_index(self):
+        """Text search over titles and people, built on first use."""
+        return SearchIndex(self)
+
+    @cached_property
+    def titles(self):
+        """Unique "Title (Year)" labels and title lookups, built on first use."""
+        return TitleIndex(self)
+
+    def _arrays(self):
+        arrays = {name: getattr(self, name) for name in ('title', 'year', 'rating', 'minutes', 'decade', 'era')}
+        for name in MULTI_VALUED:
+            column, index = getattr(self, name), self.index[name]
+            arrays[f'{name}.vocab'] = column.vocab
+            arrays[f'{name}.offsets'] = column.offsets
+            arrays[f'{name}.codes'] = column.codes
+            arrays[f'{name}.postings'] = index.postings
+            arrays[f'{name}.postings_offsets'] = index.offsets
+        return arrays
+
+    def memory_usage(self):
+        """Approximate bytes held by each part of the catalog."""
+        usage = {
+            'display frame': int(self.df.memory_usage(deep=True).sum()),
+            'typed columns': 0,
+            'multi-valued columns': 0,
+            'inverted indexes': 0,
+        }
+        for name, array in self._arrays().items():
+            size = array.nbytes
+            if array.dtype == object:
+                size += sum(sys.getsizeof(value) for value in array)
+            if name.endswith(('postings', 'postings_offsets')):
+                usage['inverted indexes'] += size
+            elif '.' in name:
+                usage['multi-valued columns'] += size
+            else:
+                usage['typed columns'] += size
+        return usage
+
+    def mapped_bytes(self):
+        """Bytes of the arrays memory-mapped from the columnar store, shared by every process mapping them."""
+        return sum(array.nbytes for array in self._arrays().values() if is_mapped(array))
+
+    def sort(self, ids, by, descending=False):
+        """Return ``ids`` ordered by the ``by`` column; ties keep their current order."""
+        values = getattr(self, by)[ids]
+        if descending:
+            if values.dtype == object:
+                # Strings can't be negated; their ranks can (reversing the sort would reverse ties too)
+                values = np.unique(values, return_inverse=True)[1]
+            values = -values
+        return ids[np.argsort(values, kind='stable')]
+
+    def find(self, title):
+        """Return the id of the movie labelled ``title`` ("Heat (1995)"), else of the first one called ``title``, or -1."""
+        return self.titles.find(title)
+
+    def era_code(self, label):
+        """Return the index of an era label, or -1 for "Any era" and unknown labels."""
+        return self.era_labels.index(label) if label in self.era_labels else -1
+
+
+def is_mapped(array):
+    """Whether ``array`` is a view of a memory-mapped file rather than private memory."""
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents, used as the dataset version."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_catalog(path=DATA_PATH):
+    """Parse the CSV at ``path`` into a Catalog."""
+    return Catalog(pd.read_csv(path), version=file_digest(path))
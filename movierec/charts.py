@@ -0,0 +1,171 @@
+"""Static charts of the Home and Analytics pages, built once per dataset version.
+
+A chart whose data depends only on the dataset is registered here under
+an id such as ``'analytics/genre share'``. ``figure`` builds it on first
+use and keeps the figure under the dataset version, the chart id and the
+Plotly template, so later renders (in any session) skip the aggregation
+and the Plotly Express build and only serialize it. ``warm`` builds them
+all ahead of time when the app loads a new dataset version in the
+background. Charts that depend on user input, like those of Compare
+Movies, are still built by the page on each rerun.
+"""
+
+import threading
+from collections import OrderedDict
+
+import plotly.express as px
+import plotly.io as pio
+
+from . import metrics
+from .aggregates import MAX_VERSIONS, get_aggregates
+
+CHARTS = {}
+
+_cache = OrderedDict()  # dataset version -> {(chart id, template): Figure}
+_lock = threading.Lock()
+
+
+def chart(chart_id):
+    """Register ``build(catalog, aggregates) -> Figure`` as the static chart ``chart_id``."""
+    def register(build):
+        CHARTS[chart_id] = build
+        return build
+    return register
+
+
+@chart('home/decades')
+def _home_decades(catalog, aggregates):
+    decade_counts = aggregates.decade_counts
+    fig = px.bar(x=decade_counts.index, y=decade_counts.values,
+                 labels={'x': 'Decade', 'y': 'Number of Movies'},
+                 title='Movies by Decade')
+    fig.update_traces(marker_color='#E50914')
+    return fig
+
+
+@chart('home/ratings')
+def _home_ratings(catalog, aggregates):
+    fig = px.histogram(catalog.df, x='rating', nbins=20,
+                       labels={'rating': 'Rating', 'count': 'Number of Movies'},
+                       title='Rating Distribution')
+    fig.update_traces(marker_color='#764ba2')
+    return fig
+
+
+@chart('analytics/per year')
+def _per_year(catalog, aggregates):
+    fig = px.line(aggregates.movies_per_year, x='year', y='count',
+                  title='Number of Top 250 Movies by Year',
+                  labels={'year': 'Year', 'count': 'Number of Movies'})
+    fig.update_traces(line_color='#E50914')
+    return fig
+
+
+@chart('analytics/decade rating')
+def _decade_rating(catalog, aggregates):
+    fig = px.bar(aggregates.decade_rating, x='decade', y='rating',
+                 title='Average Rating by Decade',
+                 labels={'decade': 'Decade', 'rating': 'Average Rating'})
+    fig.update_traces(marker_color='#764ba2')
+    return fig
+
+
+@chart('analytics/duration')
+def _duration(catalog, aggregates):
+    df = catalog.df
+    return px.box(df[df['minutes'] >= 0], y='minutes',
+                  title='Movie Duration Distribution',
+                  labels={'minutes': 'Duration (minutes)'})
+
+
+@chart('analytics/top genres')
+def _top_genres(catalog, aggregates):
+    top_20_genres = aggregates.genre_counts.head(20).to_dict()
+    fig = px.bar(x=list(top_20_genres.keys()), y=list(top_20_genres.values()),
+                 title='Top 20 Most Common Genres',
+                 labels={'x': 'Genre', 'y': 'Count'})
+    fig.update_traces(marker_color='#E50914')
+    return fig
+
+
+@chart('analytics/genre share')
+def _genre_share(catalog, aggregates):
+    top_10_genres = aggregates.genre_counts.head(10).to_dict()
+    return px.pie(values=list(top_10_genres.values()),
+                  names=list(top_10_genres.keys()),
+                  title='Top 10 Genres Distribution')
+
+
+@chart('analytics/director counts')
+def _director_counts(catalog, aggregates):
+    top_directors = aggregates.director_counts.head(15).to_dict()
+    fig = px.bar(x=list(top_directors.keys()), y=list(top_directors.values()),
+                 title='Directors with Most Movies in Top 250',
+                 labels={'x': 'Director', 'y': 'Number of Movies'})
+    fig.update_traces(marker_color='#667eea')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+@chart('analytics/director ratings')
+def _director_ratings(catalog, aggregates):
+    # Only directors with at least 2 movies
+    top_rated_directors = aggregates.top_directors_by_rating(10, min_movies=2).to_dict()
+    fig = px.bar(x=list(top_rated_directors.keys()),
+                 y=list(top_rated_directors.values()),
+                 title='Top 10 Directors by Average Rating (min 2 movies)',
+                 labels={'x': 'Director', 'y': 'Average Rating'})
+    fig.update_traces(marker_color='#764ba2')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+@chart('analytics/ratings')
+def _ratings(catalog, aggregates):
+    fig = px.histogram(catalog.df, x='rating', nbins=30,
+                       title='Rating Distribution',
+                       labels={'rating': 'Rating', 'count': 'Count'})
+    fig.update_traces(marker_color='#E50914')
+    return fig
+
+
+@chart('analytics/rating vs year')
+def _rating_vs_year(catalog, aggregates):
+    fig = px.scatter(catalog.df, x='year', y='rating',
+                     title='Rating vs Year',
+                     labels={'year': 'Year', 'rating': 'Rating'},
+                     hover_data=['title'])
+    fig.update_traces(marker=dict(color='#764ba2', size=8))
+    return fig
+
+
+def figure(catalog, chart_id, template=None):
+    """Figure of static chart ``chart_id``, built on first use for this dataset version.
+
+    The figure is shared by every session; callers must not modify it.
+    """
+    template = template or pio.templates.default
+    version = catalog.version or id(catalog)
+    key = (chart_id, template)
+    with _lock:
+        fig = _cache.get(version, {}).get(key)
+    if fig is not None:
+        metrics.count('movierec_chart_cache_total', chart=chart_id, result='hit')
+        return fig
+
+    metrics.count('movierec_chart_cache_total', chart=chart_id, result='miss')
+    with metrics.timer('movierec_chart_seconds', chart=chart_id):
+        fig = CHARTS[chart_id](catalog, get_aggregates(catalog))
+        fig.update_layout(template=template)
+    with _lock:
+        _cache.setdefault(version, {})[key] = fig
+        _cache.move_to_end(version)
+        while len(_cache) > MAX_VERSIONS:
+            _cache.popitem(last=False)
+    return fig
+
+
+def warm(catalog, template=None):
+    """Build every static chart of ``catalog`` now."""
+    for chart_id in CHARTS:
+        figure(catalog, chart_id, template)
@@ -0,0 +1,208 @@
+"""Collaborative filtering over in-app user ratings.
+
+Ratings are modelled as ``mean + user bias + movie bias + x_user . y_movie``.
+Biases are damped averages; the factors are fitted to what the biases
+leave over by alternating least squares on a scipy sparse matrix.
+
+Only movie factors are kept. A user's vector is folded in from their
+current ratings at request time (one small linear solve), so a rating
+counts immediately, without waiting for the next training run. Scoring
+is then one matrix-vector product over the catalog, with movies the user
+already rated excluded.
+
+Because of that fold-in, new ratings don't need a new model straight
+away: ``CollaborativeRecommender`` retrains from scratch on a background
+thread only once ``RETRAIN_AFTER`` writes have piled up, or
+``RETRAIN_SECONDS`` after the last training if there are fewer, and keeps
+serving the previous model until the new one is ready.
+"""
+
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from . import metrics
+from .ratings import key_lookup
+
+FACTORS = 32
+REGULARIZATION = 0.1
+ITERATIONS = 10
+
+# Pseudo-ratings at the mean added to every bias, so one rating can't make a movie "the best"
+BIAS_DAMPING = 5.0
+
+# Rating store writes (rates and unrates) that make a retrain worthwhile ...
+RETRAIN_AFTER = 50
+# ... or how long fewer of them may wait for one
+RETRAIN_SECONDS = 600
+
+
+def _damped_means(values, groups, size):
+    sums = np.bincount(groups, weights=values, minlength=size)
+    counts = np.bincount(groups, minlength=size)
+    return sums / (counts + BIAS_DAMPING)
+
+
+def _solve_rows(matrix, fixed, regularization):
+    """Least-squares factors for every row of CSR ``matrix`` given the other side's ``fixed`` factors."""
+    factors = np.zeros((matrix.shape[0], fixed.shape[1]), dtype=np.float64)
+    eye = np.eye(fixed.shape[1])
+    # Movies nobody rated keep zero factors (and score on their bias alone)
+    for row in np.flatnonzero(np.diff(matrix.indptr)):
+        start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+        other = fixed[matrix.indices[start:stop]]
+        a = other.T @ other + regularization * (stop - start) * eye
+        factors[row] = np.linalg.solve(a, other.T @ matrix.data[start:stop])
+    return factors
+
+
+def als(matrix, factors=FACTORS, regularization=REGULARIZATION, iterations=ITERATIONS, seed=0):
+    """Factor the (users x items) residual ``matrix``; returns (user factors, item factors)."""
+    rng = np.random.default_rng(seed)
+    matrix = sparse.csr_matrix(matrix)
+    transposed = matrix.T.tocsr()
+    items = rng.normal(0, 0.1, (matrix.shape[1], factors))
+    users = np.zeros((matrix.shape[0], factors))
+    for _ in range(iterations):
+        users = _solve_rows(matrix, items, regularization)
+        items = _solve_rows(transposed, users, regularization)
+    return users, items
+
+
+class FactorModel:
+    """Trained movie biases and factors, aligned with one catalog's movie ids."""
+
+    def __init__(self, catalog, mean, item_bias, item_factors, regularization=REGULARIZATION,
+                 revision=None, ratings=0, users=0):
+        self.catalog = catalog
+        self.mean = mean
+        self.item_bias = item_bias.astype(np.float32)
+        self.item_factors = item_factors.astype(np.float32)
+        self.regularization = regularization
+        self.revision = revision
+        self.ratings = ratings
+        self.users = users
+        self._lookup = key_lookup(catalog)
+
+    @classmethod
+    def train(cls, catalog, ratings, revision=None, factors=FACTORS, regularization=REGULARIZATION,
+              iterations=ITERATIONS):
+        """Fit a model to (user, movie key, rating) tuples; ratings of unknown movies are ignored."""
+        lookup = key_lookup(catalog)
+        ratings = [(user, lookup[key], value) for user, key, value in ratings if key in lookup]
+        n = len(catalog)
+        if not ratings:
+            return cls(catalog, 0.0, np.zeros(n), np.zeros((n, factors)), regularization, revision)
+
+        users, user_codes = np.unique([user for user, _, _ in ratings], return_inverse=True)
+        items = np.array([item for _, item, _ in ratings], dtype=np.int64)
+        values = np.array([value for _, _, value in ratings], dtype=np.float64)
+
+        mean = float(values.mean())
+        item_bias = _damped_means(values - mean, items, n)
+        user_bias = _damped_means(values - mean - item_bias[items], user_codes, len(users))
+        residual = values - mean - item_bias[items] - user_bias[user_codes]
+
+        matrix = sparse.csr_matrix((residual, (user_codes, items)), shape=(len(users), n))
+        _, item_factors = als(matrix, factors, regularization, iterations)
+        return cls(catalog, mean, item_bias, item_factors, regularization, revision, len(values), len(users))
+
+    def user_vector(self, ratings):
+        """(bias, factors) of a user with ``ratings`` ({movie key: rating}), folded into the trained model."""
+        known = [(self._lookup[key], value) for key, value in ratings.items() if key in self._lookup]
+        k = self.item_factors.shape[1]
+        if not known:
+            return 0.0, np.zeros(k, dtype=np.float32)
+        items = np.array([item for item, _ in known])
+        values = np.array([value for _, value in known]) - self.mean - self.item_bias[items]
+        bias = values.sum() / (len(values) + BIAS_DAMPING)
+        other = self.item_factors[items].astype(np.float64)
+        a = other.T @ other + self.regularization * len(items) * np.eye(k)
+        vector = np.linalg.solve(a, other.T @ (values - bias))
+        return float(bias), vector.astype(np.float32)
+
+    def predict(self, ratings):
+        """Predicted rating of every movie for a user with ``ratings``."""
+        bias, vector = self.user_vector(ratings)
+        return self.mean + bias + self.item_bias + self.item_factors @ vector
+
+    @metrics.timer('movierec_collaborative_seconds')
+    def recommend(self, ratings, k=10):
+        """(ids, predicted ratings) of the ``k`` best movies the user has not rated yet."""
+        scores = self.predict(ratings)
+        seen = [self._lookup[key] for key in ratings if key in self._lookup]
+        scores[seen] = -np.inf
+        k = min(k, len(scores) - len(seen))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Best prediction first; ties go to the higher rated movie
+        top = top[np.lexsort((-self.catalog.rating[top], -scores[top]))]
+        return top.astype(np.int32), scores[top]
+
+
+class CollaborativeRecommender:
+    """A FactorModel for one catalog, retrained in the background as ratings accumulate."""
+
+    def __init__(self, store, catalog, retrain_after=RETRAIN_AFTER, retrain_seconds=RETRAIN_SECONDS, **params):
+        self.store = store
+        self.catalog = catalog
+        self.retrain_after = retrain_after
+        self.retrain_seconds = retrain_seconds
+        self.params = params
+        self.last_error = None
+        self._model = None
+        self._trained_at = 0.0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def training(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _due(self, revision, force):
+        model = self._model
+        if model is None:
+            return True
+        if model.revision == revision:
+            return False
+        return (force or revision - model.revision >= self.retrain_after
+                or time.monotonic() - self._trained_at >= self.retrain_seconds)
+
+    def refresh(self, wait=False, force=False):
+        """Start retraining if enough ratings changed since the current model; never blocks unless ``wait``.
+
+        ``force`` retrains on any change, however recent the current model.
+        """
+        revision = self.store.revision()
+        with self._lock:
+            if not self.training and self._due(revision, force):
+                self._thread = threading.Thread(target=self._train, args=(revision,),
+                                                name='movierec-cf-train', daemon=True)
+                self._thread.start()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+
+    def _train(self, revision):
+        try:
+            with metrics.timer('movierec_collaborative_train_seconds'):
+                self._model = FactorModel.train(self.catalog, self.store.all_ratings(), revision, **self.params)
+            self._trained_at = time.monotonic()
+            self.last_error = None
+        except Exception as e:  # keep the previous model
+            self.last_error = e
+
+    def recommend(self, user, k=10):
+        """(ids, predicted ratings) for ``user``, or None until the first model is trained."""
+        self.refresh()
+        model = self._model
+        if model is None:
+            return None
+        return model.recommend(self.store.user_ratings(user), k)
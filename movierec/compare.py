@@ -0,0 +1,77 @@
+"""Side-by-side comparison of any number of movies.
+
+``Comparison`` gathers the rows of the compared movies with one indexed
+take and computes every pairwise matrix in one vectorized pass: Jaccard
+overlap of genres, directors and stars (a sparse product of the movies'
+label incidence), and absolute differences of runtime, year and rating.
+``similarity`` blends them into one score per pair. Comparing 20 movies
+costs about the same as comparing 2.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from .catalog import MULTI_VALUED
+
+NUMERIC = ('minutes', 'year', 'rating')
+
+# How each numeric difference turns into a 0..1 closeness: 1 - difference / scale
+SCALES = {'minutes': 120.0, 'year': 50.0, 'rating': 2.0}
+
+
+def _incidence(column, ids):
+    """Sparse (len(ids) x vocabulary) 0/1 matrix of the labels of ``ids``."""
+    starts, stops = column.offsets[ids], column.offsets[ids + 1]
+    lengths = stops - starts
+    rows = np.repeat(np.arange(len(ids)), lengths)
+    # Position of every label of every row in ``codes``, without a Python loop over rows
+    positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, column.codes[positions])),
+                               shape=(len(ids), len(column.vocab)))
+    matrix.data[:] = 1  # a label listed twice in one row still counts once
+    return matrix
+
+
+def _jaccard(matrix):
+    shared = (matrix @ matrix.T).toarray()
+    sizes = np.diag(shared)
+    union = sizes[:, None] + sizes[None, :] - shared
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(union > 0, shared / union, 0.0)
+
+
+class Comparison:
+    """Pairwise matrices over the movies ``ids``; every matrix is (n x n) in the order of ``ids``."""
+
+    def __init__(self, catalog, ids):
+        self.catalog = catalog
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.rows = catalog.df.iloc[self.ids]
+        self.labels = catalog.titles.labels[self.ids]
+
+        self.overlap = {name: _jaccard(_incidence(getattr(catalog, name), self.ids)) for name in MULTI_VALUED}
+        self.difference = {}
+        for name in NUMERIC:
+            values = getattr(catalog, name)[self.ids].astype(np.float64)
+            if name == 'minutes':
+                values[values < 0] = np.nan  # unknown runtime
+            self.difference[name] = np.abs(values[:, None] - values[None, :])
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def closeness(self):
+        """Numeric differences mapped to 0..1 (1 = equal); NaN where a value is unknown."""
+        return {name: np.clip(1 - diff / SCALES[name], 0, 1) for name, diff in self.difference.items()}
+
+    @property
+    def similarity(self):
+        """Mean of the label overlaps and numeric closenesses, ignoring unknown values."""
+        parts = np.stack(list(self.overlap.values()) + list(self.closeness.values()))
+        return np.nanmean(parts, axis=0)
+
+    def matrices(self):
+        """Every matrix by name, overlaps first, then differences, then the blended similarity."""
+        return {**self.overlap, **{f'{name} difference': diff for name, diff in self.difference.items()},
+                'similarity': self.similarity}
@@ -0,0 +1,177 @@
+"""Headless query API shared by the Streamlit app and the HTTP service.
+
+Functions here take the shared, read-only objects (catalog, quiz engine,
+similarity and ANN indexes) as arguments and return plain ids or JSON-ready
+records, so they can be called from any process without Streamlit.
+"""
+
+import numpy as np
+
+from . import metrics
+from .aggregates import get_aggregates
+from .ann import AnnIndex
+from .compare import Comparison
+from .engine import QuizEngine, load_weights
+from .pipeline import filter_ids
+from .quizcache import QUIZ_CACHE_DIR, QuizCache
+from .ranked import KEYS, get_ranked
+from .similarity import SimilarityIndex
+from .storage import load_cached_catalog
+
+TOP_BY = ('rating',) + KEYS
+
+# Catalog columns results can be sorted by (None keeps relevance order)
+SORT_BY = ('rating', 'year', 'title', 'minutes')
+
+# Beyond this many movies the exact all-pairs neighbour table takes too long
+# to build, and "more like this" is answered by the ANN index instead.
+EXACT_SIMILARITY_LIMIT = 20_000
+
+
+class Resources:
+    """The catalog and everything derived from it, loaded once per process."""
+
+    def __init__(self, catalog, engine, similarity, ann, quiz_cache=None):
+        self.catalog = catalog
+        self.engine = engine
+        self.similarity = similarity
+        self.ann = ann
+        self.quiz_cache = quiz_cache if quiz_cache is not None else QuizCache()
+
+    @classmethod
+    def load(cls, csv_path, weights_path='quiz_weights.json', similarity_path='.cache/similarity.npz',
+             ann_path='.cache/ann.npz', quiz_cache_dir=QUIZ_CACHE_DIR):
+        with metrics.timer('movierec_load_seconds', part='catalog'):
+            catalog = load_cached_catalog(csv_path)
+        with metrics.timer('movierec_load_seconds', part='quiz engine'):
+            engine = QuizEngine(catalog, load_weights(weights_path))
+        with metrics.timer('movierec_load_seconds', part='ann'):
+            ann = AnnIndex.load_or_build(ann_path, catalog)
+        if len(catalog) > EXACT_SIMILARITY_LIMIT:
+            similarity = ann
+        else:
+            with metrics.timer('movierec_load_seconds', part='similarity'):
+                similarity = SimilarityIndex.load_or_build(similarity_path, catalog)
+        return cls(catalog, engine, similarity, ann, QuizCache(quiz_cache_dir))
+
+    def warm(self, charts=False):
+        """Build the lazily created indexes now, so the first request after a load is not slow.
+
+        With ``charts``, also build the static Plotly figures of the app's pages.
+        """
+        self.catalog.search_index
+        get_aggregates(self.catalog)
+        get_ranked(self.catalog)
+        if charts:
+            from . import charts as static_charts  # imports Plotly, which the HTTP service never needs
+
+            static_charts.warm(self.catalog)
+
+
+def records(catalog, ids, **columns):
+    """JSON-ready dicts for ``ids``; extra per-id ``columns`` are added as fields."""
+    records = []
+    for position, movie_id in enumerate(ids):
+        movie_id = int(movie_id)
+        record = {
+            'id': movie_id,
+            'title': catalog.title[movie_id],
+            'year': int(catalog.year[movie_id]),
+            'rating': float(catalog.rating[movie_id]),
+            'minutes': int(catalog.minutes[movie_id]) if catalog.minutes[movie_id] >= 0 else None,
+            'genres': catalog.genres.row(movie_id),
+            'directors': catalog.directors.row(movie_id),
+            'stars': catalog.stars.row(movie_id),
+        }
+        for name, values in columns.items():
+            value = values[position]
+            record[name] = value.item() if isinstance(value, np.generic) else value
+        records.append(record)
+    return records
+
+
+def search(catalog, query, limit=20):
+    ids, scores = catalog.search_index.search(query, limit=limit)
+    return records(catalog, ids, score=scores)
+
+
+def find(catalog, genres=(), match_all=False, years=None, min_rating=None, text='',
+         sort_by='rating', descending=True, limit=None):
+    """Ids matching the Find Movies filters, in display order."""
+    if sort_by is not None and sort_by not in SORT_BY:
+        raise ValueError(f"Unknown sort column {sort_by!r}; expected one of {', '.join(SORT_BY)}")
+    ids = filter_ids(catalog, genres=genres, match_all=match_all, years=years,
+                     min_rating=min_rating, search=text, sort_by=sort_by, descending=descending)
+    return ids if limit is None else ids[:limit]
+
+
+def recommend(engine, answers, k=10, cache=None):
+    """Quiz recommendations with their match percentage and per-feature breakdown."""
+    if cache is not None:
+        result = cache.recommend(engine, answers, k).recommendations
+    else:
+        result = engine.recommend(answers, k=k)
+    breakdown = [
+        {feature: round(float(value), 3) for feature, value in zip(result.features, row) if feature in result.active}
+        for row in result.breakdown
+    ]
+    return {
+        'full_matches': len(result.full_matches),
+        'results': records(engine.catalog, result.ids, match=result.match, breakdown=breakdown),
+    }
+
+
+def top_ids(catalog, by='rating', value=None, n=None, **keys):
+    """Ids ranked by rating overall, or within one decade, genre, director or star.
+
+    Extra ``keys`` such as ``decade=1990`` narrow the ranking to the movies
+    matching all of them; one of them naming ``by`` itself is an error.
+    """
+    if by not in TOP_BY:
+        raise ValueError(f"Unknown ranking {by!r}; expected one of {', '.join(TOP_BY)}")
+    if by != 'rating':
+        if by in keys:
+            raise ValueError(f"Ranking by {by} already selects {by}={value!r}; drop the {by!r} filter")
+        keys = {**keys, by: value}
+    ids = get_ranked(catalog).ids(**keys)
+    return ids if n is None else ids[:n]
+
+
+def top(catalog, by='rating', value=None, n=20, **keys):
+    return records(catalog, top_ids(catalog, by, value, n, **keys))
+
+
+def similar(similarity, title, k=10):
+    """Movies most like ``title``; raises KeyError for unknown titles."""
+    movie_id = similarity.catalog.find(title)
+    if movie_id < 0:
+        raise KeyError(title)
+    ids, scores = similarity.similar_ids(movie_id, k)
+    return records(similarity.catalog, ids, similarity=scores)
+
+
+def _matrix(matrix):
+    return [[None if np.isnan(value) else round(float(value), 3) for value in row] for row in matrix]
+
+
+def compare(catalog, titles):
+    """Pairwise comparison of ``titles`` (bare or "Title (Year)"); raises KeyError for unknown titles."""
+    ids = catalog.titles.ids(titles)
+    for title, movie_id in zip(titles, ids):
+        if movie_id < 0:
+            raise KeyError(title)
+    comparison = Comparison(catalog, ids)
+    return {
+        'movies': records(catalog, ids, label=comparison.labels),
+        'matrices': {name: _matrix(matrix) for name, matrix in comparison.matrices().items()},
+    }
+
+
+def between(ann, titles, k=10):
+    """Movies closest to all of ``titles`` at once; raises KeyError for unknown titles."""
+    movie_ids = [ann.catalog.find(title) for title in titles]
+    for title, movie_id in zip(titles, movie_ids):
+        if movie_id < 0:
+            raise KeyError(title)
+    ids, scores = ann.between_ids(movie_ids, k)
+    return records(ann.catalog, ids, similarity=scores)
@@ -0,0 +1,212 @@
+"""Quiz recommender that scores the whole catalog in one pass.
+
+Each quiz answer becomes one column of a per-movie match matrix (1.0 for a
+full match, fading towards 0.0 the further a movie is from the answer).
+Scores are a single matrix-vector product with the feature weights, so a
+movie that misses one preference still ranks instead of being dropped.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from . import metrics
+
+FEATURES = ('mood', 'story', 'duration', 'era', 'rating', 'director', 'actor', 'quality')
+
+DEFAULT_WEIGHTS = {
+    'mood': 2.0,
+    'story': 2.0,
+    'duration': 1.0,
+    'era': 1.0,
+    'rating': 1.5,
+    'director': 3.0,
+    'actor': 3.0,
+    # Tie-breaker favouring higher rated movies; not part of the match percentage
+    'quality': 0.5,
+}
+
+MOOD_GENRES = {
+    "Excited & Energetic": ["Action", "Adventure", "Thriller"],
+    "Thoughtful & Reflective": ["Drama", "Biography", "Historical"],
+    "Relaxed & Casual": ["Comedy", "Romance", "Family"],
+    "Tense & Thrilling": ["Thriller", "Crime", "Mystery", "Horror"],
+    "Romantic & Emotional": ["Romance", "Drama", "Musical"],
+}
+
+STORY_GENRES = {
+    "Action & Adventure": ["Action", "Adventure"],
+    "Mystery & Crime": ["Mystery", "Crime", "Detective"],
+    "Romance & Drama": ["Romance", "Drama", "Romantic"],
+    "Comedy & Fun": ["Comedy"],
+    "Science Fiction & Fantasy": ["Sci-Fi", "Fantasy", "Science Fiction"],
+    "Historical & Period": ["Historical", "Period", "Epic", "History"],
+    "Thriller & Suspense": ["Thriller", "Suspense", "Psychological"],
+    "War & Military": ["War", "Military"],
+    "Biography & Real Stories": ["Biography", "Biopic", "Docudrama"],
+}
+
+# Runtime preference -> (min minutes, max minutes), inclusive
+DURATIONS = {
+    "Quick watch (< 2 hours)": (0, 119),
+    "Standard (2-3 hours)": (120, 180),
+    "Epic experience (> 3 hours)": (181, None),
+    "Any length": None,
+}
+
+# How far outside a preference a movie can be before its match reaches 0
+DURATION_FALLOFF = 60.0   # minutes
+ERA_FALLOFF = 20.0        # years
+RATING_FALLOFF = 0.5      # rating points
+
+
+def load_weights(path):
+    """Read feature weights from a JSON file, falling back to DEFAULT_WEIGHTS."""
+    weights = dict(DEFAULT_WEIGHTS)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            weights.update({k: float(v) for k, v in json.load(f).items() if k in weights})
+    return weights
+
+
+def _falloff(distance, scale):
+    return np.clip(1.0 - distance / scale, 0.0, 1.0)
+
+
+def _range_match(values, low, high, scale):
+    """1.0 inside [low, high], fading linearly to 0.0 over ``scale`` outside it."""
+    values = values.astype(np.float64)
+    distance = np.zeros_like(values)
+    if low is not None:
+        distance = np.maximum(distance, low - values)
+    if high is not None:
+        distance = np.maximum(distance, values - high)
+    return _falloff(distance, scale).astype(np.float32)
+
+
+class Recommendations:
+    """Ranked quiz results.
+
+    ``ids`` are the top movie ids best first, ``breakdown`` holds their
+    per-feature match values (columns follow ``features``), ``match`` is
+    the weighted share of the ``active`` preferences each one meets, and
+    ``full_matches`` lists every movie meeting all of them, best first.
+    """
+
+    def __init__(self, ids, scores, breakdown, features, active, match, full_matches):
+        self.ids = ids
+        self.scores = scores
+        self.breakdown = breakdown
+        self.features = features
+        self.active = active
+        self.match = match
+        self.full_matches = full_matches
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class QuizEngine:
+    def __init__(self, catalog, weights=None):
+        self.catalog = catalog
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+        genre_index = catalog.index['genres']
+        self._mood_ids = {
+            mood: genre_index.any_of(genre_index.resolve(genres))
+            for mood, genres in MOOD_GENRES.items()
+        }
+        self._story_ids = {
+            story: genre_index.any_of(genre_index.resolve(genres))
+            for story, genres in STORY_GENRES.items()
+        }
+
+        rating = catalog.rating
+        spread = float(rating.max() - rating.min()) if len(rating) else 0.0
+        self._quality = ((rating - rating.min()) / spread if spread else np.zeros(len(rating))).astype(np.float32)
+
+    def encode(self, answers):
+        """Return the (movies x features) match matrix and weight vector for ``answers``.
+
+        Features the user left open get weight 0.
+        """
+        catalog = self.catalog
+        matrix = np.zeros((len(catalog), len(FEATURES)), dtype=np.float32)
+        weights = np.zeros(len(FEATURES), dtype=np.float32)
+
+        def use(feature, column):
+            i = FEATURES.index(feature)
+            matrix[:, i] = column
+            weights[i] = self.weights[feature]
+
+        mood_ids = self._mood_ids.get(answers.get('mood'))
+        if mood_ids is not None:
+            column = np.zeros(len(catalog), dtype=np.float32)
+            column[mood_ids] = 1.0
+            use('mood', column)
+
+        stories = [s for s in answers.get('story_type') or [] if s in self._story_ids]
+        if stories:
+            column = np.zeros(len(catalog), dtype=np.float32)
+            for story in stories:
+                column[self._story_ids[story]] += 1.0
+            use('story', np.minimum(column, 1.0))
+
+        bounds = DURATIONS.get(answers.get('duration'))
+        if bounds is not None:
+            column = _range_match(catalog.minutes, bounds[0], bounds[1], DURATION_FALLOFF)
+            column[catalog.minutes < 0] = 0.0
+            use('duration', column)
+
+        era = catalog.era_code(answers.get('era'))
+        if era >= 0:
+            _, first, last = catalog.eras[era]
+            use('era', _range_match(catalog.year, first, last, ERA_FALLOFF))
+
+        min_rating = answers.get('rating')
+        if min_rating is not None:
+            use('rating', _range_match(catalog.rating, min_rating, None, RATING_FALLOFF))
+
+        director = answers.get('director')
+        if director and director != "Any":
+            column = np.zeros(len(catalog), dtype=np.float32)
+            column[catalog.index['directors'].get(director)] = 1.0
+            use('director', column)
+
+        actor = (answers.get('actor') or '').strip()
+        if actor:
+            stars = catalog.search_index.people('stars', actor)
+            column = np.zeros(len(catalog), dtype=np.float32)
+            column[catalog.index['stars'].any_of(stars)] = 1.0
+            use('actor', column)
+
+        use('quality', self._quality)
+        return matrix, weights
+
+    @metrics.timer('movierec_recommend_seconds')
+    def recommend(self, answers, k=10):
+        matrix, weights = self.encode(answers)
+        scores = matrix @ weights
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        # Best score first; ties go to the higher rated movie
+        top = top[np.lexsort((-self.catalog.rating[top], -scores[top]))]
+
+        preference = np.array([f != 'quality' for f in FEATURES]) & (weights > 0)
+        total = weights[preference].sum()
+        match = matrix[top][:, preference] @ weights[preference] / total if total else np.ones(len(top))
+
+        full = np.flatnonzero((matrix[:, preference] >= 1.0).all(axis=1))
+        full = full[np.lexsort((-self.catalog.rating[full], -scores[full]))]
+
+        return Recommendations(
+            ids=top.astype(np.int32),
+            scores=scores[top],
+            breakdown=matrix[top],
+            features=FEATURES,
+            active=tuple(f for f, used in zip(FEATURES, preference) if used),
+            match=match.astype(np.float32),
+            full_matches=full.astype(np.int32),
+        )
@@ -0,0 +1,176 @@
+"""Downloads of result sets as CSV, Parquet or JSON Lines.
+
+Exports are produced only when asked for, from the id array of a result
+set: ``iter_export`` encodes ``CHUNK_ROWS`` rows at a time and yields the
+bytes, so a caller streaming them (the HTTP service, a file) never holds
+more than one chunk. ``export_bytes`` joins the chunks for callers that
+need the whole file at once (a Streamlit download button) and keeps the
+result in a byte-bounded LRU keyed by dataset version, a hash of the ids
+and the format, so asking twice for the same download encodes it once.
+
+Parquet needs ``pyarrow`` (installed with Streamlit).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from . import metrics
+
+CHUNK_ROWS = 10_000
+MAX_CACHE_BYTES = 128 * 2**20
+
+# The dataset's own columns; derived ones (minutes, decade, era, imdb_id) stay internal
+EXPORT_COLUMNS = ('title', 'year', 'duration', 'rating', 'genres', 'directors', 'stars')
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+}
+
+
+def _rows(catalog, ids):
+    columns = [catalog.df.columns.get_loc(column) for column in EXPORT_COLUMNS]
+    return catalog.df.iloc[ids, columns]
+
+
+def _chunks(catalog, ids, chunk_rows):
+    for start in range(0, len(ids), chunk_rows):
+        yield _rows(catalog, ids[start:start + chunk_rows])
+
+
+def _csv(catalog, ids, chunk_rows):
+    if not len(ids):
+        yield _rows(catalog, ids).to_csv(index=False).encode('utf-8')
+    for i, chunk in enumerate(_chunks(catalog, ids, chunk_rows)):
+        yield chunk.to_csv(index=False, header=i == 0).encode('utf-8')
+
+
+def _jsonl(catalog, ids, chunk_rows):
+    for chunk in _chunks(catalog, ids, chunk_rows):
+        data = chunk.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8')
+        yield data if data.endswith(b'\n') else data + b'\n'
+
+
+class _Sink:
+    """Write-only file that hands over what was written since the last ``take``."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+def _parquet(catalog, ids, chunk_rows):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow; pip install pyarrow") from None
+
+    sink = _Sink()
+    writer = None
+    for chunk in _chunks(catalog, ids, chunk_rows) if len(ids) else [_rows(catalog, ids)]:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), table.schema)
+        else:
+            # A chunk whose column is all missing infers a null type; keep the first chunk's schema
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+_ENCODERS = {'csv': _csv, 'parquet': _parquet, 'jsonl': _jsonl}
+
+
+def iter_export(catalog, ids, fmt='csv', chunk_rows=CHUNK_ROWS):
+    """Yield the export of movies ``ids`` (in that order) in format ``fmt``, one chunk of rows at a time."""
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    for data in _ENCODERS[fmt](catalog, ids, chunk_rows):
+        if data:
+            yield data
+
+
+def result_hash(ids):
+    return hashlib.sha1(ids.tobytes()).hexdigest()
+
+
+class ExportCache:
+    """Encoded exports, least recently used evicted first once over ``max_bytes``."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            self.nbytes += len(data) - (len(previous) if previous is not None else 0)
+            self._entries[key] = data
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+
+_cache = ExportCache()
+
+
+def export_bytes(catalog, ids, fmt='csv', cache=_cache):
+    """The whole export of ``ids`` as bytes, encoded once per dataset version, result set and format."""
+    key = (catalog.version, result_hash(ids), fmt)
+    data = cache.get(key) if cache is not None else None
+    if data is not None:
+        metrics.count('movierec_export_cache_total', format=fmt, result='hit')
+        return data
+    metrics.count('movierec_export_cache_total', format=fmt, result='miss')
+    with metrics.timer('movierec_export_seconds', format=fmt):
+        data = b''.join(iter_export(catalog, ids, fmt))
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def write_export(catalog, ids, path, fmt='csv'):
+    """Stream the export of ``ids`` to ``path``; returns the number of bytes written."""
+    written = 0
+    with open(path, 'wb') as f:
+        for data in iter_export(catalog, ids, fmt):
+            f.write(data)
+            written += len(data)
+    return written
@@ -0,0 +1,202 @@
+"""Saved IMDb pages and a local stand-in server for the scraper.
+
+``write_fixtures`` renders a chart page and one title page per movie from
+a CSV, using the markup the scraper parses (rendered list items for the
+first movies, JSON-LD for the rest, genre chips, principal credits and the
+cast list). ``serve`` replays any directory of saved pages over HTTP, with
+optional latency and injected 503s, so a full scrape, its retries and its
+resume can be exercised offline::
+
+    python -m movierec.fixtures write .cache/fixtures
+    python -m movierec.fixtures serve .cache/fixtures --delay 0.2 --fail 0.05
+    python -m movierec.scraper --base-url http://127.0.0.1:8765 --output /tmp/top250.csv
+
+Pages are stored as ``chart/top/index.html`` and ``title/<id>/index.html``,
+which is also where real pages saved from imdb.com belong.
+"""
+
+import argparse
+import functools
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from .catalog import DATA_PATH
+
+# Movies rendered as list items on the chart page; the rest are only in its JSON-LD
+LISTED = 25
+
+
+def title_id(row, rank):
+    """The row's ``imdb_id``, or a made-up id from its rank for CSVs without one."""
+    return row.get('imdb_id') or f'tt{rank:07d}'
+
+
+def _iso_duration(duration):
+    match = re.fullmatch(r'\s*(?:(\d+)h)?\s*(?:(\d+)m)?\s*', str(duration))
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes = match.groups()
+    return 'PT' + (f'{hours}H' if hours else '') + (f'{minutes}M' if minutes else '')
+
+
+def _split(value):
+    return [] if pd.isna(value) or value == 'N/A' else [item.strip() for item in str(value).split(',')]
+
+
+def _json_script(data):
+    payload = json.dumps(data).replace('</', '<\\/')
+    return f'<script type="application/ld+json">{payload}</script>'
+
+
+def render_chart(rows, listed=LISTED):
+    e = html.escape
+    items = []
+    for rank, row in enumerate(rows[:listed], 1):
+        items.append(f'''
+<li class="ipc-metadata-list-summary-item sc-10233bc-0">
+  <div class="ipc-title ipc-title--base"><a href="/title/{title_id(row, rank)}/?ref_=chttp_t_{rank}" class="ipc-title-link-wrapper">
+    <h3 class="ipc-title__text">{rank}. {e(str(row['title']))}</h3></a></div>
+  <div class="sc-b189961a-7 cli-title-metadata">
+    <span class="sc-b189961a-8 cli-title-metadata-item">{e(str(row['year']))}</span>
+    <span class="sc-b189961a-8 cli-title-metadata-item">{e(str(row['duration']))}</span>
+    <span class="sc-b189961a-8 cli-title-metadata-item">R</span>
+  </div>
+  <span class="ipc-rating-star ipc-rating-star--base"><span class="ipc-rating-star--rating">{row['rating']}</span></span>
+</li>''')
+    item_list = {
+        '@type': 'ItemList',
+        'itemListElement': [
+            {'@type': 'ListItem', 'item': {
+                '@type': 'Movie',
+                'url': f'https://www.imdb.com/title/{title_id(row, rank)}/',
+                'name': str(row['title']),
+                'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': row['rating']},
+                'duration': _iso_duration(row['duration']),
+            }}
+            for rank, row in enumerate(rows, 1)
+        ],
+    }
+    return ('<!DOCTYPE html><html><head><title>IMDb Top 250 Movies</title>'
+            f'{_json_script(item_list)}</head><body>'
+            f'<ul class="ipc-metadata-list ipc-metadata-list--dividers-between">{"".join(items)}</ul>'
+            '</body></html>')
+
+
+def render_detail(row):
+    e = html.escape
+    chips = ''.join(
+        f'<a class="ipc-chip ipc-chip--on-baseAlt" href="/interest/x/"><span class="ipc-chip__text">{e(genre)}</span></a>'
+        for genre in _split(row['genres'])
+    )
+    directors = _split(row['directors'])
+    credit = ''.join(
+        f'<li><a class="ipc-metadata-list-item__list-content-item" href="/name/x/">{e(name)}</a></li>'
+        for name in directors
+    )
+    cast = ''.join(
+        f'<div data-testid="title-cast-item"><a data-testid="title-cast-item__actor" href="/name/x/">{e(name)}</a>'
+        f'<a class="cast-item-characters-link">…</a></div>'
+        for name in _split(row['stars'])
+    )
+    movie = {
+        '@type': 'Movie',
+        'name': str(row['title']),
+        'datePublished': f"{row['year']}-01-01",
+        'duration': _iso_duration(row['duration']),
+        'aggregateRating': {'@type': 'AggregateRating', 'ratingValue': row['rating']},
+    }
+    return (f'<!DOCTYPE html><html><head><title>{e(str(row["title"]))}</title>{_json_script(movie)}</head><body>'
+            f'<div data-testid="interests">{chips}</div>'
+            '<ul class="ipc-metadata-list">'
+            f'<li data-testid="title-pc-principal-credit"><span class="ipc-metadata-list-item__label">'
+            f'{"Directors" if len(directors) > 1 else "Director"}</span><div><ul>{credit}</ul></div></li>'
+            '<li data-testid="title-pc-principal-credit"><span class="ipc-metadata-list-item__label">Writers</span>'
+            '<div><ul><li><a class="ipc-metadata-list-item__list-content-item" href="/name/x/">A Writer</a></li>'
+            '</ul></div></li></ul>'
+            f'<section data-testid="title-cast">{cast}</section>'
+            '</body></html>')
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def write_fixtures(directory, csv_path=DATA_PATH, listed=LISTED):
+    """Render the chart and title pages for every movie in ``csv_path``; returns the count."""
+    rows = pd.read_csv(csv_path, dtype=str, keep_default_na=False).to_dict('records')
+    _write(os.path.join(directory, 'chart', 'top', 'index.html'), render_chart(rows, listed))
+    for rank, row in enumerate(rows, 1):
+        _write(os.path.join(directory, 'title', title_id(row, rank), 'index.html'), render_detail(row))
+    return len(rows)
+
+
+class StandInHandler(SimpleHTTPRequestHandler):
+    """Serves saved pages, optionally slowly and with random 503s."""
+
+    delay = 0.0
+    failure_rate = 0.0
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            self.send_error(503, "Injected failure")
+            return
+        # Ignore query strings such as ?ref_=... when mapping to files
+        self.path = self.path.split('?', 1)[0]
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(directory, port=8765, delay=0.0, failure_rate=0.0, background=False):
+    """Serve ``directory`` on localhost; with ``background`` returns (server, base_url) at once."""
+    handler = type('Handler', (StandInHandler,), {'delay': delay, 'failure_rate': failure_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', port), functools.partial(handler, directory=directory))
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, base_url
+    print(f"Serving {directory} at {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Saved IMDb pages and a stand-in server for the scraper.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    write = commands.add_parser('write', help="render pages from a CSV")
+    write.add_argument('directory')
+    write.add_argument('--csv', default=DATA_PATH)
+    write.add_argument('--listed', type=int, default=LISTED, help="movies rendered as list items on the chart")
+    run = commands.add_parser('serve', help="serve a directory of pages")
+    run.add_argument('directory')
+    run.add_argument('--port', type=int, default=8765)
+    run.add_argument('--delay', type=float, default=0.0, help="seconds added to every response")
+    run.add_argument('--fail', type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    if args.command == 'write':
+        count = write_fixtures(args.directory, args.csv, args.listed)
+        print(f"Wrote the chart and {count} title pages to {args.directory}")
+    else:
+        serve(args.directory, args.port, args.delay, args.fail)
+
+
+if __name__ == '__main__':
+    main()
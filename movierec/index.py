@@ -0,0 +1,91 @@
+"""Inverted indexes over the catalog's multi-valued columns.
+
+Each label maps to a sorted array of movie ids, so genre and people
+filters become set operations on small integer arrays instead of a
+substring scan over every row.
+"""
+
+import re
+from functools import reduce
+
+import numpy as np
+
+EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def intersect(*arrays):
+    """Ids present in every one of the sorted id ``arrays``."""
+    if not arrays:
+        return EMPTY
+    return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), arrays)
+
+
+def union(*arrays):
+    """Sorted ids present in any of ``arrays``."""
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return EMPTY
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+class InvertedIndex:
+    """Label -> sorted movie ids, built from a ``MultiValued`` column."""
+
+    def __init__(self, column):
+        self.vocab = column.vocab
+        self._code = column.code
+
+        # Sorting by (label, row) groups postings per label with ids ascending;
+        # np.unique also drops a label repeated within one row.
+        keys = np.unique(column.codes.astype(np.int64) * len(column) + column.row_ids)
+        self.postings = (keys % max(len(column), 1)).astype(np.int32)
+        counts = np.bincount(keys // max(len(column), 1), minlength=len(self.vocab))
+        self.offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+
+    @classmethod
+    def from_arrays(cls, column, postings, offsets):
+        """Index over ``column`` from the ``postings`` and ``offsets`` of one built earlier."""
+        index = cls.__new__(cls)
+        index.vocab = column.vocab
+        index._code = column.code
+        index.postings = postings
+        index.offsets = offsets
+        return index
+
+    def __contains__(self, label):
+        return self._code(label) >= 0
+
+    def get(self, label):
+        """Sorted ids of movies tagged with ``label`` (empty if unknown)."""
+        code = self._code(label)
+        if code < 0:
+            return EMPTY
+        return self.postings[self.offsets[code]:self.offsets[code + 1]]
+
+    def count(self, label):
+        return len(self.get(label))
+
+    def any_of(self, labels):
+        return union(*(self.get(label) for label in labels))
+
+    def all_of(self, labels):
+        return intersect(*(self.get(label) for label in labels))
+
+    def resolve(self, terms):
+        """Map loose keywords to labels in the vocabulary.
+
+        A keyword that is itself a label resolves to that label only, so
+        "Drama" does not pull in "Prison Drama". Otherwise it resolves to
+        every label containing it as a whole word ("Period" -> "Period Drama").
+        """
+        labels = []
+        for term in terms:
+            if term in self:
+                labels.append(term)
+                continue
+            pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
+            labels.extend(label for label in self.vocab if pattern.search(label))
+        return list(dict.fromkeys(labels))
@@ -0,0 +1,184 @@
+"""Process-wide timers and counters for the hot paths.
+
+``timer`` works as a context manager or a decorator and records the
+elapsed seconds into a latency histogram; ``count`` bumps a counter. Both
+are keyed by a metric name plus optional labels::
+
+    with metrics.timer('movierec_filter_stage_seconds', stage='genres'):
+        ...
+
+    @metrics.timer('movierec_aggregates_seconds')
+    def build(): ...
+
+Every session of the app (and every request of the HTTP service) records
+into the same ``REGISTRY``, which can be exported as Prometheus text or
+JSON. ``collect`` additionally keeps the individual timings taken in the
+current thread, which the app uses to show where one rerun spent its time.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_spans = ContextVar('movierec_spans', default=None)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (inf if beyond the last)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Registry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """JSON-ready copy of every histogram and counter."""
+        with self._lock:
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': h.count,
+                    'sum': h.sum,
+                    'buckets': dict(zip([str(b) for b in h.buckets] + ['+Inf'], h.counts)),
+                    'p50': h.quantile(0.5),
+                    'p95': h.quantile(0.95),
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {'histograms': histograms, 'counters': counters}
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f'# TYPE {name} histogram')
+                    typed.add(name)
+                cumulative = 0
+                for bound, n in zip([str(b) for b in h.buckets] + ['+Inf'], h.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {h.sum}')
+                lines.append(f'{name}_count{_format_labels(labels)} {h.count}')
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f'# TYPE {name} counter')
+                    typed.add(name)
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class timer(ContextDecorator):
+    """Time a block or function into the ``name`` histogram of ``registry``."""
+
+    def __init__(self, name, registry=None, **labels):
+        self.name = name
+        self.labels = labels
+        self.registry = registry or REGISTRY
+        self.seconds = None
+
+    def _recreate_cm(self):
+        # Each call of a decorated function gets its own timer, so threads don't share a start time
+        return timer(self.name, self.registry, **self.labels)
+
+    def start(self):
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+        self.registry.observe(self.name, self.seconds, **self.labels)
+        spans = _spans.get()
+        if spans is not None:
+            spans.append((self.name, self.labels, self.seconds))
+        return self.seconds
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def count(name, value=1, **labels):
+    REGISTRY.count(name, value, **labels)
+
+
+def collect():
+    """Start keeping the (name, labels, seconds) of every timer finished from now on in this thread.
+
+    Returns the list the timings are appended to; calling it again starts a new one.
+    """
+    spans = []
+    _spans.set(spans)
+    return spans
@@ -0,0 +1,115 @@
+"""Memoized filter pipeline behind the Find Movies page.
+
+Filters run as a fixed chain of stages (genres -> years -> rating ->
+search -> sort). The result of each stage is cached under the inputs of
+that stage *and every stage before it*, so when one control changes the
+chain resumes from the last stage whose inputs are unchanged. Changing
+only the sort order, for example, reuses the filtered ids and just
+re-sorts them.
+
+``filter_ids`` runs the same chain without a cache.
+"""
+
+from collections import OrderedDict
+
+from . import metrics
+
+STAGES = ('genres', 'years', 'rating', 'search', 'sort')
+
+
+def _genres(catalog, ids, param):
+    genres, match_all = param
+    if not genres:
+        return ids
+    index = catalog.index['genres']
+    return index.all_of(genres) if match_all else index.any_of(genres)
+
+
+def _years(catalog, ids, years):
+    if years is None:
+        return ids
+    year = catalog.year[ids]
+    return ids[(year >= years[0]) & (year <= years[1])]
+
+
+def _rating(catalog, ids, min_rating):
+    if min_rating is None:
+        return ids
+    return ids[catalog.rating[ids] >= min_rating]
+
+
+def _search(catalog, ids, text):
+    # Keeps the search ranking, so a None sort leaves results by relevance
+    if not text:
+        return ids
+    hits, _ = catalog.search_index.search(text, ids=ids)
+    return hits
+
+
+def _sort(catalog, ids, param):
+    if param is None:
+        return ids
+    sort_by, descending = param
+    return catalog.sort(ids, sort_by, descending=descending)
+
+
+_STAGE_FUNCTIONS = (_genres, _years, _rating, _search, _sort)
+
+
+def stage_params(genres=(), match_all=False, years=None, min_rating=None, search='', sort_by=None, descending=False):
+    """Normalize filter arguments into one hashable parameter per stage.
+
+    ``years`` is an inclusive (first, last) range, ``search`` is matched
+    against titles, directors and stars, and ``sort_by`` names a catalog
+    column (None keeps catalog order, or relevance order when searching).
+    """
+    return (
+        (tuple(sorted(genres)), bool(match_all) and len(genres) > 1),
+        tuple(years) if years is not None else None,
+        min_rating,
+        search.strip(),
+        (sort_by, bool(descending)) if sort_by else None,
+    )
+
+
+def filter_ids(catalog, **filters):
+    """Return the ids passing every filter, in display order (see ``stage_params``)."""
+    ids = catalog.ids
+    for stage, apply, param in zip(STAGES, _STAGE_FUNCTIONS, stage_params(**filters)):
+        with metrics.timer('movierec_filter_stage_seconds', stage=stage):
+            ids = apply(catalog, ids, param)
+    return ids
+
+
+class FilterPipeline:
+    """Per-session LRU of intermediate id arrays for one catalog."""
+
+    def __init__(self, catalog, max_entries=64):
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def run(self, **filters):
+        """Same result as ``filter_ids(self.catalog, **filters)``, reusing cached stages."""
+        ids = self.catalog.ids
+        key = (self.catalog.version,)
+        for stage, apply, param in zip(STAGES, _STAGE_FUNCTIONS, stage_params(**filters)):
+            key += (param,)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                metrics.count('movierec_filter_cache_total', stage=stage, result='hit')
+                ids = cached
+                continue
+            self.misses += 1
+            metrics.count('movierec_filter_cache_total', stage=stage, result='miss')
+            with metrics.timer('movierec_filter_stage_seconds', stage=stage):
+                ids = apply(self.catalog, ids, param)
+            ids.flags.writeable = False
+            self._cache[key] = ids
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return ids
@@ -0,0 +1,187 @@
+"""Process-wide cache of Movie Quiz results.
+
+The quiz has few possible answer combinations, and many visitors give the
+same ones. A result (the ranked recommendations and their match details)
+is kept under the normalized answers, the dataset version and the feature
+weights, so a repeated combination is served without scoring the catalog.
+Exports are left to ``movierec.export``, which encodes them only when a
+user asks for the file.
+
+The in-memory LRU is bounded both by entry count and by bytes. With a
+``directory``, every result is also written there as one ``.npz`` file and
+looked up on a memory miss, so popular results survive restarts and are
+shared by the workers of the HTTP service; the directory is pruned to
+``max_files`` least recently used files.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import metrics
+from .engine import Recommendations
+from .search import normalize
+
+QUIZ_CACHE_DIR = '.cache/quiz'
+
+MAX_ENTRIES = 512
+MAX_BYTES = 64 * 2**20
+MAX_FILES = 4096
+
+
+def answers_key(answers, k=10):
+    """Hashable form of quiz ``answers``; answers that score the same map to the same key."""
+    director = answers.get('director')
+    min_rating = answers.get('rating')
+    return (
+        answers.get('mood'),
+        tuple(sorted(answers.get('story_type') or ())),
+        answers.get('duration'),
+        answers.get('era'),
+        None if min_rating is None else float(min_rating),
+        None if not director or director == "Any" else director,
+        normalize(answers.get('actor') or ''),
+        int(k),
+    )
+
+
+class QuizResult:
+    """Recommendations for one set of answers."""
+
+    def __init__(self, recommendations):
+        self.recommendations = recommendations
+
+    @classmethod
+    def compute(cls, engine, answers, k=10):
+        return cls(engine.recommend(answers, k=k))
+
+    @property
+    def nbytes(self):
+        r = self.recommendations
+        arrays = (r.ids, r.scores, r.breakdown, r.match, r.full_matches)
+        return sum(a.nbytes for a in arrays)
+
+    def save(self, path, key):
+        r = self.recommendations
+        # Not '.npz': QuizCache._prune_files must not count (or remove) a file still being written
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(path)), suffix='.npz.tmp',
+                                         delete=False) as f:
+            np.savez(f, key=repr(key), ids=r.ids, scores=r.scores, breakdown=r.breakdown,
+                     features=np.array(r.features), active=np.array(r.active, dtype=str), match=r.match,
+                     full_matches=r.full_matches)
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path, key):
+        """Load a result saved by ``save``; returns None if missing, unreadable or saved for another key."""
+        try:
+            with np.load(path) as data:
+                if str(data['key']) != repr(key):
+                    return None
+                recommendations = Recommendations(
+                    ids=data['ids'], scores=data['scores'], breakdown=data['breakdown'],
+                    features=tuple(data['features'].tolist()), active=tuple(data['active'].tolist()),
+                    match=data['match'], full_matches=data['full_matches'],
+                )
+                return cls(recommendations)
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+class QuizCache:
+    def __init__(self, directory=None, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, max_files=MAX_FILES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, engine, answers, k=10):
+        weights = tuple(sorted(engine.weights.items()))
+        return (engine.catalog.version, weights) + answers_key(answers, k)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.npz')
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.count('movierec_quiz_cache_total', result='hit')
+                return result
+        if self.directory:
+            path = self._path(key)
+            result = QuizResult.load(path, key)
+            if result is not None:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, result)
+                self.hits += 1
+                metrics.count('movierec_quiz_cache_total', result='disk')
+                return result
+        self.misses += 1
+        metrics.count('movierec_quiz_cache_total', result='miss')
+        return None
+
+    def put(self, key, result):
+        self._remember(key, result)
+        if self.directory:
+            try:
+                result.save(self._path(key), key)
+                self._prune_files()
+            except OSError:
+                pass  # the disk copy is only an optimization
+
+    def _remember(self, key, result):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = result
+            self.nbytes += result.nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                metrics.count('movierec_quiz_cache_evictions_total')
+
+    def _prune_files(self):
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.npz')]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def recommend(self, engine, answers, k=10):
+        """The QuizResult for ``answers``, computed and cached on a miss."""
+        key = self.key(engine, answers, k)
+        result = self.get(key)
+        if result is None:
+            result = QuizResult.compute(engine, answers, k)
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,143 @@
+"""Movie ids ranked by rating within every decade, genre, director and star.
+
+``RankedLists`` sorts the catalog by rating once, then groups the ranked
+ids by each key, so the top movies of one decade, genre or person are a
+slice of a precomputed array: ``top(n=10, genre='Drama')`` costs O(n)
+whatever the catalog size. Several keys at once (``genre='Drama',
+decade=1990``) intersect their lists in rank order, starting from the
+shortest; the result is kept in a small LRU, so a repeated combination is
+a slice too. ``get_ranked`` builds one per dataset version.
+
+Ties keep catalog order, as ``Catalog.sort`` does.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import metrics
+from .aggregates import MAX_VERSIONS
+from .index import EMPTY
+
+# key -> the catalog's multi-valued column it groups by
+MULTI_KEYS = {'genre': 'genres', 'director': 'directors', 'star': 'stars'}
+KEYS = ('decade',) + tuple(MULTI_KEYS)
+
+MAX_COMBINED = 256
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _group(codes, ids, rank, groups):
+    """CSR (offsets, ids) of ``ids`` grouped by ``codes``, each group in rank order."""
+    offsets = np.zeros(groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=groups), out=offsets[1:])
+    ids = ids[np.lexsort((rank[ids], codes))].astype(np.int32)
+    ids.flags.writeable = False
+    return offsets, ids
+
+
+class RankedLists:
+    """Ranked id lists of one dataset version, for every value of every key in ``KEYS``."""
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.overall = np.argsort(-np.asarray(catalog.rating), kind='stable').astype(np.int32)
+        self.rank = np.empty(len(catalog), dtype=np.int32)
+        self.rank[self.overall] = np.arange(len(catalog), dtype=np.int32)
+        self.overall.flags.writeable = False
+
+        decades, decade_codes = np.unique(catalog.decade, return_inverse=True)
+        self._labels = {'decade': decades}
+        self._codes = {'decade': {int(decade): i for i, decade in enumerate(decades)}.get}
+        self._lists = {'decade': _group(decade_codes, catalog.ids, self.rank, len(decades))}
+        for key, name in MULTI_KEYS.items():
+            # The inverted index already holds each label's ids once, grouped by label
+            index = catalog.index[name]
+            codes = np.repeat(np.arange(len(index.vocab)), np.diff(index.offsets))
+            self._labels[key] = index.vocab
+            self._codes[key] = getattr(catalog, name).code
+            self._lists[key] = _group(codes, index.postings, self.rank, len(index.vocab))
+
+        self._combined = OrderedDict()
+        self._combined_lock = threading.Lock()
+
+    def labels(self, key):
+        """Every value of ``key`` with at least one movie (decades ascending, labels sorted)."""
+        self._check(key)
+        return self._labels[key]
+
+    def _check(self, key):
+        if key not in self._lists:
+            raise ValueError(f"Unknown ranking key {key!r}; expected one of {', '.join(KEYS)}")
+
+    def _list(self, key, value):
+        self._check(key)
+        if key == 'decade':
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return EMPTY
+        code = self._codes[key](value)
+        if code is None or code < 0:
+            return EMPTY
+        offsets, ids = self._lists[key]
+        return ids[offsets[code]:offsets[code + 1]]
+
+    def _intersect(self, lists):
+        lists = sorted(lists, key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            if not len(ids):
+                return EMPTY
+            # Both lists are in rank order, so their ranks are ascending
+            ranks, other_ranks = self.rank[ids], self.rank[other]
+            positions = np.minimum(np.searchsorted(other_ranks, ranks), len(other) - 1)
+            ids = ids[other_ranks[positions] == ranks]
+        return ids
+
+    def ids(self, **keys):
+        """All ids matching every ``key=value`` given (all movies if none), best rated first."""
+        if not keys:
+            return self.overall
+        if len(keys) == 1:
+            (key, value), = keys.items()
+            return self._list(key, value)
+
+        combination = tuple(sorted((key, str(value)) for key, value in keys.items()))
+        with self._combined_lock:
+            ids = self._combined.get(combination)
+            if ids is not None:
+                self._combined.move_to_end(combination)
+                metrics.count('movierec_ranked_combined_total', result='hit')
+                return ids
+        metrics.count('movierec_ranked_combined_total', result='miss')
+        ids = self._intersect([self._list(key, value) for key, value in keys.items()])
+        with self._combined_lock:
+            self._combined[combination] = ids
+            while len(self._combined) > MAX_COMBINED:
+                self._combined.popitem(last=False)
+        return ids
+
+    def top(self, n=10, **keys):
+        """The ``n`` best rated ids matching every ``key=value`` given."""
+        return self.ids(**keys)[:n]
+
+    def count(self, **keys):
+        return len(self.ids(**keys))
+
+
+def get_ranked(catalog):
+    """Return the RankedLists for ``catalog``, building them on first use of its version."""
+    key = catalog.version or id(catalog)
+    with _lock:
+        ranked = _cache.get(key)
+        if ranked is None:
+            with metrics.timer('movierec_ranked_seconds'):
+                ranked = RankedLists(catalog)
+            _cache[key] = ranked
+            while len(_cache) > MAX_VERSIONS:
+                _cache.pop(next(iter(_cache)))
+        return ranked
@@ -0,0 +1,96 @@
+"""Per-user movie ratings, stored in a local SQLite database.
+
+Movies are referred to by a key that survives dataset refreshes: the IMDb
+id when the dataset has one, otherwise "title (year)". Every write bumps
+a revision number, which lets the recommender notice new ratings without
+re-reading the table.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+RATINGS_PATH = '.cache/ratings.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    user TEXT NOT NULL,
+    movie TEXT NOT NULL,
+    rating REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user, movie)
+);
+CREATE TABLE IF NOT EXISTS revision (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER NOT NULL);
+INSERT OR IGNORE INTO revision VALUES (0, 0);
+"""
+
+
+def movie_keys(catalog):
+    """Rating key of every movie in ``catalog``, indexed by movie id."""
+    titles = [f'{title} ({year})' for title, year in zip(catalog.title, catalog.year)]
+    if 'imdb_id' not in catalog.df:
+        return titles
+    # Rows the refresh couldn't match to the chart have a missing (NaN) id
+    return [imdb_id if isinstance(imdb_id, str) and imdb_id else title
+            for imdb_id, title in zip(catalog.df['imdb_id'], titles)]
+
+
+def key_lookup(catalog):
+    """Key -> movie id, accepting both IMDb ids and "title (year)" keys."""
+    lookup = {}
+    for i, (title, year) in enumerate(zip(catalog.title, catalog.year)):
+        lookup.setdefault(f'{title} ({year})', i)
+    if 'imdb_id' in catalog.df:
+        for i, imdb_id in enumerate(catalog.df['imdb_id']):
+            if isinstance(imdb_id, str) and imdb_id:
+                lookup[imdb_id] = i
+    return lookup
+
+
+class RatingStore:
+    def __init__(self, path=RATINGS_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _write(self, sql, params):
+        with closing(self._connect()) as db, db:
+            db.execute(sql, params)
+            db.execute('UPDATE revision SET value = value + 1')
+
+    def rate(self, user, movie, rating):
+        self._write(
+            'INSERT INTO ratings VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (user, movie) DO UPDATE SET rating = excluded.rating, updated_at = excluded.updated_at',
+            (user, movie, float(rating), time.time()),
+        )
+
+    def unrate(self, user, movie):
+        self._write('DELETE FROM ratings WHERE user = ? AND movie = ?', (user, movie))
+
+    def user_ratings(self, user):
+        """{movie key: rating} for ``user``, most recently rated first."""
+        with closing(self._connect()) as db:
+            rows = db.execute('SELECT movie, rating FROM ratings WHERE user = ? ORDER BY updated_at DESC', (user,))
+            return dict(rows.fetchall())
+
+    def all_ratings(self):
+        """Every rating as (user, movie key, rating) tuples."""
+        with closing(self._connect()) as db:
+            return db.execute('SELECT user, movie, rating FROM ratings').fetchall()
+
+    def revision(self):
+        with closing(self._connect()) as db:
+            return db.execute('SELECT value FROM revision').fetchone()[0]
+
+    def stats(self):
+        """(number of ratings, number of users)."""
+        with closing(self._connect()) as db:
+            return db.execute('SELECT COUNT(*), COUNT(DISTINCT user) FROM ratings').fetchone()
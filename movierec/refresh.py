@@ -0,0 +1,204 @@
+"""Incremental refresh of the dataset from the live chart.
+
+Only the chart page is always fetched. It is diffed against the stored
+CSV by IMDb title id:
+
+- movies new to the chart, or whose title, year or runtime changed, get
+  their detail page fetched;
+- movies still on the chart keep their stored genres, directors and stars
+  and only take the chart's new rank and rating;
+- movies that left the chart are dropped.
+
+Every run appends each movie's rank and rating to the history CSV. When
+anything changed, the new dataset replaces the old one atomically and its
+columnar store is built straight away, so the app's next load picks it up
+without parsing the CSV::
+
+    python -m movierec.refresh                  # against imdb.com
+    python -m movierec.refresh --dry-run        # only report the diff
+
+A dataset from before ids were stored is matched to the chart by title and
+year once; the refreshed CSV then carries an ``imdb_id`` column.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import pandas as pd
+
+from .catalog import DATA_PATH
+from .scraper import COLUMNS, IMDB_URL, MISSING, Scraper, ScrapeError, movie_row, save_csv
+from .search import normalize
+from .storage import build_store
+
+HISTORY_PATH = 'imdb_top_250_history.csv'
+HISTORY_COLUMNS = ('scraped_at', 'imdb_id', 'rank', 'rating', 'title')
+CHECKPOINT_DIR = '.cache/refresh'
+
+# Chart fields that, when changed, mean the stored details may be stale too
+IDENTITY_FIELDS = ('title', 'year', 'duration')
+
+
+def load_rows(path=DATA_PATH):
+    """Stored dataset rows as dicts of strings, exactly as written."""
+    if not os.path.exists(path):
+        return []
+    return pd.read_csv(path, dtype=str, keep_default_na=False).to_dict('records')
+
+
+def assign_ids(rows, chart):
+    """Give rows without an ``imdb_id`` the id of the chart entry with the same title and year.
+
+    Entries without a year on the chart (those only in its JSON-LD) match
+    on title alone when that title is unique on both sides.
+    """
+    by_title_year, by_title = {}, {}
+    for entry in chart:
+        title = normalize(entry['title'])
+        if entry['year'] != MISSING:
+            by_title_year[title, entry['year']] = entry['imdb_id']
+        by_title.setdefault(title, []).append(entry['imdb_id'])
+    stored_titles = pd.Series([normalize(row['title']) for row in rows]).value_counts()
+
+    for row in rows:
+        if row.get('imdb_id'):
+            continue
+        title = normalize(row['title'])
+        match = by_title_year.get((title, str(row['year'])))
+        if match is None and len(by_title.get(title, ())) == 1 and stored_titles[title] == 1:
+            match = by_title[title][0]
+        row['imdb_id'] = match or ''
+    return rows
+
+
+def _same(stored, fresh):
+    if fresh == MISSING:
+        return True  # the chart does not show it; keep what we have
+    try:
+        return float(stored) == float(fresh)
+    except ValueError:
+        return stored == fresh
+
+
+class Diff:
+    """How the chart differs from the stored dataset."""
+
+    def __init__(self, rows, chart):
+        stored = {row['imdb_id']: row for row in rows if row.get('imdb_id')}
+        on_chart = {entry['imdb_id'] for entry in chart}
+        self.new = [entry for entry in chart if entry['imdb_id'] not in stored]
+        self.changed = [
+            entry for entry in chart
+            if entry['imdb_id'] in stored
+            and not all(_same(stored[entry['imdb_id']][f], entry[f]) for f in IDENTITY_FIELDS)
+        ]
+        self.rerated = [
+            entry for entry in chart
+            if entry['imdb_id'] in stored and not _same(stored[entry['imdb_id']]['rating'], entry['rating'])
+        ]
+        self.dropped = [row for row in rows if row.get('imdb_id') not in on_chart]
+        ranks = {row.get('imdb_id'): rank for rank, row in enumerate(rows)}
+        self.moved = [
+            entry for rank, entry in enumerate(chart)
+            if entry['imdb_id'] in stored and ranks[entry['imdb_id']] != rank
+        ]
+
+    @property
+    def to_fetch(self):
+        return self.new + self.changed
+
+    def __bool__(self):
+        return bool(self.new or self.changed or self.rerated or self.dropped or self.moved)
+
+    def summary(self):
+        return (f"{len(self.new)} new, {len(self.dropped)} dropped, {len(self.changed)} changed, "
+                f"{len(self.rerated)} re-rated, {len(self.moved)} moved")
+
+
+def merge(rows, chart, details):
+    """New dataset rows in chart order.
+
+    Stored rows keep their details and take the chart's rank and rating;
+    fetched entries are built from their detail records.
+    """
+    stored = {row['imdb_id']: row for row in rows if row.get('imdb_id')}
+    merged = []
+    for entry in chart:
+        if entry['url'] in details:
+            merged.append(movie_row(entry, details[entry['url']]))
+            continue
+        row = {column: stored[entry['imdb_id']].get(column, MISSING) for column in COLUMNS}
+        if entry['rating'] != MISSING:
+            row['rating'] = entry['rating']
+        merged.append(row)
+    return merged
+
+
+def append_history(chart, path=HISTORY_PATH, scraped_at=None):
+    scraped_at = scraped_at or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    history = pd.DataFrame(
+        [(scraped_at, entry['imdb_id'], rank, entry['rating'], entry['title']) for rank, entry in enumerate(chart, 1)],
+        columns=HISTORY_COLUMNS,
+    )
+    exists = os.path.exists(path)
+    history.to_csv(path, mode='a', header=not exists, index=False, encoding='utf-8')
+
+
+async def refresh_async(scraper, csv_path=DATA_PATH, history_path=HISTORY_PATH, dry_run=False):
+    """Bring ``csv_path`` up to date with the chart; returns the Diff."""
+    async with scraper.client() as client:
+        chart = await scraper.fetch_chart(client)
+        rows = load_rows(csv_path)
+        unmatched = any(not row.get('imdb_id') for row in rows)
+        rows = assign_ids(rows, chart)
+        diff = Diff(rows, chart)
+        scraper.log(f"Chart vs {csv_path}: {diff.summary()}")
+        if dry_run:
+            return diff
+        details = await scraper.fetch_details(client, diff.to_fetch) if diff.to_fetch else {}
+
+    # fetch_details also returns what the checkpoint held from earlier runs; only
+    # this run's new movies may replace stored rows
+    wanted = {entry['url'] for entry in diff.to_fetch}
+    details = {url: detail for url, detail in details.items() if url in wanted}
+
+    append_history(chart, history_path)
+    merged = merge(rows, chart, details)
+    if diff or unmatched:  # write the ids matched this run even if nothing else changed
+        save_csv(merged, csv_path)
+        build_store(csv_path)
+    scraper.checkpoint.clear()
+    return diff
+
+
+def refresh(base_url=IMDB_URL, csv_path=DATA_PATH, history_path=HISTORY_PATH, dry_run=False, **options):
+    options.setdefault('checkpoint_dir', CHECKPOINT_DIR)
+    return asyncio.run(refresh_async(Scraper(base_url, **options), csv_path, history_path, dry_run))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the dataset with only what changed on the chart.")
+    parser.add_argument('--base-url', default=IMDB_URL)
+    parser.add_argument('--csv', default=DATA_PATH)
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=5.0, help="requests per second (0 for no limit)")
+    parser.add_argument('--dry-run', action='store_true', help="report the diff without fetching or writing")
+    args = parser.parse_args(argv)
+
+    try:
+        diff = refresh(args.base_url, args.csv, args.history, args.dry_run,
+                       concurrency=args.concurrency, rate=args.rate)
+    except ScrapeError as e:
+        print(f"⚠️ {e}")
+        return 1
+    if not args.dry_run:
+        print(f"✅ Fetched {len(diff.to_fetch)} detail pages; {args.csv} is up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Hot-reloadable dataset shared by every session of a process.
+
+``DatasetRegistry.current()`` returns the loaded ``core.Resources``
+(catalog, quiz engine, similarity index). At most every
+``poll_interval`` seconds it also compares the CSV's size and mtime with
+the ones it last loaded; on a change, the new version is loaded and warmed
+(search index, aggregate tables, and with ``warm_charts`` the static
+charts) on a background thread while requests keep being served from the
+old one, then swapped in with a single assignment. The first load skips
+the charts so it doesn't hold up the first page.
+
+A session that fetched ``current()`` at the start of its rerun (or a
+request at its start) keeps using that object until it finishes, so
+in-flight work never sees a half-swapped dataset; the old version is
+freed once nothing refers to it. Derived caches keyed by
+``catalog.version`` (aggregates, filter pipelines) follow automatically.
+"""
+
+import os
+import threading
+import time
+
+from . import core, metrics
+
+POLL_INTERVAL = 5.0  # seconds
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DatasetRegistry:
+    def __init__(self, csv_path, loader=None, poll_interval=POLL_INTERVAL, warm_charts=False):
+        self.csv_path = csv_path
+        self.loader = loader or core.Resources.load
+        self.poll_interval = poll_interval
+        self.warm_charts = warm_charts
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._checked = time.monotonic()
+        self._stat = _stat(csv_path)
+        self._current = self._load()
+        self.loaded_at = time.time()
+
+    @property
+    def version(self):
+        return self._current.catalog.version
+
+    @property
+    def reloading(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def current(self):
+        """The live Resources; checks the data file for changes at most every ``poll_interval``."""
+        now = time.monotonic()
+        if now - self._checked >= self.poll_interval:
+            self._checked = now
+            self.check()
+        return self._current
+
+    def check(self):
+        """Start a background reload if the data file changed; returns True if one started."""
+        stat = _stat(self.csv_path)
+        if stat is None or stat == self._stat:
+            return False
+        with self._lock:
+            if self.reloading:
+                return False  # the next check picks up anything written meanwhile
+            self._stat = stat
+            self._thread = threading.Thread(target=self._reload, name='movierec-reload', daemon=True)
+            self._thread.start()
+        return True
+
+    def reload(self, wait=False):
+        """Reload even if the file looks unchanged; with ``wait``, block until it is done."""
+        with self._lock:
+            self._stat = None
+        started = self.check()
+        if wait and self._thread is not None:
+            self._thread.join()
+        return started
+
+    def _load(self, charts=False):
+        resources = self.loader(self.csv_path)
+        resources.warm(charts=charts)
+        return resources
+
+    def _reload(self):
+        try:
+            with metrics.timer('movierec_reload_seconds'):
+                resources = self._load(charts=self.warm_charts)
+        except Exception as e:  # keep serving the old version
+            self.last_error = e
+            metrics.count('movierec_reloads_total', result='error')
+            return
+        self.last_error = None
+        if resources.catalog.version == self.version:
+            metrics.count('movierec_reloads_total', result='unchanged')
+            return
+        self._current = resources
+        self.loaded_at = time.time()
+        metrics.count('movierec_reloads_total', result='swapped')
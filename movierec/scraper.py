@@ -0,0 +1,474 @@
+"""Concurrent, resumable IMDb Top 250 scraper.
+
+Replaces the Selenium notebook: pages are fetched with plain HTTP and
+parsed with the standard library's ``html.parser``, no browser involved.
+The chart page is read first; every movie's detail page (genres,
+directors, stars) is then fetched concurrently through a bounded
+connection pool and a token-bucket rate limiter, with retries for
+throttling and server errors.
+
+Progress is checkpointed under ``--checkpoint`` (the chart as
+``chart.json``, each finished detail page as one line of
+``details.jsonl``), so an interrupted run picks up where it stopped::
+
+    python -m movierec.scraper --output imdb_top_250_movies_with_ratings.csv
+    python -m movierec.scraper --base-url http://127.0.0.1:8765   # stand-in server
+
+See ``movierec.fixtures`` for saved pages and a local stand-in server.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import httpx
+import pandas as pd
+
+from . import metrics
+from .catalog import DATA_PATH
+
+IMDB_URL = 'https://www.imdb.com'
+CHART_PATH = '/chart/top/'
+CHECKPOINT_DIR = '.cache/scrape'
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36')
+
+COLUMNS = ('title', 'year', 'duration', 'rating', 'genres', 'directors', 'stars', 'imdb_id')
+MISSING = 'N/A'
+STAR_COUNT = 3
+
+# Responses worth retrying, with exponential backoff starting at BACKOFF seconds
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BACKOFF = 1.0
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class ScrapeError(Exception):
+    pass
+
+
+# -- HTML -----------------------------------------------------------------
+
+class Node:
+    """An element of a parsed page: tag, attributes, children and text."""
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.parts = []
+
+    @property
+    def classes(self):
+        return (self.attrs.get('class') or '').split()
+
+    @property
+    def text(self):
+        """Whitespace-normalized text of this element and its descendants."""
+        return ' '.join(''.join(self._texts()).split())
+
+    def _texts(self):
+        for part in self.parts:
+            yield part if isinstance(part, str) else ''.join(part._texts())
+
+    def iter(self):
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def find_all(self, tag=None, cls=None, **attrs):
+        """Descendants matching ``tag``, having class ``cls`` and every ``attrs`` value.
+
+        Attribute names use underscores for dashes (``data_testid``).
+        """
+        attrs = {name.replace('_', '-'): value for name, value in attrs.items()}
+        return [
+            node for node in self.iter()
+            if (tag is None or node.tag == tag)
+            and (cls is None or cls in node.classes)
+            and all(node.attrs.get(name) == value for name, value in attrs.items())
+        ]
+
+    def find(self, tag=None, cls=None, **attrs):
+        found = self.find_all(tag, cls, **attrs)
+        return found[0] if found else None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document', {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or '' for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        self._stack[-1].parts.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; stray end tags are ignored
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].parts.append(data)
+
+
+def parse_html(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _json_ld(document):
+    """Parsed ``application/ld+json`` blocks of a page."""
+    blocks = []
+    for script in document.find_all('script', type='application/ld+json'):
+        try:
+            blocks.append(json.loads(''.join(p for p in script.parts if isinstance(p, str))))
+        except ValueError:
+            continue
+    return blocks
+
+
+def iso_duration(value):
+    """Format an ISO-8601 duration ('PT2H22M') the way the chart shows it ('2h 22m')."""
+    match = re.fullmatch(r'PT(?:(\d+)H)?(?:(\d+)M)?', value or '')
+    if not match or not any(match.groups()):
+        return MISSING
+    hours, minutes = match.groups()
+    return ' '.join(part for part in (f'{hours}h' if hours else '', f'{minutes}m' if minutes else '') if part)
+
+
+def _ld_rating(block):
+    # JSON-LD serializes 9.0 as 9; the chart and the dataset always show one decimal
+    value = block.get('aggregateRating', {}).get('ratingValue')
+    try:
+        return f'{float(value):.1f}'
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def parse_chart(html, base_url=IMDB_URL):
+    """Chart entries as dicts with title, year, duration, rating and detail ``url``.
+
+    The rendered list only carries the first few dozen movies; the rest
+    come from the page's JSON-LD item list, which has no year (the detail
+    page supplies it).
+    """
+    document = parse_html(html)
+    entries = {}
+    for item in document.find_all('li', cls='ipc-metadata-list-summary-item'):
+        link = item.find('a', cls='ipc-title-link-wrapper')
+        title = item.find(cls='ipc-title__text')
+        if link is None or title is None:
+            continue
+        url = _detail_url(base_url, link.attrs.get('href', ''))
+        metadata = [node.text for node in item.find_all(cls='cli-title-metadata-item')]
+        rating = item.find(cls='ipc-rating-star--rating')
+        title = title.text
+        entries[url] = {
+            'title': title.split('. ', 1)[1] if re.match(r'\d+\. ', title) else title,
+            'year': metadata[0] if metadata else MISSING,
+            'duration': metadata[1] if len(metadata) > 1 else MISSING,
+            'rating': rating.text if rating else MISSING,
+            'url': url,
+            'imdb_id': imdb_id(url),
+        }
+
+    for block in _json_ld(document):
+        if block.get('@type') != 'ItemList':
+            continue
+        for element in block.get('itemListElement', []):
+            movie = element.get('item', {})
+            url = _detail_url(base_url, movie.get('url', ''))
+            if url in entries or not movie.get('name'):
+                continue
+            entries[url] = {
+                'title': unescape(movie['name']),  # JSON-LD strings keep entities like &apos;
+                'year': MISSING,
+                'duration': iso_duration(movie.get('duration')),
+                'rating': _ld_rating(movie),
+                'url': url,
+                'imdb_id': imdb_id(url),
+            }
+    return list(entries.values())
+
+
+def imdb_id(url):
+    """The title id ('tt0111161') in a detail page URL, or '' if there is none."""
+    match = re.search(r'/title/(tt\d+)', url)
+    return match.group(1) if match else ''
+
+
+def _detail_url(base_url, href):
+    # Links may be absolute or carry tracking query strings ("?ref_=chttp_t_1"); only
+    # the path is kept, so saved pages replayed by a stand-in server stay local
+    return base_url.rstrip('/') + urlsplit(href).path
+
+
+def _names(nodes):
+    names = [node.text for node in nodes if node.text]
+    return ', '.join(dict.fromkeys(names)) if names else MISSING
+
+
+def parse_detail(html):
+    """Genres, directors, stars (and year/duration/rating fallbacks) from a title page."""
+    document = parse_html(html)
+    genres = [span for chip in document.find_all('a', cls='ipc-chip--on-baseAlt')
+              for span in chip.find_all('span', cls='ipc-chip__text')]
+    if not genres:
+        genres = [span for box in document.find_all(data_testid='genres') for span in box.find_all('span')]
+
+    directors = MISSING
+    for credit in document.find_all('li', data_testid='title-pc-principal-credit'):
+        label = credit.find(cls='ipc-metadata-list-item__label')
+        if label is not None and 'Director' in label.text:
+            directors = _names(credit.find_all('a', cls='ipc-metadata-list-item__list-content-item'))
+            break
+
+    actors = []
+    for cast in document.find_all(data_testid='title-cast'):
+        actors.extend(cast.find_all('a', data_testid='title-cast-item__actor'))
+
+    detail = {'genres': _names(genres), 'directors': directors, 'stars': _names(actors[:STAR_COUNT])}
+    for block in _json_ld(document):
+        if block.get('@type') == 'Movie':
+            published = block.get('datePublished') or ''
+            detail['year'] = published[:4] if published[:4].isdigit() else MISSING
+            detail['duration'] = iso_duration(block.get('duration'))
+            detail['rating'] = _ld_rating(block)
+            break
+    return detail
+
+
+# -- Fetching -------------------------------------------------------------
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._updated = loop.time()
+                self._tokens = 1
+            self._tokens -= 1
+
+
+class Checkpoint:
+    """Chart and finished detail pages of an in-progress scrape."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chart_path = os.path.join(directory, 'chart.json')
+        self.details_path = os.path.join(directory, 'details.jsonl')
+
+    def clear(self):
+        for path in (self.chart_path, self.details_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load_chart(self):
+        try:
+            with open(self.chart_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_chart(self, entries):
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False, encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(f.name, self.chart_path)
+
+    def load_details(self):
+        details = {}
+        try:
+            with open(self.details_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    details[record['url']] = record
+        except OSError:
+            pass
+        return details
+
+    def add_detail(self, record):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.details_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+class Scraper:
+    def __init__(self, base_url=IMDB_URL, concurrency=8, rate=5.0, checkpoint_dir=CHECKPOINT_DIR,
+                 retries=3, timeout=20.0, log=print):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate, burst=concurrency)
+        self.checkpoint = Checkpoint(checkpoint_dir)
+        self.retries = retries
+        self.timeout = timeout
+        self.log = log
+
+    async def fetch(self, client, url):
+        """GET ``url`` as text, retrying throttled, failed and timed-out requests."""
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            try:
+                with metrics.timer('movierec_scrape_fetch_seconds'):
+                    response = await client.get(url)
+            except httpx.TransportError as e:
+                error, wait = str(e) or type(e).__name__, BACKOFF * 2 ** attempt
+            else:
+                metrics.count('movierec_scrape_responses_total', status=response.status_code)
+                if response.status_code == 200:
+                    return response.text
+                if response.status_code not in RETRY_STATUS:
+                    raise ScrapeError(f"{url}: HTTP {response.status_code}")
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After', '')
+                wait = float(retry_after) if retry_after.isdigit() else BACKOFF * 2 ** attempt
+            if attempt < self.retries:
+                await asyncio.sleep(wait)
+        raise ScrapeError(f"{url}: {error} after {self.retries + 1} attempts")
+
+    def client(self):
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'}
+        return httpx.AsyncClient(limits=limits, headers=headers, timeout=self.timeout, follow_redirects=True)
+
+    async def fetch_chart(self, client):
+        """Chart entries in rank order (see ``parse_chart``)."""
+        chart = parse_chart(await self.fetch(client, self.base_url + CHART_PATH), self.base_url)
+        if not chart:
+            raise ScrapeError("No movies found on the chart page")
+        return chart
+
+    async def _detail(self, client, entry, done, total):
+        html = await self.fetch(client, entry['url'])
+        record = {'url': entry['url'], **parse_detail(html)}
+        self.checkpoint.add_detail(record)
+        done.append(entry['url'])
+        self.log(f"-> Scraped ({len(done)}/{total}): {entry['title']}")
+        return record
+
+    async def fetch_details(self, client, entries):
+        """Detail records of ``entries`` keyed by URL, skipping pages already checkpointed.
+
+        Raises ScrapeError if any page still fails after its retries; the
+        pages that did succeed stay checkpointed for the next run.
+        """
+        details = self.checkpoint.load_details()
+        pending = [entry for entry in entries if entry['url'] not in details]
+        if len(pending) < len(entries):
+            self.log(f"{len(entries) - len(pending)} of {len(entries)} detail pages already scraped")
+
+        done = []
+        results = await asyncio.gather(
+            *(self._detail(client, entry, done, len(pending)) for entry in pending),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        for record in results:
+            if isinstance(record, dict):
+                details[record['url']] = record
+        if failures:
+            for failure in failures[:5]:
+                self.log(f"  ⚠️ {failure}")
+            raise ScrapeError(f"{len(failures)} of {len(entries)} detail pages failed; run again to resume")
+        return details
+
+    async def run(self, resume=True):
+        """Scrape the chart and all detail pages; returns the rows in chart order."""
+        if not resume:
+            self.checkpoint.clear()
+        async with self.client() as client:
+            chart = self.checkpoint.load_chart()
+            if chart is None:
+                chart = await self.fetch_chart(client)
+                self.checkpoint.save_chart(chart)
+            self.log(f"{len(chart)} movies on the chart")
+            details = await self.fetch_details(client, chart)
+        return [movie_row(entry, details[entry['url']]) for entry in chart]
+
+
+def movie_row(entry, detail):
+    """Dataset row for a chart entry and its detail record."""
+    row = {column: entry.get(column, MISSING) for column in COLUMNS}
+    for column in ('year', 'duration', 'rating'):
+        if row[column] == MISSING:
+            row[column] = detail.get(column, MISSING)
+    for column in ('genres', 'directors', 'stars'):
+        row[column] = detail.get(column, MISSING)
+    return row
+
+
+def save_csv(rows, path=DATA_PATH):
+    """Write rows atomically with the same layout and encoding as the original scrape."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False,
+                                     encoding='utf-8-sig', newline='') as f:
+        pd.DataFrame(rows, columns=COLUMNS).to_csv(f, index=False)
+    os.replace(f.name, path)
+
+
+def scrape(base_url=IMDB_URL, resume=True, **options):
+    return asyncio.run(Scraper(base_url, **options).run(resume=resume))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the IMDb Top 250 into a CSV.")
+    parser.add_argument('--base-url', default=IMDB_URL)
+    parser.add_argument('--output', default=DATA_PATH)
+    parser.add_argument('--concurrency', type=int, default=8, help="simultaneous connections")
+    parser.add_argument('--rate', type=float, default=5.0, help="requests per second (0 for no limit)")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_DIR)
+    parser.add_argument('--fresh', action='store_true', help="ignore an earlier, unfinished run")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = scrape(args.base_url, resume=not args.fresh, concurrency=args.concurrency,
+                      rate=args.rate, checkpoint_dir=args.checkpoint)
+    except ScrapeError as e:
+        print(f"⚠️ {e}")
+        return 1
+    save_csv(rows, args.output)
+    Checkpoint(args.checkpoint).clear()
+    print(f"✅ Saved {len(rows)} movies to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Ranked, typo-tolerant search over titles, directors and stars.
+
+Text is folded to lowercase ASCII (accents stripped, punctuation dropped)
+and split into tokens. Each query token matches index tokens exactly, by
+prefix, or within a small edit distance found through a trigram index, and
+every query token has to match for a movie to be returned. User input is
+always treated as literal text, never as a pattern.
+
+``suggest`` serves autocomplete from a sorted list of word-start keys
+("christopher nolan", "nolan", ...) for every title and person, once per
+distinct name. ``people`` finds directors or stars by name through a
+token -> person postings table built with the index.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from . import metrics
+
+FIELD_WEIGHTS = {'title': 3.0, 'directors': 2.0, 'stars': 2.0}
+
+# Match strength by kind; fuzzy matches lose FUZZY_PENALTY per edit
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6
+FUZZY_PENALTY = 0.15
+
+# Bonus when the whole query appears in the title as typed (word order kept)
+PHRASE_BONUS = 2.0
+
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Fold ``text`` to lowercase ASCII words separated by single spaces."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return _NON_WORD.sub(' ', text).strip()
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def max_edits(token):
+    """Edits allowed for a query token of this length."""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def _trigrams(token):
+    padded = f'^{token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Edit distance between ``a`` and ``b`` counting adjacent swaps as one edit.
+
+    Returns ``limit + 1`` as soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _kth_highest(scores, k):
+    return np.partition(scores, len(scores) - k)[len(scores) - k]
+
+
+class SearchIndex:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+        # token -> {movie id: best field weight}
+        postings = defaultdict(dict)
+
+        def add(movie_id, tokens, weight):
+            for token in tokens:
+                entry = postings[token]
+                if entry.get(movie_id, 0.0) < weight:
+                    entry[movie_id] = weight
+
+        for movie_id, title in enumerate(catalog.title):
+            add(movie_id, tokenize(title), FIELD_WEIGHTS['title'])
+        label_tokens = {}
+        for field in ('directors', 'stars'):
+            column = getattr(catalog, field)
+            label_tokens[field] = [tokenize(label) for label in column.vocab]
+            for movie_id, code in zip(column.row_ids, column.codes):
+                add(movie_id, label_tokens[field][code], FIELD_WEIGHTS[field])
+
+        self.tokens = sorted(postings)
+        counts = np.fromiter((len(postings[t]) for t in self.tokens), dtype=np.int64, count=len(self.tokens))
+        self.offsets = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.post_ids = np.fromiter((i for t in self.tokens for i in postings[t]),
+                                    dtype=np.int32, count=int(self.offsets[-1]))
+        self.post_weights = np.fromiter((w for t in self.tokens for w in postings[t].values()),
+                                        dtype=np.float32, count=int(self.offsets[-1]))
+        self._build_people(label_tokens)
+
+        self._trigram_tokens = defaultdict(list)
+        for token_id, token in enumerate(self.tokens):
+            for gram in _trigrams(token):
+                self._trigram_tokens[gram].append(token_id)
+
+        self._normalized_titles = [normalize(title) for title in catalog.title]
+        self._build_suggestions()
+
+    def _build_people(self, label_tokens):
+        # field -> CSR (offsets, label codes) by token id, so people() never rescans the vocabulary
+        token_ids = {token: token_id for token_id, token in enumerate(self.tokens)}
+        self._people = {}
+        for field, tokens_by_code in label_tokens.items():
+            pairs = np.array([(token_ids[token], code) for code, tokens in enumerate(tokens_by_code)
+                              for token in set(tokens)], dtype=np.int64).reshape(-1, 2)
+            pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+            offsets = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(pairs[:, 0], minlength=len(self.tokens)), out=offsets[1:])
+            self._people[field] = offsets, pairs[:, 1].astype(np.int32)
+
+    def _build_suggestions(self):
+        # Entities are (label, kind, popularity); keys are every word-start suffix of the label
+        catalog = self.catalog
+        entities = [(title, 'title', float(rating)) for title, rating in zip(catalog.title, catalog.rating)]
+        for field, kind in (('directors', 'director'), ('stars', 'star')):
+            column = getattr(catalog, field)
+            entities.extend((label, kind, float(count)) for label, count in zip(column.vocab, column.counts()))
+
+        keys = []
+        for entity_id, (label, _, _) in enumerate(entities):
+            words = normalize(label).split()
+            for i in range(len(words)):
+                keys.append((' '.join(words[i:]), i, entity_id))
+        keys.sort()
+        self._entities = entities
+        self._suggest_keys = [key for key, _, _ in keys]
+        self._suggest_later = np.array([start > 0 for _, start, _ in keys], dtype=bool)
+        self._suggest_entity = np.array([entity_id for _, _, entity_id in keys], dtype=np.int32)
+
+        # Per entity: popularity, rank of its label in sorted order, and one group per distinct
+        # (label, kind), so movies sharing a title are suggested once
+        self._entity_popularity = np.array([popularity for _, _, popularity in entities], dtype=np.float64)
+        labels = sorted({label for label, _, _ in entities})
+        label_rank = {label: rank for rank, label in enumerate(labels)}
+        self._entity_label_rank = np.array([label_rank[label] for label, _, _ in entities], dtype=np.int64)
+        groups = {}
+        self._entity_group = np.array([groups.setdefault((label, kind), len(groups)) for label, kind, _ in entities],
+                                      dtype=np.int64)
+
+    def _expand(self, token):
+        """Index tokens matching query ``token`` as (token id, strength) pairs."""
+        lo = bisect_left(self.tokens, token)
+        hi = bisect_left(self.tokens, token + '\x7f')
+        matches = [(t, EXACT if self.tokens[t] == token else PREFIX) for t in range(lo, hi)]
+        if any(strength == EXACT for _, strength in matches):
+            return matches
+
+        limit = max_edits(token)
+        if limit:
+            candidates = set()
+            for gram in _trigrams(token):
+                candidates.update(self._trigram_tokens.get(gram, ()))
+            seen = {t for t, _ in matches}
+            for t in candidates - seen:
+                distance = edit_distance(token, self.tokens[t], limit)
+                if distance <= limit:
+                    matches.append((t, FUZZY - FUZZY_PENALTY * (distance - 1)))
+        return matches
+
+    def _token_scores(self, token):
+        """Sorted ids of the movies matching query ``token``, with their best weight times strength."""
+        hits, scores = [], []
+        for token_id, strength in self._expand(token):
+            start, stop = self.offsets[token_id], self.offsets[token_id + 1]
+            hits.append(self.post_ids[start:stop])
+            scores.append(self.post_weights[start:stop] * strength)
+        if not hits:
+            return self.post_ids[:0], self.post_weights[:0]
+        hits, scores = np.concatenate(hits), np.concatenate(scores)
+        # By movie, best score first, then keep each movie's first row
+        order = np.lexsort((-scores, hits))
+        hits, scores = hits[order], scores[order]
+        first = np.ones(len(hits), dtype=bool)
+        np.not_equal(hits[1:], hits[:-1], out=first[1:])
+        return hits[first], scores[first]
+
+    @metrics.timer('movierec_search_seconds')
+    def search(self, query, ids=None, limit=None):
+        """Return (ids, scores) of movies matching every token of ``query``, best first.
+
+        ``ids`` optionally restricts the results to a subset of movies.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, np.zeros(0, dtype=np.float32)
+
+        # Scores only ever touch the posting lists, never an array over the whole catalog
+        hits, scores = self._token_scores(tokens[0])
+        if ids is not None:
+            hits, found, _ = np.intersect1d(hits, ids, assume_unique=True, return_indices=True)
+            scores = scores[found]
+        for token in tokens[1:]:
+            if not len(hits):
+                break
+            token_hits, token_scores = self._token_scores(token)
+            hits, found, token_found = np.intersect1d(hits, token_hits, assume_unique=True, return_indices=True)
+            scores = scores[found] + token_scores[token_found]
+
+        # A substring test per hit: np.char.find is slower than this on NumPy 1.x
+        phrase = ' '.join(tokens)
+        titles = self._normalized_titles
+        in_title = np.fromiter((phrase in titles[movie_id] for movie_id in hits.tolist()), dtype=bool, count=len(hits))
+        scores[in_title] += PHRASE_BONUS
+
+        if limit is not None and len(hits) > limit:
+            # Only hits tied with or above the limit-th score can be returned
+            top = scores >= _kth_highest(scores, limit)
+            hits, scores = hits[top], scores[top]
+        order = np.lexsort((-self.catalog.rating[hits], -scores))
+        if limit is not None:
+            order = order[:limit]
+        return hits[order].astype(np.int32), scores[order]
+
+    def people(self, field, query):
+        """Labels in ``field`` ('directors' or 'stars') whose names match every token of ``query``."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        offsets, label_codes = self._people[field]
+        codes = None
+        for token in tokens:
+            matches = [label_codes[offsets[t]:offsets[t + 1]] for t, _ in self._expand(token)]
+            found = np.unique(np.concatenate(matches)) if matches else label_codes[:0]
+            codes = found if codes is None else np.intersect1d(codes, found, assume_unique=True)
+            if not len(codes):
+                return []
+        vocab = getattr(self.catalog, field).vocab
+        return [vocab[code] for code in codes]
+
+    @metrics.timer('movierec_suggest_seconds')
+    def suggest(self, prefix, limit=8):
+        """Autocomplete: [(label, kind)] whose name has a word starting with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        lo = bisect_left(self._suggest_keys, prefix)
+        hi = bisect_left(self._suggest_keys, prefix + '\x7f')
+
+        if lo == hi:
+            return []
+        entity = self._suggest_entity[lo:hi]
+        group = self._entity_group[entity]
+        # Groups that tie on everything below keep the order they were first found in
+        _, first, inverse = np.unique(group, return_index=True, return_inverse=True)
+        # Matches at the start of the name rank above matches on a later word, then popularity,
+        # then the label; each group's first row in that order is its best match
+        order = np.lexsort((first[inverse], self._entity_label_rank[entity], -self._entity_popularity[entity],
+                            self._suggest_later[lo:hi]))
+        _, best = np.unique(group[order], return_index=True)
+        ranked = entity[order[np.sort(best)[:limit]]]
+        return [self._entities[entity_id][:2] for entity_id in ranked.tolist()]
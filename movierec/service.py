@@ -0,0 +1,174 @@
+"""JSON HTTP service over the headless query API.
+
+Run with several workers; each loads the catalog once at startup:
+
+    uvicorn movierec.service:app --workers 4
+
+``MOVIEREC_DATA`` overrides the CSV path; a changed file is reloaded in
+the background and swapped in without dropping requests.
+
+Lookups that finish well under a millisecond are ``async`` and run inline
+on the event loop. Handlers that can take longer (scoring a quiz on a
+cache miss, similarity, comparisons, exports) are plain functions, which
+FastAPI runs in its threadpool so they don't stall other requests.
+"""
+
+import os
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from . import core, metrics
+from .catalog import DATA_PATH
+from .export import FORMATS, iter_export
+from .registry import DatasetRegistry
+
+registry = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global registry
+    registry = DatasetRegistry(os.environ.get('MOVIEREC_DATA', DATA_PATH))
+    yield
+
+
+app = FastAPI(title="IMDB Top 250 Movie Recommender", lifespan=lifespan)
+
+
+@app.middleware('http')
+async def time_requests(request: Request, call_next):
+    # Unknown paths share one label so scanners can't blow up the series count
+    route = request.url.path if request.url.path in _paths else 'other'
+    with metrics.timer('movierec_request_seconds', endpoint=route) as timer:
+        response = await call_next(request)
+    metrics.count('movierec_requests_total', endpoint=route, status=response.status_code)
+    response.headers['Server-Timing'] = f'app;dur={timer.seconds * 1000:.2f}'
+    return response
+
+
+@app.get('/version')
+async def version():
+    resources = registry.current()
+    return {
+        'version': resources.catalog.version,
+        'movies': len(resources.catalog),
+        'loaded_at': registry.loaded_at,
+        'reloading': registry.reloading,
+    }
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Latency histograms and counters of this worker, in Prometheus text format."""
+    return metrics.REGISTRY.to_prometheus()
+
+
+@app.get('/metrics.json')
+async def json_metrics():
+    return metrics.REGISTRY.snapshot()
+
+
+@app.get('/search')
+async def search(q: str, limit: int = Query(20, ge=1, le=500)):
+    return {'query': q, 'results': core.search(registry.current().catalog, q, limit=limit)}
+
+
+@app.get('/recommend')
+def recommend(
+    mood: Optional[str] = None,
+    story_type: List[str] = Query([]),
+    duration: str = "Any length",
+    era: str = "Any era",
+    rating: Optional[float] = None,
+    director: str = "Any",
+    actor: str = "",
+    k: int = Query(10, ge=1, le=500),
+):
+    answers = {
+        'mood': mood,
+        'story_type': story_type,
+        'duration': duration,
+        'era': era,
+        'rating': rating,
+        'director': director,
+        'actor': actor,
+    }
+    resources = registry.current()
+    return core.recommend(resources.engine, answers, k=k, cache=resources.quiz_cache)
+
+
+@app.get('/top')
+async def top(by: str = 'rating', value: Optional[str] = None, n: int = Query(20, ge=1, le=500),
+              decade: Optional[int] = None, genre: Optional[str] = None, director: Optional[str] = None,
+              star: Optional[str] = None):
+    if by not in core.TOP_BY:
+        raise HTTPException(422, f"'by' must be one of {', '.join(core.TOP_BY)}")
+    if by != 'rating' and value is None:
+        raise HTTPException(422, f"'value' is required when ranking by {by}")
+    if by == 'decade' and not value.isdigit():
+        raise HTTPException(422, "'value' must be a decade such as 1990")
+    keys = {key: v for key, v in (('decade', decade), ('genre', genre), ('director', director), ('star', star))
+            if v is not None}
+    try:
+        results = core.top(registry.current().catalog, by, value, n, **keys)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    return {'by': by, 'value': value, **keys, 'results': results}
+
+
+@app.get('/similar')
+def similar(title: str, k: int = Query(10, ge=1, le=100)):
+    try:
+        results = core.similar(registry.current().similarity, title, k=k)
+    except KeyError:
+        raise HTTPException(404, f"Unknown movie title: {title!r}")
+    return {'title': title, 'results': results}
+
+
+@app.get('/between')
+async def between(title: List[str] = Query(..., min_length=2), k: int = Query(10, ge=1, le=100)):
+    try:
+        results = core.between(registry.current().ann, title, k=k)
+    except KeyError as e:
+        raise HTTPException(404, f"Unknown movie title: {e.args[0]!r}")
+    return {'titles': title, 'results': results}
+
+
+@app.get('/compare')
+def compare(title: List[str] = Query(..., min_length=2)):
+    try:
+        return core.compare(registry.current().catalog, title)
+    except KeyError as e:
+        raise HTTPException(404, f"Unknown movie title: {e.args[0]!r}")
+
+
+@app.get('/export')
+def export(
+    format: str = 'csv',
+    genre: List[str] = Query([]),
+    match_all: bool = False,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    q: str = '',
+    sort_by: Optional[Literal[core.SORT_BY]] = 'rating',
+    descending: bool = True,
+):
+    """The Find Movies result for these filters as a file, streamed in chunks."""
+    if format not in FORMATS:
+        raise HTTPException(422, f"'format' must be one of {', '.join(FORMATS)}")
+    catalog = registry.current().catalog
+    years = None
+    if year_min is not None or year_max is not None:
+        years = (year_min if year_min is not None else int(catalog.year.min()),
+                 year_max if year_max is not None else int(catalog.year.max()))
+    ids = core.find(catalog, genres=genre, match_all=match_all, years=years, min_rating=min_rating, text=q,
+                    sort_by=sort_by, descending=descending)
+    extension, mime = FORMATS[format]
+    return StreamingResponse(iter_export(catalog, ids, format), media_type=mime,
+                             headers={'Content-Disposition': f'attachment; filename="movies.{extension}"'})
+
+_paths = {route.path for route in app.routes}
@@ -0,0 +1,176 @@
+"""Content-based "more like this" neighbours.
+
+Every movie is described by a sparse vector of TF-IDF weighted genres,
+directors and stars plus one-hot decade and runtime buckets. The top-k
+cosine neighbours of every movie are computed once and stored as two
+compact arrays, so a lookup at request time is a single row slice.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+from scipy import sparse
+
+# Relative weight of each feature block in the cosine similarity
+BLOCK_WEIGHTS = {
+    'genres': 1.0,
+    'directors': 1.0,
+    'stars': 0.8,
+    'decade': 0.5,
+    'runtime': 0.3,
+}
+
+RUNTIME_BINS = np.array([90, 120, 150, 180])
+
+# Upper bound on the dense (rows x catalog) score block held in memory at once
+MAX_BLOCK_CELLS = 1 << 24
+
+# Catalog columns the features are built from; the decade comes from the year
+FEATURE_COLUMNS = ('year', 'minutes', 'genres', 'directors', 'stars')
+
+
+def fingerprint(catalog, columns=FEATURE_COLUMNS):
+    """Short hash identifying the movies (and their order) in ``catalog`` and their ``columns``.
+
+    A cache saved with one fingerprint is stale as soon as any of these
+    change, even if titles and years stay the same.
+    """
+    digest = hashlib.sha1()
+    for title in catalog.title:
+        digest.update(f'{title}\x1e'.encode('utf-8'))
+    for name in columns:
+        column = getattr(catalog, name)
+        digest.update(f'\x1d{name}'.encode('utf-8'))
+        if hasattr(column, 'vocab'):
+            digest.update('\x1f'.join(column.vocab).encode('utf-8'))
+            digest.update(np.ascontiguousarray(column.offsets, dtype=np.int64).tobytes())
+            digest.update(np.ascontiguousarray(column.codes, dtype=np.int64).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(column, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _tfidf_block(column):
+    n = len(column)
+    df = np.bincount(column.codes, minlength=len(column.vocab))
+    idf = np.log((1 + n) / (1 + df)) + 1.0
+    return sparse.csr_matrix(
+        (idf[column.codes], column.codes, column.offsets),
+        shape=(n, len(column.vocab)),
+    )
+
+
+def _one_hot_block(codes, width):
+    rows = np.flatnonzero(codes >= 0)
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, codes[rows])),
+        shape=(len(codes), width),
+    )
+
+
+def build_features(catalog):
+    """Return the (movies x features) sparse matrix with unit-length rows."""
+    decades, decade_codes = np.unique(catalog.decade, return_inverse=True)
+    runtime_codes = np.where(catalog.minutes >= 0, np.searchsorted(RUNTIME_BINS, catalog.minutes, side='right'), -1)
+
+    blocks = {
+        'genres': _tfidf_block(catalog.genres),
+        'directors': _tfidf_block(catalog.directors),
+        'stars': _tfidf_block(catalog.stars),
+        'decade': _one_hot_block(decade_codes, len(decades)),
+        'runtime': _one_hot_block(runtime_codes, len(RUNTIME_BINS) + 1),
+    }
+    matrix = sparse.hstack([
+        _normalize_rows(block) * np.sqrt(BLOCK_WEIGHTS[name])
+        for name, block in blocks.items()
+    ], format='csr')
+    return _normalize_rows(matrix).astype(np.float32).tocsr()
+
+
+def top_k_neighbours(features, k):
+    """Return (ids, scores) arrays of shape (movies, k) with the best cosine neighbours first."""
+    n = features.shape[0]
+    k = min(k, max(n - 1, 0))
+    ids = np.zeros((n, k), dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return ids, scores
+
+    block = max(1, MAX_BLOCK_CELLS // n)
+    transposed = features.T.tocsc()
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        sims = (features[start:stop] @ transposed).toarray()
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        ids[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return ids, scores
+
+
+class SimilarityIndex:
+    """Precomputed top-k neighbours for every movie in a catalog."""
+
+    def __init__(self, catalog, ids, scores):
+        self.catalog = catalog
+        self.ids = ids
+        self.scores = scores
+
+    @classmethod
+    def build(cls, catalog, k=20):
+        ids, scores = top_k_neighbours(build_features(catalog), k)
+        return cls(catalog, ids, scores)
+
+    @classmethod
+    def load(cls, path, catalog):
+        """Load neighbours saved by ``save``; returns None if missing or built for other data."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if str(data['fingerprint']) != fingerprint(catalog):
+                return None
+            return cls(catalog, data['ids'], data['scores'])
+
+    @classmethod
+    def load_or_build(cls, path, catalog, k=20):
+        index = cls.load(path, catalog)
+        if index is None or index.k < min(k, len(catalog) - 1):
+            index = cls.build(catalog, k)
+            index.save(path)
+        return index
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as f:
+            np.savez(f, ids=self.ids, scores=self.scores, fingerprint=fingerprint(self.catalog))
+        os.replace(f.name, path)
+
+    @property
+    def k(self):
+        return self.ids.shape[1]
+
+    def similar_ids(self, movie_id, k=10):
+        """Return (ids, scores) of the ``k`` movies most similar to ``movie_id``."""
+        return self.ids[movie_id, :k], self.scores[movie_id, :k]
+
+    def similar(self, title, k=10):
+        """Movies most similar to ``title`` as catalog rows with a ``similarity`` column."""
+        movie_id = self.catalog.find(title)
+        if movie_id < 0:
+            raise KeyError(f"Unknown movie title: {title!r}")
+        ids, scores = self.similar_ids(movie_id, k)
+        result = self.catalog.df.iloc[ids].copy()
+        result['similarity'] = scores
+        return result
@@ -0,0 +1,157 @@
+"""Startup profile of the Streamlit app: import times and time to first paint.
+
+A fresh interpreter (run with ``-X importtime``) imports Streamlit, runs
+``app.py`` once through ``streamlit.testing`` (the first paint of the
+default page), then navigates to every other page once and reruns it. The
+report gives the time of each step, the packages each page imported on its
+first visit and the cumulative import time of the slowest top-level
+imports. Budgets turn it into a check for CI or a test::
+
+    python -m movierec.startup --output startup.json
+    python -m movierec.startup --max-first-paint 3000 --max-navigation 1000 --max-rerun 300
+
+``check`` does the same from Python and returns the budgets that were
+exceeded, so a test can assert the result is empty.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+APP = 'app.py'
+TOP_IMPORTS = 25
+
+# Run in the profiled interpreter; prints the JSON of the phases on the last line of stdout
+_CHILD = '''
+import json, sys, time
+script, timeout = sys.argv[1], float(sys.argv[2])
+phases, seen = {}, set(sys.modules)
+
+def timed(name, call):
+    global seen
+    start = time.perf_counter()
+    result = call()
+    ms = (time.perf_counter() - start) * 1000
+    modules = set(sys.modules) - seen
+    seen |= modules
+    phases[name] = {'ms': ms, 'packages': sorted({m.split('.')[0] for m in modules})}
+    return result
+
+AppTest = timed('import streamlit', lambda: __import__('streamlit.testing.v1', fromlist=['AppTest']).AppTest)
+at = AppTest.from_file(script, default_timeout=timeout)
+
+def run(at):
+    at.run()
+    if at.exception:
+        raise SystemExit(at.exception[0].message)
+
+timed('first paint', lambda: run(at))
+radio = at.sidebar.radio[0]
+first, pages = radio.value, list(radio.options)
+for page in pages:
+    if page != first:
+        at.sidebar.radio[0].set_value(page)
+        timed('navigate ' + page, lambda: run(at))
+    timed('rerun ' + page, lambda: run(at))
+print(json.dumps({'first': first, 'pages': pages, 'phases': phases}))
+'''
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(text):
+    """Top-level imports in ``-X importtime`` output as {module: cumulative ms}."""
+    imports = {}
+    for line in text.splitlines():
+        match = _IMPORT_LINE.match(line)
+        # Nested imports are indented two more spaces per level
+        if match and len(match.group(3)) == 1:
+            module = match.group(4)
+            imports[module] = imports.get(module, 0) + int(match.group(2)) / 1000
+    return imports
+
+
+def profile(script=APP, timeout=120, top=TOP_IMPORTS):
+    """Profile a cold start of ``script`` in a new interpreter."""
+    script = os.path.abspath(script)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _CHILD, script, str(timeout)],
+                          cwd=os.path.dirname(script), capture_output=True, text=True)
+    if proc.returncode:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"Profiling {script} failed:\n" + '\n'.join(errors[-20:]))
+    child = json.loads(proc.stdout.strip().splitlines()[-1])
+    phases = child['phases']
+    imports = parse_importtime(proc.stderr)
+
+    pages = {}
+    for page in child['pages']:
+        visit = phases['first paint'] if page == child['first'] else phases['navigate ' + page]
+        pages[page] = {
+            'first_ms': visit['ms'],
+            'rerun_ms': phases['rerun ' + page]['ms'],
+            'packages': visit['packages'],
+        }
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'script': os.path.relpath(script),
+        'streamlit_import_ms': phases['import streamlit']['ms'],
+        'first_paint_ms': phases['first paint']['ms'],
+        'first_page': child['first'],
+        'pages': pages,
+        'imports': [{'module': module, 'cumulative_ms': ms} for module, ms in slowest],
+    }
+
+
+def check(report, max_first_paint=None, max_navigation=None, max_rerun=None):
+    """Budgets (in ms) that ``report`` exceeds, as human-readable lines."""
+    failures = []
+    if max_first_paint is not None and report['first_paint_ms'] > max_first_paint:
+        failures.append(f"first paint took {report['first_paint_ms']:.0f} ms (budget {max_first_paint:.0f} ms)")
+    for page, times in report['pages'].items():
+        if max_navigation is not None and page != report['first_page'] and times['first_ms'] > max_navigation:
+            failures.append(f"first visit to {page} took {times['first_ms']:.0f} ms (budget {max_navigation:.0f} ms)")
+        if max_rerun is not None and times['rerun_ms'] > max_rerun:
+            failures.append(f"rerun of {page} took {times['rerun_ms']:.0f} ms (budget {max_rerun:.0f} ms)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--script', default=APP)
+    parser.add_argument('--timeout', type=float, default=120, help="seconds allowed per script run")
+    parser.add_argument('--output', help="write the report as JSON")
+    parser.add_argument('--max-first-paint', type=float, metavar='MS')
+    parser.add_argument('--max-navigation', type=float, metavar='MS', help="budget for the first visit to each page")
+    parser.add_argument('--max-rerun', type=float, metavar='MS', help="budget for a rerun of each page")
+    args = parser.parse_args(argv)
+
+    report = profile(args.script, args.timeout)
+    print(f"import streamlit {report['streamlit_import_ms']:9.1f} ms")
+    print(f"first paint      {report['first_paint_ms']:9.1f} ms  ({report['first_page']})")
+    for page, times in report['pages'].items():
+        packages = ', '.join(times['packages']) or '-'
+        print(f"  {page:<20} first {times['first_ms']:8.1f} ms  rerun {times['rerun_ms']:7.1f} ms  imports: {packages}")
+    print("slowest top-level imports (cumulative):")
+    for entry in report['imports'][:10]:
+        print(f"  {entry['module']:<32} {entry['cumulative_ms']:9.1f} ms")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    failures = check(report, args.max_first_paint, args.max_navigation, args.max_rerun)
+    for failure in failures:
+        print(f"over budget: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""Columnar on-disk copy of the catalog, shared by every process on a host.
+
+The CSV is parsed once into a directory of ``.npy`` files (numeric
+columns, CSR offsets/codes of the multi-valued columns, the derived decade,
+era and inverted-index arrays, and string columns as UTF-8 blobs with
+Arrow-style offsets). Later loads memory-map those files read-only instead
+of re-reading the CSV, so the arrays, and the display frame's string
+columns (pandas ``string[pyarrow]`` over the mapped blobs), live once in
+the page cache no matter how many workers map them. Only titles and the
+label vocabularies are decoded into each process. ``manifest.json`` records the CSV's size, mtime and SHA-1;
+the store is rebuilt only when the CSV content actually changes.
+
+A published version is never rewritten. Each process that maps one holds
+a ``Lease`` on it (a shared ``flock`` on its ``.lock`` file, released when
+the Catalog is freed or the process exits), and ``collect`` removes only
+versions that are no longer current and that nobody holds a lease on. So a
+rebuild by one worker never pulls files from under another, and a worker
+that raced with a removal simply reads the manifest again.
+
+Layout::
+
+    <store>/manifest.json
+    <store>/<version>/.lock, format.json, year.npy, rating.npy, genres_codes.npy, ...
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .catalog import DATA_PATH, MULTI_VALUED, Catalog, MultiValued, file_digest, load_catalog
+from .index import InvertedIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: no leases; removal of a mapped version just fails
+    fcntl = None
+
+STORE_DIR = '.cache/catalog'
+
+FORMAT_VERSION = 2
+
+LOCK_FILE = '.lock'
+
+# Times a load re-reads the manifest after the version it named was removed meanwhile
+ATTACH_ATTEMPTS = 3
+
+STRING_COLUMNS = ('title', 'duration', 'genres', 'directors', 'stars')
+
+# Stored when the CSV has them (datasets written by movierec.scraper do)
+OPTIONAL_COLUMNS = ('imdb_id',)
+
+
+def _offsets_path(path):
+    return path[:-len('.npy')] + '.offsets.npy'
+
+
+def _save_strings(path, values):
+    """Write ``values`` as one UTF-8 blob plus Arrow-style offsets (``<name>.offsets.npy``)."""
+    encoded = [b'' if pd.isna(v) else str(v).encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    np.save(path, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(_offsets_path(path), offsets)
+
+
+def _load_strings(path, shared=False):
+    """Strings written by ``_save_strings``, as an object array of str.
+
+    With ``shared`` (and pyarrow, installed with Streamlit) they come back
+    instead as a pandas string array over the mapped blob: nothing is
+    decoded, so every process reads the same pages.
+    """
+    data = np.asarray(np.load(path, mmap_mode='r'))
+    offsets = np.asarray(np.load(_offsets_path(path), mmap_mode='r'))
+    try:
+        import pyarrow as pa
+    except ImportError:
+        blob, bounds = data.tobytes(), offsets.tolist()
+        return np.array([blob[start:stop].decode('utf-8') for start, stop in zip(bounds, bounds[1:])], dtype=object)
+    strings = pa.LargeStringArray.from_buffers(len(offsets) - 1, pa.py_buffer(offsets), pa.py_buffer(data))
+    if shared:
+        return pd.arrays.ArrowStringArray(pa.chunked_array([strings]))
+    return strings.to_numpy(zero_copy_only=False)
+
+
+def _read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, 'manifest.json')
+    with tempfile.NamedTemporaryFile('w', dir=store_dir, suffix='.tmp', delete=False, encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f.name, path)
+
+
+def _published(version_dir):
+    try:
+        with open(os.path.join(version_dir, 'format.json'), encoding='utf-8') as f:
+            return json.load(f).get('format') == FORMAT_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+def write_store(catalog, store_dir):
+    """Publish ``catalog`` as ``<store_dir>/<catalog.version>/*.npy``; returns that directory.
+
+    A version already published in this format is left as it is, since
+    other processes may have it mapped.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    version_dir = os.path.join(store_dir, catalog.version)
+    if _published(version_dir):
+        return version_dir
+    tmp_dir = tempfile.mkdtemp(dir=store_dir, prefix='.build-')
+    try:
+        for name in ('year', 'rating', 'minutes', 'decade', 'era'):
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), getattr(catalog, name))
+        for name in MULTI_VALUED:
+            column, index = getattr(catalog, name), catalog.index[name]
+            np.save(os.path.join(tmp_dir, f'{name}_offsets.npy'), column.offsets)
+            np.save(os.path.join(tmp_dir, f'{name}_codes.npy'), column.codes)
+            np.save(os.path.join(tmp_dir, f'{name}_postings.npy'), index.postings)
+            np.save(os.path.join(tmp_dir, f'{name}_postings_offsets.npy'), index.offsets)
+            _save_strings(os.path.join(tmp_dir, f'{name}_vocab.npy'), column.vocab)
+        for name in STRING_COLUMNS + OPTIONAL_COLUMNS:
+            if name in catalog.df:
+                _save_strings(os.path.join(tmp_dir, f'{name}.npy'), catalog.df[name])
+        open(os.path.join(tmp_dir, LOCK_FILE), 'wb').close()
+        with open(os.path.join(tmp_dir, 'format.json'), 'w', encoding='utf-8') as f:
+            json.dump({'format': FORMAT_VERSION}, f)
+
+        if os.path.exists(version_dir):
+            remove_version(version_dir)  # written in an older format
+        try:
+            os.replace(tmp_dir, version_dir)
+        except OSError:
+            if not _published(version_dir):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # another process published it first
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return version_dir
+
+
+def read_store(version_dir, version):
+    """Memory-map a store directory written by ``write_store`` back into a Catalog."""
+    def array(name):
+        # A plain ndarray view of the mapping, so results computed from it are not memmaps
+        return np.asarray(np.load(os.path.join(version_dir, f'{name}.npy'), mmap_mode='r'))
+
+    def strings(name, shared=False):
+        return _load_strings(os.path.join(version_dir, f'{name}.npy'), shared)
+
+    year, rating, minutes, decade = array('year'), array('rating'), array('minutes'), array('decade')
+    columns = {
+        'title': strings('title', shared=True),
+        'year': year,
+        'duration': strings('duration', shared=True),
+        'rating': rating,
+        **{name: strings(name, shared=True) for name in MULTI_VALUED},
+    }
+    for name in OPTIONAL_COLUMNS:
+        if os.path.exists(os.path.join(version_dir, f'{name}.npy')):
+            columns[name] = strings(name, shared=True)
+    columns['minutes'] = minutes
+    columns['decade'] = decade
+    # Without copy=False pandas copies every numeric column out of the mapping
+    df = pd.DataFrame(columns, copy=False)
+
+    multi, index = {}, {}
+    for name in MULTI_VALUED:
+        multi[name] = MultiValued(strings(f'{name}_vocab'), array(f'{name}_offsets'), array(f'{name}_codes'))
+        index[name] = InvertedIndex.from_arrays(multi[name], array(f'{name}_postings'),
+                                                array(f'{name}_postings_offsets'))
+
+    return Catalog.from_columns(df, year, rating, minutes, version=version, decade=decade,
+                                era=array('era'), index=index, **multi)
+
+
+class Lease:
+    """A shared lock on a published version, held while this process has it mapped.
+
+    The kernel counts the holders across processes and drops the lock of
+    a process that dies; ``remove_version`` needs the exclusive lock, so it
+    skips a version while anyone holds a lease. Raises ``OSError`` if the
+    version is not published or is being removed.
+    """
+
+    def __init__(self, version_dir):
+        self.version_dir = version_dir
+        path = os.path.join(version_dir, LOCK_FILE)
+        f = open(path, 'rb')
+        try:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            # Removed between the open and the lock: the path is gone or is a newer copy
+            opened, current = os.fstat(f.fileno()), os.stat(path)
+            if (opened.st_dev, opened.st_ino) != (current.st_dev, current.st_ino):
+                raise FileNotFoundError(path)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()  # closing the file drops the lock
+            self._file = None
+
+
+def remove_version(version_dir):
+    """Remove a published version unless some process holds a lease on it; returns True if removed."""
+    try:
+        f = open(os.path.join(version_dir, LOCK_FILE), 'rb')
+    except FileNotFoundError:
+        f = None  # written before leases existed
+    except OSError:
+        return False
+    trash = None
+    try:
+        if f is not None and fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+        # Moved aside while locked, so no new lease can be taken on it
+        trash = tempfile.mkdtemp(dir=os.path.dirname(version_dir), prefix='.trash-')
+        os.replace(version_dir, os.path.join(trash, 'version'))
+    except OSError:
+        if trash is not None:
+            shutil.rmtree(trash, ignore_errors=True)
+        return False
+    finally:
+        if f is not None:
+            f.close()
+    shutil.rmtree(trash, ignore_errors=True)
+    return True
+
+
+def collect(store_dir=STORE_DIR, keep=()):
+    """Remove every published version not in ``keep`` that no process holds a lease on; returns their names."""
+    removed = []
+    for entry in os.scandir(store_dir):
+        if entry.is_dir() and not entry.name.startswith('.') and entry.name not in keep:
+            if remove_version(entry.path):
+                removed.append(entry.name)
+    return removed
+
+
+def attach(version_dir, version):
+    """Map a published version read-only, holding a Lease on it for as long as the Catalog lives."""
+    lease = Lease(version_dir)
+    try:
+        catalog = read_store(version_dir, version)
+    except BaseException:
+        lease.release()
+        raise
+    catalog.lease = lease
+    weakref.finalize(catalog, lease.release)
+    return catalog
+
+
+def _source_stat(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def build_store(csv_path=DATA_PATH, store_dir=STORE_DIR):
+    """Parse ``csv_path``, publish it in the columnar store and return it mapped from there."""
+    stat = _source_stat(csv_path)
+    catalog = load_catalog(csv_path)
+    version_dir = write_store(catalog, store_dir)
+    _write_manifest(store_dir, {
+        'format': FORMAT_VERSION,
+        'source': os.path.abspath(csv_path),
+        'version': catalog.version,
+        'rows': len(catalog),
+        **stat,
+    })
+    collect(store_dir, keep=(catalog.version,))
+    return attach(version_dir, catalog.version)
+
+
+def load_cached_catalog(csv_path=DATA_PATH, store_dir=STORE_DIR):
+    """Load the catalog from the columnar store, rebuilding it if the CSV changed.
+
+    A matching size and mtime is trusted without reading the CSV. If only
+    the mtime moved (e.g. the file was touched or re-copied), the content
+    hash decides whether a rebuild is needed.
+    """
+    for _ in range(ATTACH_ATTEMPTS):
+        manifest = _read_manifest(store_dir)
+        stat = _source_stat(csv_path)
+        if (manifest is None or manifest.get('format') != FORMAT_VERSION
+                or manifest.get('source') != os.path.abspath(csv_path)):
+            return build_store(csv_path, store_dir)
+
+        if stat != {'size': manifest['size'], 'mtime_ns': manifest['mtime_ns']}:
+            if file_digest(csv_path) != manifest['version']:
+                return build_store(csv_path, store_dir)
+            _write_manifest(store_dir, {**manifest, **stat})
+
+        try:
+            return attach(os.path.join(store_dir, manifest['version']), manifest['version'])
+        except OSError:
+            continue  # missing, or removed by another process after we read the manifest
+    return build_store(csv_path, store_dir)
+
+
+if __name__ == '__main__':
+    catalog = build_store()
+    print(f"Wrote {len(catalog)} movies to {STORE_DIR} (version {catalog.version[:12]})")
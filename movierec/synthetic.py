@@ -0,0 +1,129 @@
+"""Synthetic catalogs of any size, shaped like the real one.
+
+Every distribution is resampled from a template catalog (the scraped Top
+250 by default): release years, ratings, runtimes, the number of genres,
+directors and stars per movie, how often each genre is used, and how many
+movies one director or star appears in. People get generated names, so
+the number of distinct directors and stars grows with the catalog the way
+it does in the template instead of reusing 172 directors a million times.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .catalog import Catalog, MultiValued, load_catalog
+
+
+def _rows_for(lengths):
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _dedupe(offsets, codes):
+    """Drop labels repeated within a row, keeping the first occurrence."""
+    n = len(offsets) - 1
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    width = int(codes.max()) + 1 if len(codes) else 1
+    _, first = np.unique(rows * width + codes, return_index=True)
+    keep = np.sort(first)
+    return _rows_for(np.bincount(rows[keep], minlength=n)), codes[keep]
+
+
+def _column(vocab, offsets, codes):
+    """MultiValued with ``vocab`` sorted and merged, as ``from_strings`` would build it."""
+    vocab, inverse = np.unique(np.asarray(vocab, dtype=object), return_inverse=True)
+    offsets, codes = _dedupe(offsets, inverse[codes].astype(np.int32))
+    return MultiValued(vocab, offsets, codes.astype(np.int32))
+
+
+def _name_parts(template):
+    first, last = set(), set()
+    for field in ('directors', 'stars'):
+        for label in getattr(template, field).vocab:
+            words = label.split()
+            if len(words) > 1:
+                first.add(words[0])
+                last.add(words[-1])
+    return sorted(first), sorted(last)
+
+
+def _names(start, count, first, last):
+    """Distinct person names for ids ``start .. start + count``."""
+    names = []
+    for i in range(start, start + count):
+        round_ = i // (len(first) * len(last))
+        middle = '' if round_ == 0 else f' {chr(64 + round_)}.' if round_ <= 26 else f' {round_}'
+        names.append(f'{first[i % len(first)]}{middle} {last[i // len(first) % len(last)]}')
+    return names
+
+
+def _people(template_column, lengths, rng):
+    """Person codes for rows of ``lengths``; returns (offsets, codes, number of people).
+
+    Each person's movie count is drawn from the template's distribution,
+    then their appearances are shuffled across the catalog.
+    """
+    counts = template_column.counts()
+    counts = counts[counts > 0]
+    slots = int(lengths.sum())
+    people = int(np.ceil(slots / counts.mean() * 1.1)) + 1
+    drawn = rng.choice(counts, size=people)
+    while drawn.sum() < slots:
+        drawn = np.concatenate([drawn, rng.choice(counts, size=people)])
+    people = int(np.searchsorted(np.cumsum(drawn), slots) + 1)
+    codes = rng.permutation(np.repeat(np.arange(people, dtype=np.int32), drawn[:people])[:slots])
+    return _rows_for(lengths), codes, people
+
+
+def _joined(column):
+    vocab, offsets, codes = column.vocab, column.offsets, column.codes
+    return [', '.join(vocab[codes[offsets[i]:offsets[i + 1]]]) for i in range(len(column))]
+
+
+def synthetic_catalog(n, template=None, seed=0):
+    """Return a Catalog of ``n`` random movies resembling ``template``.
+
+    ``template`` defaults to the bundled CSV. The same ``n`` and ``seed``
+    always produce the same catalog.
+    """
+    template = template if template is not None else load_catalog()
+    rng = np.random.default_rng(seed)
+    pick = rng.integers(0, len(template), size=(6, n))
+
+    year = template.year[pick[0]].astype(np.int32)
+    rating = np.clip(np.round(template.rating[pick[1]] + rng.normal(0, 0.15, n), 1), 1.0, 10.0)
+    minutes = template.minutes[pick[2]].astype(np.int32)
+
+    genres = template.genres
+    genre_offsets = _rows_for(genres.lengths[pick[3]])
+    weights = genres.counts() / genres.counts().sum()
+    genre_codes = rng.choice(len(genres.vocab), size=int(genre_offsets[-1]), p=weights)
+    genres = _column(genres.vocab, genre_offsets, genre_codes)
+
+    first, last = _name_parts(template)
+    people = {}
+    start = 0
+    for field, row in (('directors', pick[4]), ('stars', pick[5])):
+        offsets, codes, count = _people(getattr(template, field), getattr(template, field).lengths[row], rng)
+        people[field] = _column(_names(start, count, first, last), offsets, codes)
+        start += count
+
+    words = [word for title in template.title for word in title.split()]
+    title_lengths = np.array([len(title.split()) for title in template.title])[rng.integers(0, len(template), n)]
+    title_words = rng.integers(0, len(words), size=int(title_lengths.sum()))
+    title_offsets = _rows_for(title_lengths)
+    titles = [' '.join(words[w] for w in title_words[title_offsets[i]:title_offsets[i + 1]]) for i in range(n)]
+
+    hours, mins = np.divmod(minutes, 60)
+    df = pd.DataFrame({
+        'title': titles,
+        'year': year,
+        'duration': [f'{h}h {m}m' if total >= 0 else 'N/A' for h, m, total in zip(hours, mins, minutes)],
+        'rating': rating,
+        'genres': _joined(genres),
+        'directors': _joined(people['directors']),
+        'stars': _joined(people['stars']),
+    })
+    return Catalog.from_columns(df, year, rating, minutes, genres, people['directors'], people['stars'],
+                                version=f'synthetic-{n}-{seed}')
@@ -0,0 +1,56 @@
+"""Unique labels for movie titles, with constant-time lookups both ways.
+
+Titles are not unique (remakes, and the same title used twice in one
+year), so pages that let the user pick a movie show ``label(id)``, which
+is the title with its year, e.g. "Heat (1995)". A second movie with the
+same title and year gets " #2", and so on. ``id(label)`` maps a label back to
+its movie, and ``find`` also accepts a bare title, which resolves to the
+first movie of that title, as ``Catalog.find`` always has.
+"""
+
+from functools import cached_property
+
+import numpy as np
+
+
+class TitleIndex:
+    def __init__(self, catalog):
+        labels = [f'{title} ({year})' for title, year in zip(catalog.title, catalog.year)]
+        self._ids = {}
+        for movie_id, label in enumerate(labels):
+            if label in self._ids:
+                copy = 2
+                while f'{label} #{copy}' in self._ids:
+                    copy += 1
+                labels[movie_id] = label = f'{label} #{copy}'
+            self._ids[label] = movie_id
+        self.labels = np.array(labels, dtype=object)
+        self.labels.flags.writeable = False
+
+        self._title_ids = {}
+        for movie_id, title in enumerate(catalog.title):
+            self._title_ids.setdefault(title, movie_id)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def label(self, movie_id):
+        return self.labels[movie_id]
+
+    def id(self, label):
+        """Id of the movie shown as ``label``, or -1."""
+        return self._ids.get(label, -1)
+
+    def find(self, title):
+        """Id of the movie with label ``title``, else of the first movie called ``title``; -1 if none."""
+        movie_id = self._ids.get(title)
+        return movie_id if movie_id is not None else self._title_ids.get(title, -1)
+
+    def ids(self, labels):
+        """Ids of ``labels`` (any number, each resolved like ``find``) as an array; -1 for unknown ones."""
+        return np.fromiter((self.find(label) for label in labels), dtype=np.int64, count=len(labels))
+
+    @cached_property
+    def sorted_labels(self):
+        """Every label in alphabetical order, for pickers."""
+        return sorted(self.labels)
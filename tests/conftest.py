@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from movierec import fixtures  # noqa: E402
+from movierec.catalog import DATA_PATH  # noqa: E402
+
+DATASET = os.path.join(ROOT, DATA_PATH)
+
+
+@pytest.fixture(scope='session')
+def pages(tmp_path_factory):
+    """Chart and title pages rendered from the bundled dataset."""
+    directory = tmp_path_factory.mktemp('pages')
+    fixtures.write_fixtures(str(directory), DATASET)
+    return directory
+
+
+@pytest.fixture
+def stand_in(pages):
+    """Start a stand-in server over ``pages`` with ``serve``'s options; returns its base URL."""
+    servers = []
+
+    def start(directory=pages, **options):
+        server, base_url = fixtures.serve(str(directory), port=0, background=True, **options)
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
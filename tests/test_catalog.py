@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from movierec.catalog import Catalog, load_catalog
+
+from conftest import DATASET
+
+
+def _movie(title, year, rating, duration='2h 0m'):
+    return {'title': title, 'year': year, 'duration': duration, 'rating': rating,
+            'genres': 'Drama', 'directors': 'A Director', 'stars': 'A Star'}
+
+
+@pytest.fixture
+def remakes():
+    # Three films called "Hamlet" and two called "Heat", with ties on rating and year too
+    return Catalog(pd.DataFrame([
+        _movie('Hamlet', 1948, 7.6), _movie('Heat', 1995, 8.3), _movie('Amadeus', 1984, 8.4),
+        _movie('Hamlet', 1996, 7.7), _movie('Heat', 1986, 5.5), _movie('Hamlet', 1990, 6.7),
+        _movie('Zodiac', 2007, 7.7, '2h 37m'), _movie('Alien', 1979, 8.5, '1h 57m'),
+    ]))
+
+
+@pytest.mark.parametrize('by', ['title', 'year', 'rating', 'minutes'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_sort_keeps_ties_in_their_current_order(remakes, by, descending):
+    for ids in (np.arange(len(remakes)), np.array([5, 3, 0, 4, 1, 7, 2, 6]), np.array([4, 0, 3, 1])):
+        column = pd.Series(getattr(remakes, by)[ids])
+        expected = ids[column.sort_values(ascending=not descending, kind='stable').index.to_numpy()]
+        assert remakes.sort(ids, by, descending).tolist() == expected.tolist()
+
+
+def test_duplicate_titles_sort_descending_in_id_order(remakes):
+    ordered = remakes.sort(np.arange(len(remakes)), 'title', descending=True)
+    assert [remakes.title[i] for i in ordered] == ['Zodiac', 'Heat', 'Heat', 'Hamlet', 'Hamlet', 'Hamlet',
+                                                   'Amadeus', 'Alien']
+    assert ordered.tolist() == [6, 1, 4, 0, 3, 5, 2, 7]
+
+
+def test_sort_of_the_dataset_matches_pandas():
+    catalog = load_catalog(DATASET)
+    ids = np.arange(len(catalog))[::-1].copy()
+    for by in ('title', 'rating'):
+        column = pd.Series(getattr(catalog, by)[ids])
+        expected = ids[column.sort_values(ascending=False, kind='stable').index.to_numpy()]
+        assert catalog.sort(ids, by, descending=True).tolist() == expected.tolist()
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from movierec.catalog import Catalog
+from movierec.collaborative import CollaborativeRecommender, FactorModel
+from movierec.ratings import RatingStore, movie_keys
+
+ACTION = [0, 1, 2, 3]
+DRAMA = [4, 5, 6, 7]
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return Catalog(pd.DataFrame([
+        {'title': f'Movie {i}', 'year': 1990 + i, 'duration': '2h 0m', 'rating': 7.0 + i / 10,
+         'genres': 'Action' if i in ACTION else 'Drama', 'directors': 'A Director', 'stars': 'A Star'}
+        for i in range(8)
+    ]))
+
+
+def _taste_ratings(catalog, users=12):
+    # Half the users love action and dislike drama, the other half the opposite
+    keys = movie_keys(catalog)
+    ratings = []
+    for u in range(users):
+        liked, disliked = (ACTION, DRAMA) if u % 2 else (DRAMA, ACTION)
+        ratings += [(f'user{u}', keys[i], 9.0 + (i + u) % 2) for i in liked]
+        ratings += [(f'user{u}', keys[i], 2.0 + (i + u) % 2) for i in disliked]
+    return ratings
+
+
+def test_users_are_recommended_what_similar_users_liked(catalog):
+    keys = movie_keys(catalog)
+    model = FactorModel.train(catalog, _taste_ratings(catalog), factors=4)
+    assert model.ratings == 96 and model.users == 12
+
+    ids, predicted = model.recommend({keys[0]: 10, keys[1]: 9, keys[4]: 2}, k=3)
+    assert set(ids[:2]) == {2, 3}  # the action movies not rated yet
+    assert not {0, 1, 4} & set(ids)
+    assert predicted[0] >= predicted[1] > predicted[2]
+
+    ids, _ = model.recommend({keys[5]: 10, keys[0]: 1}, k=3)
+    assert set(ids) <= set(DRAMA)
+
+
+def test_recommend_excludes_everything_rated(catalog):
+    keys = movie_keys(catalog)
+    model = FactorModel.train(catalog, _taste_ratings(catalog), factors=4)
+    ids, _ = model.recommend({key: 5 for key in keys[:6]}, k=10)
+    assert sorted(ids) == [6, 7]
+    assert len(model.recommend({key: 5 for key in keys}, k=10)[0]) == 0
+
+
+def test_ratings_of_movies_not_in_the_catalog_are_ignored(catalog):
+    model = FactorModel.train(catalog, [('ann', 'No Such Movie (2000)', 9)])
+    assert model.ratings == 0 and model.users == 0
+    assert len(model.recommend({'No Such Movie (2000)': 9}, k=10)[0]) == len(catalog)
+
+
+def test_new_ratings_count_before_the_next_training(catalog, tmp_path):
+    store = RatingStore(str(tmp_path / 'ratings.sqlite3'))
+    for user, key, value in _taste_ratings(catalog):
+        store.rate(user, key, value)
+    recommender = CollaborativeRecommender(store, catalog, retrain_after=5, retrain_seconds=3600, factors=4)
+    recommender.refresh(wait=True)
+    model = recommender.model
+    assert model.revision == store.revision()
+
+    keys = movie_keys(catalog)
+    store.rate('ann', keys[0], 10)
+    store.rate('ann', keys[4], 1)
+    recommender.refresh(wait=True)
+    assert recommender.model is model  # two writes: not worth a retrain yet
+    assert set(recommender.recommend('ann', k=3)[0][:3]) == {1, 2, 3}  # but ann's taste is already known
+
+    for i in ACTION[1:]:
+        store.rate('ann', keys[i], 9)
+    recommender.refresh(wait=True)
+    assert recommender.model is not model and recommender.model.revision == store.revision()
+
+
+def test_forced_or_overdue_refresh_retrains_on_any_change(catalog, tmp_path):
+    store = RatingStore(str(tmp_path / 'ratings.sqlite3'))
+    store.rate('ann', movie_keys(catalog)[0], 9)
+    recommender = CollaborativeRecommender(store, catalog, retrain_after=100, retrain_seconds=3600)
+    recommender.refresh(wait=True)
+    first = recommender.model
+
+    recommender.refresh(wait=True, force=True)
+    assert recommender.model is first  # nothing changed
+
+    store.rate('bob', movie_keys(catalog)[1], 7)
+    recommender.refresh(wait=True, force=True)
+    assert recommender.model is not first and recommender.model.ratings == 2
+
+    recommender.retrain_seconds = 0
+    store.rate('bob', movie_keys(catalog)[2], 8)
+    recommender.refresh(wait=True)
+    assert recommender.model.ratings == 3
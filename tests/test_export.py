@@ -0,0 +1,93 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from movierec.catalog import load_catalog
+from movierec.export import EXPORT_COLUMNS, FORMATS, ExportCache, export_bytes, iter_export, write_export
+
+from conftest import DATASET
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return load_catalog(DATASET)
+
+
+def _read(data, fmt):
+    if fmt == 'csv':
+        return pd.read_csv(io.BytesIO(data))
+    if fmt == 'jsonl':
+        return pd.read_json(io.BytesIO(data), lines=True)
+    return pd.read_parquet(io.BytesIO(data))
+
+
+def _expected(catalog, ids):
+    return catalog.df.iloc[ids][list(EXPORT_COLUMNS)].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_formats_round_trip_the_same_rows(catalog, fmt):
+    ids = np.array([5, 0, 249, 17, 3, 100], dtype=np.int32)  # result order, not catalog order
+    table = _read(export_bytes(catalog, ids, fmt, cache=None), fmt)
+
+    assert list(table.columns) == list(EXPORT_COLUMNS)
+    pd.testing.assert_frame_equal(table, _expected(catalog, ids), check_dtype=False)
+
+
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_chunked_encoding_matches_a_single_chunk(catalog, fmt):
+    ids = np.arange(len(catalog), dtype=np.int32)[::-1]
+    chunks = list(iter_export(catalog, ids, fmt, chunk_rows=64))
+    assert len(chunks) >= 4
+    whole = _read(b''.join(iter_export(catalog, ids, fmt, chunk_rows=len(ids))), fmt)
+    pd.testing.assert_frame_equal(_read(b''.join(chunks), fmt), whole)
+    pd.testing.assert_frame_equal(whole, _expected(catalog, ids), check_dtype=False)
+
+
+def test_empty_exports_keep_their_columns(catalog):
+    empty = np.zeros(0, dtype=np.int32)
+    assert export_bytes(catalog, empty, 'csv', cache=None).decode() == ','.join(EXPORT_COLUMNS) + '\n'
+    assert list(_read(export_bytes(catalog, empty, 'parquet', cache=None), 'parquet').columns) == list(EXPORT_COLUMNS)
+    assert export_bytes(catalog, empty, 'jsonl', cache=None) == b''
+
+
+def test_unknown_format_is_rejected(catalog):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        list(iter_export(catalog, np.arange(3), 'xlsx'))
+
+
+def test_write_export_streams_to_a_file(catalog, tmp_path):
+    ids = np.arange(20, dtype=np.int32)
+    path = tmp_path / 'movies.csv'
+    written = write_export(catalog, ids, str(path))
+    assert written == path.stat().st_size
+    assert path.read_bytes() == export_bytes(catalog, ids, 'csv', cache=None)
+
+
+def test_export_bytes_encodes_once_per_result_set(catalog):
+    cache = ExportCache()
+    ids = np.arange(10, dtype=np.int32)
+    first = export_bytes(catalog, ids, 'csv', cache=cache)
+    assert export_bytes(catalog, ids.copy(), 'csv', cache=cache) is first
+    assert export_bytes(catalog, ids[::-1].copy(), 'csv', cache=cache) is not first  # order is part of the key
+    assert export_bytes(catalog, ids, 'jsonl', cache=cache) != first
+    assert len(cache._entries) == 3
+
+
+def test_cache_evicts_least_recently_used_past_its_byte_bound():
+    cache = ExportCache(max_bytes=100)
+    cache.put('a', b'x' * 40)
+    cache.put('b', b'x' * 40)
+    assert cache.get('a') is not None  # 'b' is now the least recently used
+    cache.put('c', b'x' * 40)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.nbytes == 80
+
+    cache.put('a', b'x' * 10)  # replacing an entry adjusts the total
+    assert cache.nbytes == 50
+    cache.put('huge', b'x' * 101)  # larger than the whole cache: not kept, nothing evicted
+    assert cache.get('huge') is None and cache.nbytes == 50
@@ -0,0 +1,101 @@
+import re
+
+import numpy as np
+import pytest
+
+from movierec.catalog import load_catalog
+from movierec.engine import MOOD_GENRES, STORY_GENRES
+from movierec.index import InvertedIndex
+
+from conftest import DATASET
+
+QUIZ_GENRES = {**MOOD_GENRES, **STORY_GENRES}
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return load_catalog(DATASET)
+
+
+@pytest.fixture(scope='module')
+def genres(catalog):
+    return catalog.index['genres']
+
+
+def _rows_with(catalog, label):
+    return [i for i in range(len(catalog)) if label in catalog.genres.row(i)]
+
+
+def test_a_label_resolves_to_itself_only(catalog, genres):
+    assert genres.resolve(['Drama']) == ['Drama']
+    assert genres.get('Drama').tolist() == _rows_with(catalog, 'Drama')
+
+    # Movies tagged only with subgenres such as "Prison Drama" must not be pulled in
+    subgenre_only = [i for i in range(len(catalog))
+                     if 'Drama' not in catalog.genres.row(i)
+                     and any(label.endswith(' Drama') for label in catalog.genres.row(i))]
+    assert subgenre_only
+    assert not set(subgenre_only) & set(genres.get('Drama').tolist())
+
+
+def test_other_keywords_resolve_to_labels_containing_them_as_a_word(genres):
+    assert 'Period Drama' in genres.resolve(['Period'])
+    assert 'Prison Drama' in genres.resolve(['prison'])
+    assert all(re.search(r'\bPsychological\b', label) for label in genres.resolve(['Psychological']))
+    assert genres.resolve(['Perio']) == []  # whole words only
+    assert genres.resolve(['Drama', 'Drama', 'Period']).count('Drama') == 1
+
+
+def test_empty_and_unknown_labels(genres):
+    drama = genres.get('Drama')
+    assert genres.get('No Such Genre').size == 0
+    assert 'No Such Genre' not in genres and 'Drama' in genres
+    assert genres.any_of([]).size == 0
+    assert genres.all_of([]).size == 0
+    assert genres.any_of(['No Such Genre', 'Drama']).tolist() == drama.tolist()
+    assert genres.all_of(['No Such Genre', 'Drama']).size == 0
+    assert genres.resolve(['No Such Genre']) == []
+
+
+def test_all_of_and_any_of_are_set_operations(catalog, genres):
+    crime, drama = set(_rows_with(catalog, 'Crime')), set(_rows_with(catalog, 'Drama'))
+    assert genres.all_of(['Crime', 'Drama']).tolist() == sorted(crime & drama)
+    assert genres.any_of(['Crime', 'Drama']).tolist() == sorted(crime | drama)
+
+
+def test_code_is_an_exact_lookup(catalog):
+    column = catalog.genres
+    assert column.vocab[column.code('Drama')] == 'Drama'
+    assert column.code('drama') == -1
+    assert column.code('Dram') == -1
+    assert column.code(None) == -1
+
+
+def test_index_from_arrays_matches_a_fresh_build(catalog, genres):
+    rebuilt = InvertedIndex.from_arrays(catalog.genres, genres.postings, genres.offsets)
+    fresh = InvertedIndex(catalog.genres)
+    for label in ('Drama', 'Prison Drama', 'No Such Genre'):
+        assert rebuilt.get(label).tolist() == fresh.get(label).tolist() == genres.get(label).tolist()
+
+
+@pytest.mark.parametrize('name', list(QUIZ_GENRES))
+def test_quiz_genres_match_a_label_aware_str_contains(catalog, genres, name):
+    keywords = QUIZ_GENRES[name]
+    column = catalog.df['genres']
+    ids = genres.any_of(genres.resolve(keywords))
+
+    # Same filter with pandas: a keyword that is a label matches it between commas,
+    # any other keyword matches as a whole word inside a label
+    matched = np.zeros(len(catalog), dtype=bool)
+    for keyword in keywords:
+        if keyword in genres:
+            pattern = r'(?:^|,)\s*' + re.escape(keyword) + r'\s*(?:,|$)'
+            matched |= column.str.contains(pattern, regex=True, na=False).to_numpy()
+        else:
+            pattern = r'\b' + re.escape(keyword) + r'\b'
+            matched |= column.str.contains(pattern, case=False, regex=True, na=False).to_numpy()
+    assert ids.tolist() == np.flatnonzero(matched).tolist()
+
+    # The old substring scan only ever matched more ("Drama" in "Prison Drama"), never less
+    substring = column.apply(lambda value: any(k.lower() in str(value).lower() for k in keywords))
+    assert set(ids.tolist()) <= set(np.flatnonzero(substring.to_numpy()).tolist())
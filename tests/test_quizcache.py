@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from movierec import core
+from movierec.quizcache import QuizCache, QuizResult
+
+from conftest import DATASET, ROOT
+
+ANSWERS = {'mood': 'Tense & Thrilling', 'story_type': [], 'duration': 'Any length', 'era': 'Any era',
+           'rating': 8.0, 'director': 'Any', 'actor': ''}
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('quiz'))
+    try:
+        yield core.Resources.load(DATASET, weights_path=os.path.join(ROOT, 'quiz_weights.json')).engine
+    finally:
+        os.chdir(cwd)
+
+
+def _same(a, b):
+    for name in ('ids', 'scores', 'breakdown', 'match', 'full_matches'):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+    assert a.features == b.features and a.active == b.active
+
+
+def test_results_survive_a_restart_through_the_directory(engine, tmp_path):
+    first = QuizCache(str(tmp_path))
+    computed = first.recommend(engine, ANSWERS, k=5)
+    assert [entry.name for entry in os.scandir(tmp_path)] == [os.path.basename(first._path(first.key(engine, ANSWERS, 5)))]
+
+    second = QuizCache(str(tmp_path))
+    loaded = second.recommend(engine, ANSWERS, k=5)
+    assert (second.hits, second.misses) == (1, 0)
+    _same(loaded.recommendations, computed.recommendations)
+
+
+def test_a_file_saved_for_another_key_is_not_used(engine, tmp_path):
+    cache = QuizCache(str(tmp_path))
+    key = cache.key(engine, ANSWERS, 5)
+    QuizResult.compute(engine, ANSWERS, 5).save(cache._path(key), key)
+    assert QuizResult.load(cache._path(key), ('other',)) is None
+    assert QuizResult.load(str(tmp_path / 'missing.npz'), key) is None
+
+
+def test_the_directory_is_pruned_to_max_files(engine, tmp_path):
+    cache = QuizCache(str(tmp_path), max_files=2)
+    (tmp_path / 'unfinished.npz.tmp').write_bytes(b'')  # another worker's save in progress
+    for rating in (7.0, 7.5, 8.0, 8.5):
+        cache.recommend(engine, {**ANSWERS, 'rating': rating})
+
+    names = sorted(entry.name for entry in os.scandir(tmp_path))
+    assert len([name for name in names if name.endswith('.npz')]) == 2
+    assert 'unfinished.npz.tmp' in names
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from movierec import core
+from movierec.catalog import load_catalog
+from movierec.ranked import RankedLists
+
+from conftest import DATASET
+
+COMBINATIONS = [
+    {'genre': 'Drama', 'decade': 1990},
+    {'genre': 'Crime', 'director': 'Martin Scorsese'},
+    {'genre': 'Drama', 'star': 'Robert De Niro', 'decade': 1970},
+    {'genre': 'Action', 'genre_2': 'Sci-Fi'},
+    {'decade': 1950, 'star': 'James Stewart'},
+    {'genre': 'Drama', 'director': 'No Such Director'},
+    {'genre': 'Western', 'decade': 2010},
+]
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return load_catalog(DATASET)
+
+
+@pytest.fixture(scope='module')
+def ranked(catalog):
+    return RankedLists(catalog)
+
+
+def _brute_force(catalog, keys):
+    """The same query as a pandas filter over the raw columns, best rated first."""
+    df = catalog.df.reset_index(drop=True)
+    mask = pd.Series(True, index=df.index)
+    for key, value in keys.items():
+        key = key.split('_')[0]
+        if key == 'decade':
+            mask &= (df['year'].astype(int) // 10 * 10) == value
+        else:
+            column = {'genre': 'genres', 'director': 'directors', 'star': 'stars'}[key]
+            mask &= df[column].fillna('').str.split(', ').apply(lambda labels: value in labels)
+    # Ties keep catalog order
+    return df[mask].sort_values('rating', ascending=False, kind='stable').index.tolist()
+
+
+def _query(ranked, keys):
+    # Two values of one key ("genre_2") go through _intersect directly
+    if any('_' in key for key in keys):
+        return ranked._intersect([ranked._list(key.split('_')[0], value) for key, value in keys.items()]).tolist()
+    return ranked.ids(**keys).tolist()
+
+
+@pytest.mark.parametrize('keys', COMBINATIONS, ids=lambda keys: ','.join(f'{k}={v}' for k, v in keys.items()))
+def test_intersections_match_a_pandas_filter(catalog, ranked, keys):
+    expected = _brute_force(catalog, keys)
+    assert _query(ranked, keys) == expected
+    assert _query(ranked, keys) == expected  # served from the combination cache
+
+
+def test_key_order_does_not_matter(ranked):
+    one = ranked.ids(genre='Drama', decade=1990, director='Frank Darabont')
+    other = ranked.ids(director='Frank Darabont', decade='1990', genre='Drama')
+    assert one.tolist() == other.tolist()
+    assert one.tolist()
+
+
+def test_single_keys_and_overall_ranking(catalog, ranked):
+    assert ranked.ids().tolist() == _brute_force(catalog, {})
+    for keys in ({'genre': 'Drama'}, {'decade': 1990}, {'director': 'Christopher Nolan'}):
+        assert ranked.ids(**keys).tolist() == _brute_force(catalog, keys)
+    assert ranked.top(3, genre='Drama').tolist() == _brute_force(catalog, {'genre': 'Drama'})[:3]
+    assert ranked.count(decade=1990) == len(_brute_force(catalog, {'decade': 1990}))
+
+
+def test_unknown_values_and_keys(ranked):
+    assert ranked.ids(genre='No Such Genre').size == 0
+    assert ranked.ids(decade='nineties').size == 0
+    assert ranked.ids(decade=1890).size == 0
+    with pytest.raises(ValueError, match="Unknown ranking key"):
+        ranked.ids(studio='Pixar')
+
+
+def test_a_filter_on_the_ranking_key_is_rejected(catalog):
+    with pytest.raises(ValueError, match="already selects genre"):
+        core.top(catalog, by='genre', value='Drama', genre='Crime')
+    with pytest.raises(ValueError, match="already selects decade"):
+        core.top_ids(catalog, by='decade', value='1990', decade=1980)
+
+    # Other keys narrow the ranking
+    results = core.top(catalog, by='genre', value='Drama', n=500, decade=1990)
+    assert [row['title'] for row in results] == [
+        catalog.title[i] for i in _brute_force(catalog, {'genre': 'Drama', 'decade': 1990})]
+    assert np.all(np.diff([row['rating'] for row in results]) <= 0)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from movierec.catalog import Catalog
+from movierec.ratings import RatingStore, key_lookup, movie_keys
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RatingStore(str(tmp_path / 'ratings.sqlite3'))
+
+
+def test_rating_again_replaces_the_rating(store):
+    store.rate('ann', 'tt0111161', 9)
+    store.rate('ann', 'tt0068646', 7)
+    store.rate('bob', 'tt0111161', 6)
+    store.rate('ann', 'tt0111161', 10)
+
+    assert store.user_ratings('ann') == {'tt0111161': 10.0, 'tt0068646': 7.0}
+    assert list(store.user_ratings('ann')) == ['tt0111161', 'tt0068646']  # most recently rated first
+    assert sorted(store.all_ratings()) == [('ann', 'tt0068646', 7.0), ('ann', 'tt0111161', 10.0),
+                                           ('bob', 'tt0111161', 6.0)]
+    assert store.stats() == (3, 2)
+
+
+def test_every_write_bumps_the_revision(store):
+    assert store.revision() == 0
+    store.rate('ann', 'tt0111161', 9)
+    store.rate('ann', 'tt0111161', 9)
+    store.unrate('ann', 'tt0111161')
+    assert store.revision() == 3
+    assert store.user_ratings('ann') == {} and store.stats() == (0, 0)
+
+
+def test_ratings_persist_across_stores(store):
+    store.rate('ann', 'Heat (1995)', 8)
+    reopened = RatingStore(store.path)
+    assert reopened.user_ratings('ann') == {'Heat (1995)': 8.0} and reopened.revision() == 1
+
+
+def test_movies_without_an_imdb_id_are_keyed_by_title_and_year():
+    movie = {'duration': '2h 0m', 'rating': 8.0, 'genres': 'Drama', 'directors': 'A Director', 'stars': 'A Star'}
+    catalog = Catalog(pd.DataFrame([
+        {**movie, 'title': 'Heat', 'year': 1995, 'imdb_id': 'tt0113277'},
+        {**movie, 'title': 'Alien', 'year': 1979, 'imdb_id': np.nan},  # not matched by the refresh
+        {**movie, 'title': 'Amadeus', 'year': 1984, 'imdb_id': ''},
+    ]))
+    assert movie_keys(catalog) == ['tt0113277', 'Alien (1979)', 'Amadeus (1984)']
+    lookup = key_lookup(catalog)
+    assert lookup['tt0113277'] == lookup['Heat (1995)'] == 0
+    assert lookup['Alien (1979)'] == 1 and lookup['Amadeus (1984)'] == 2
+    assert len(lookup) == 4
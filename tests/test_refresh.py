@@ -0,0 +1,118 @@
+import json
+import shutil
+
+import pandas as pd
+
+from movierec.refresh import Diff, load_rows, merge, refresh
+from movierec.scraper import COLUMNS, MISSING
+
+from conftest import DATASET
+
+
+def _row(imdb_id, title, rating='8.0', duration='2h 0m', genres='Drama'):
+    return {'title': title, 'year': '1990', 'duration': duration, 'rating': rating, 'genres': genres,
+            'directors': 'A Director', 'stars': 'A Star', 'imdb_id': imdb_id}
+
+
+def _entry(row, **changes):
+    entry = {key: row[key] for key in ('title', 'year', 'duration', 'rating', 'imdb_id')}
+    entry['url'] = f"http://127.0.0.1/title/{row['imdb_id']}/"
+    entry.update(changes)
+    return entry
+
+
+STORED = [_row('tt01', 'Kept'), _row('tt02', 'Re-rated'), _row('tt03', 'Dropped'), _row('tt04', 'Recut')]
+
+
+def _chart():
+    kept, rerated, _, recut = STORED
+    return [
+        _entry(rerated, rating='8.5'),  # moved up and re-rated
+        _entry(kept, year=MISSING),  # JSON-LD entries carry no year
+        _entry(_row('tt05', 'New'), year=MISSING),
+        _entry(recut, duration='2h 30m'),
+    ]
+
+
+def test_diff_sorts_entries_by_change():
+    diff = Diff(STORED, _chart())
+
+    assert [entry['imdb_id'] for entry in diff.new] == ['tt05']
+    assert [entry['imdb_id'] for entry in diff.changed] == ['tt04']
+    assert [entry['imdb_id'] for entry in diff.rerated] == ['tt02']
+    assert [row['imdb_id'] for row in diff.dropped] == ['tt03']
+    assert [entry['imdb_id'] for entry in diff.moved] == ['tt02', 'tt01']
+    assert [entry['imdb_id'] for entry in diff.to_fetch] == ['tt05', 'tt04']
+    assert diff
+
+
+def test_diff_of_an_unchanged_chart_is_empty():
+    diff = Diff(STORED, [_entry(row) for row in STORED])
+
+    assert not diff
+    assert diff.to_fetch == []
+    assert diff.summary() == "0 new, 0 dropped, 0 changed, 0 re-rated, 0 moved"
+
+
+def test_merge_keeps_stored_details_and_takes_fetched_ones():
+    chart = _chart()
+    details = {
+        chart[2]['url']: {'genres': 'Comedy', 'directors': 'New Director', 'stars': 'New Star', 'year': '2024'},
+        chart[3]['url']: {'genres': 'Drama, War', 'directors': 'A Director', 'stars': 'A Star'},
+    }
+    merged = merge(STORED, chart, details)
+
+    assert [row['imdb_id'] for row in merged] == ['tt02', 'tt01', 'tt05', 'tt04']
+    assert all(list(row) == list(COLUMNS) for row in merged)
+    assert merged[0] == {**STORED[1], 'rating': '8.5'}
+    assert merged[1] == STORED[0]
+    assert merged[2]['year'] == '2024' and merged[2]['genres'] == 'Comedy'
+    assert merged[3]['duration'] == '2h 30m' and merged[3]['genres'] == 'Drama, War'
+
+
+def test_refresh_of_an_unchanged_chart_leaves_the_dataset_alone(stand_in, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the columnar store is built under .cache
+    csv_path, history_path = tmp_path / 'top250.csv', tmp_path / 'history.csv'
+    shutil.copy(DATASET, csv_path)
+    base_url = stand_in()
+    options = {'rate': 0, 'checkpoint_dir': str(tmp_path / 'checkpoint'), 'log': lambda message: None}
+
+    # The first run only matches the stored rows to the chart's ids
+    first = refresh(base_url, str(csv_path), str(history_path), **options)
+    assert first.to_fetch == []
+    rows = load_rows(str(csv_path))
+    assert len(rows) == 250 and all(row['imdb_id'] for row in rows)
+    written = csv_path.read_bytes()
+    modified = csv_path.stat().st_mtime_ns
+
+    second = refresh(base_url, str(csv_path), str(history_path), **options)
+    assert not second
+    assert csv_path.read_bytes() == written
+    assert csv_path.stat().st_mtime_ns == modified
+    history = pd.read_csv(history_path)
+    assert len(history) == 500 and history['scraped_at'].nunique() <= 2
+
+
+def test_refresh_ignores_checkpointed_details_of_movies_it_did_not_fetch(stand_in, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    csv_path, history_path = tmp_path / 'top250.csv', tmp_path / 'history.csv'
+    shutil.copy(DATASET, csv_path)
+    base_url = stand_in()
+    checkpoint = tmp_path / 'checkpoint'
+    options = {'rate': 0, 'checkpoint_dir': str(checkpoint), 'log': lambda message: None}
+    refresh(base_url, str(csv_path), str(history_path), **options)
+
+    # Drop one movie so the chart shows it as new, and leave a detail record for another
+    # one in the checkpoint, as an interrupted earlier run would
+    rows = load_rows(str(csv_path))
+    dropped, kept = rows.pop(10), rows[0]
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(csv_path, index=False, encoding='utf-8-sig')
+    checkpoint.mkdir(exist_ok=True)
+    stale = {'url': f"{base_url}/title/{kept['imdb_id']}/", 'genres': 'Stale', 'directors': 'Stale', 'stars': 'Stale'}
+    (checkpoint / 'details.jsonl').write_text(json.dumps(stale) + '\n', encoding='utf-8')
+
+    diff = refresh(base_url, str(csv_path), str(history_path), **options)
+    assert [entry['imdb_id'] for entry in diff.to_fetch] == [dropped['imdb_id']]
+    refreshed = load_rows(str(csv_path))
+    assert refreshed[0] == kept
+    assert refreshed[10] == dropped
@@ -0,0 +1,121 @@
+import os
+import shutil
+import threading
+
+import pytest
+
+from movierec import core
+from movierec.registry import DatasetRegistry
+
+from conftest import DATASET, ROOT
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the store and index caches are written under .cache
+    path = tmp_path / 'movies.csv'
+    shutil.copy(DATASET, path)
+    return str(path)
+
+
+class GatedLoader:
+    """Loads Resources; once ``hold`` is called, background loads wait for ``release``."""
+
+    def __init__(self):
+        self.loads = 0
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def hold(self):
+        self.started.clear()
+        self.gate.clear()
+
+    def release(self):
+        self.gate.set()
+
+    def __call__(self, csv_path):
+        self.loads += 1
+        self.started.set()
+        self.gate.wait(timeout=60)
+        return core.Resources.load(csv_path, weights_path=os.path.join(ROOT, 'quiz_weights.json'))
+
+
+def _edit(csv_path, old, new):
+    with open(csv_path, encoding='utf-8-sig') as f:
+        text = f.read()
+    with open(csv_path, 'w', encoding='utf-8-sig') as f:
+        f.write(text.replace(old, new, 1))
+
+
+def test_a_changed_file_is_swapped_in_after_a_background_load(csv_path):
+    loader = GatedLoader()
+    registry = DatasetRegistry(csv_path, loader=loader, poll_interval=0)
+    old = registry.current()
+    old_version = registry.version
+
+    loader.hold()
+    _edit(csv_path, ',9.3,', ',9.4,')
+    assert registry.current() is old  # the poll starts the reload and returns at once
+    assert loader.started.wait(timeout=10) and registry.reloading
+
+    # Until the swap, readers keep getting (and using) the old version
+    for _ in range(3):
+        resources = registry.current()
+        assert resources is old
+        assert core.top(resources.catalog, n=1)[0]['rating'] == pytest.approx(9.3)
+        assert core.search(resources.catalog, 'godfather', limit=1)[0]['title'] == 'The Godfather'
+
+    loader.release()
+    registry._thread.join(timeout=60)
+    new = registry.current()
+    assert new is not old
+    assert registry.version == new.catalog.version != old_version
+    assert core.top(new.catalog, n=1)[0]['rating'] == pytest.approx(9.4)
+    assert registry.last_error is None
+
+    # A reader that took the old Resources before the swap can still finish
+    assert old.catalog.version == old_version
+    assert core.top(old.catalog, n=1)[0]['rating'] == pytest.approx(9.3)
+    assert core.similar(old.similarity, 'The Godfather', k=3)
+
+
+def test_a_touched_file_keeps_the_current_version(csv_path):
+    loader = GatedLoader()
+    registry = DatasetRegistry(csv_path, loader=loader, poll_interval=0)
+    old = registry.current()
+
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    registry.current()
+    registry._thread.join(timeout=60)
+
+    assert loader.loads == 2
+    assert registry.current() is old
+
+
+def test_a_failed_reload_keeps_serving_the_old_version(csv_path):
+    registry = DatasetRegistry(csv_path, loader=GatedLoader(), poll_interval=0)
+    old = registry.current()
+
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('not,a,movie,table\n')
+    registry.current()
+    registry._thread.join(timeout=60)
+
+    assert registry.current() is old
+    assert registry.last_error is not None
+
+
+def test_a_background_reload_can_warm_the_static_charts(csv_path):
+    from movierec import charts
+
+    registry = DatasetRegistry(csv_path, loader=GatedLoader(), poll_interval=0, warm_charts=True)
+    assert registry.version not in charts._cache  # the first load leaves them to the first page
+
+    _edit(csv_path, ',9.3,', ',9.4,')
+    registry.current()
+    registry._thread.join(timeout=60)
+
+    built = {chart_id for chart_id, _ in charts._cache[registry.version]}
+    assert built == set(charts.CHARTS)
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+import pytest
+
+from movierec import scraper
+from movierec.scraper import ScrapeError, parse_chart, parse_detail, scrape
+
+from conftest import DATASET, ROOT
+
+SAVED = os.path.join(ROOT, 'tests', 'data')
+
+with open(os.path.join(SAVED, 'expected.json'), encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+
+def _saved(name):
+    with open(os.path.join(SAVED, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def _scrape(base_url, checkpoint, **options):
+    log = []
+    rows = scrape(base_url, rate=0, checkpoint_dir=str(checkpoint), log=log.append, **options)
+    return rows, log
+
+
+@pytest.mark.parametrize('name', [name for name in EXPECTED if name.startswith('chart')])
+def test_saved_chart_page(name):
+    entries = parse_chart(_saved(name), base_url='http://stand-in')
+
+    assert [{key: entry[key] for key in expected} for entry, expected in zip(entries, EXPECTED[name])] == EXPECTED[name]
+    assert len(entries) == len(EXPECTED[name])
+    # Tracking query strings are dropped and links point at the given host
+    assert [entry['url'] for entry in entries] == [f"http://stand-in/title/{entry['imdb_id']}/" for entry in entries]
+
+
+@pytest.mark.parametrize('name', [name for name in EXPECTED if name.startswith('title')])
+def test_saved_title_page(name):
+    assert parse_detail(_saved(name)) == EXPECTED[name]
+
+
+def test_saved_pages_agree_with_the_dataset():
+    dataset = pd.read_csv(DATASET, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    titles = set(dataset['title'])
+    assert all(entry['title'] in titles for entry in EXPECTED['chart_top.html'])
+
+    for name, expected in EXPECTED.items():
+        if name.startswith('title'):
+            rows = dataset[dataset['stars'] == expected['stars']]
+            assert len(rows) == 1
+            assert {column: rows.iloc[0][column] for column in expected} == expected
+
+
+def test_interrupted_scrape_resumes_from_its_checkpoint(stand_in, pages, tmp_path):
+    # Hide ten title pages so the first run fails on them (404 is not retried)
+    served = tmp_path / 'pages'
+    shutil.copytree(pages, served)
+    hidden = tmp_path / 'hidden'
+    hidden.mkdir()
+    for directory in sorted((served / 'title').iterdir())[-10:]:
+        shutil.move(str(directory), str(hidden))
+    base_url = stand_in(served)
+    checkpoint = tmp_path / 'checkpoint'
+
+    with pytest.raises(ScrapeError, match="10 of 250 detail pages failed"):
+        _scrape(base_url, checkpoint)
+    assert (checkpoint / 'details.jsonl').read_text(encoding='utf-8').count('\n') == 240
+
+    # Once the pages are back, the next run fetches only those
+    for directory in hidden.iterdir():
+        shutil.move(str(directory), str(served / 'title'))
+    rows, log = _scrape(base_url, checkpoint)
+    assert "240 of 250 detail pages already scraped" in log
+    assert sum(line.startswith('-> Scraped') for line in log) == 10
+    assert len(rows) == 250
+    assert all(row['genres'] != scraper.MISSING for row in rows)
+
+
+def test_injected_failures_are_retried(stand_in, tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, 'BACKOFF', 0.0)
+    responses = []
+    monkeypatch.setattr(scraper.metrics, 'count', lambda name, value=1, **labels: responses.append(labels))
+
+    rows, _ = _scrape(stand_in(failure_rate=0.2), tmp_path / 'checkpoint', retries=10)
+
+    assert len(rows) == 250
+    statuses = [labels.get('status') for labels in responses]
+    assert 503 in statuses
+    assert statuses.count(200) == 251  # the chart and every title page, once each
+
+
+def test_requests_are_rate_limited(stand_in, tmp_path):
+    rate, concurrency = 200.0, 8
+    started = time.perf_counter()
+    rows = scrape(stand_in(), rate=rate, concurrency=concurrency,
+                  checkpoint_dir=str(tmp_path / 'checkpoint'), log=lambda line: None)
+    elapsed = time.perf_counter() - started
+
+    # A full bucket lets the first `concurrency` requests through, the rest wait their turn
+    assert len(rows) == 250
+    assert elapsed >= (251 - concurrency) / rate * 0.9
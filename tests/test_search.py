@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from movierec.catalog import load_catalog
+from movierec.search import PHRASE_BONUS, SearchIndex, edit_distance, normalize, tokenize
+
+from conftest import DATASET
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return load_catalog(DATASET)
+
+
+@pytest.fixture(scope='module')
+def index(catalog):
+    return SearchIndex(catalog)
+
+
+def _titles(catalog, index, query, **options):
+    ids, _ = index.search(query, **options)
+    return [catalog.title[i] for i in ids]
+
+
+def _words(catalog, movie_id):
+    fields = [catalog.title[movie_id], *catalog.directors.row(movie_id), *catalog.stars.row(movie_id)]
+    return {word for field in fields for word in tokenize(field)}
+
+
+def test_normalize_folds_accents_case_and_punctuation():
+    assert normalize('Léon: The Professional') == 'leon the professional'
+    assert normalize('  WALL·E ') == 'wall e'
+    assert tokenize('Amélie') == ['amelie']
+    assert tokenize('.*') == []
+
+
+def test_exact_and_prefix_matches(catalog, index):
+    assert _titles(catalog, index, 'shawshank redemption') == ['The Shawshank Redemption']
+    assert _titles(catalog, index, 'shaw')[0] == 'The Shawshank Redemption'  # the title outranks people
+    assert _titles(catalog, index, 'AMELIE') == ['Amélie']
+    assert _titles(catalog, index, 'leon')[0] == 'Léon: The Professional'
+
+
+def test_every_token_has_to_match(catalog, index):
+    ids, _ = index.search('star wars')
+    assert len(ids) == 3
+    for movie_id in ids:
+        words = _words(catalog, movie_id)
+        assert any(w.startswith('star') for w in words) and any(w.startswith('wars') for w in words)
+    assert _titles(catalog, index, 'nolan prestige') == ['The Prestige']
+
+
+def test_typos_within_the_edit_budget_match(catalog, index):
+    assert _titles(catalog, index, 'godfathr')[:2] == ['The Godfather', 'The Godfather Part II']
+    assert _titles(catalog, index, 'shawshenk') == ['The Shawshank Redemption']
+    assert _titles(catalog, index, 'christpher nolan') == _titles(catalog, index, 'christopher nolan')
+    assert _titles(catalog, index, 'hta') == []  # short tokens must match exactly or by prefix
+
+    exact, = index.search('godfather', limit=1)[1]
+    fuzzy, = index.search('godfathr', limit=1)[1]
+    assert fuzzy < exact
+
+
+def test_edit_distance_counts_swaps_as_one_edit():
+    assert edit_distance('nolan', 'nloan', 2) == 1
+    assert edit_distance('kitten', 'sitting', 3) == 3
+    assert edit_distance('kitten', 'sitting', 1) == 2  # stops past the limit
+
+
+@pytest.mark.parametrize('query', ['.*', '(', '[a-z]+', 'a+b', 'star wars.', '\\', '^$', '?'])
+def test_regex_characters_are_literal_text(catalog, index, query):
+    ids, scores = index.search(query)
+    expected_ids, expected_scores = index.search(' '.join(tokenize(query)))
+    assert ids.tolist() == expected_ids.tolist()
+    np.testing.assert_array_equal(scores, expected_scores)
+
+
+def test_words_in_title_order_get_the_phrase_bonus(catalog, index):
+    in_order = dict(zip(*(a.tolist() for a in index.search('dark knight'))))
+    swapped = dict(zip(*(a.tolist() for a in index.search('knight dark'))))
+    assert in_order.keys() == swapped.keys()
+    for movie_id in in_order:
+        assert in_order[movie_id] - swapped[movie_id] == pytest.approx(PHRASE_BONUS)
+    assert catalog.title[index.search('the dark knight', limit=1)[0][0]] == 'The Dark Knight'
+
+
+def test_results_can_be_restricted_to_a_subset(catalog, index):
+    everything, _ = index.search('godfather')
+    subset = np.array(sorted(everything[1:]), dtype=np.int32)
+    ids, _ = index.search('godfather', ids=subset)
+    assert sorted(ids.tolist()) == subset.tolist()
+    assert index.search('godfather', limit=1)[0].tolist() == everything[:1].tolist()
+
+
+@pytest.mark.parametrize('query', ['the', 'a', 'robert', 'star wars', 'christpher'])
+def test_a_limit_returns_the_head_of_the_full_ranking(index, query):
+    ids, scores = index.search(query)
+    for limit in (1, 5, 20):
+        top_ids, top_scores = index.search(query, limit=limit)
+        assert top_ids.tolist() == ids[:limit].tolist()
+        np.testing.assert_array_equal(top_scores, scores[:limit])
+
+
+def test_people_by_name(index):
+    assert index.people('directors', 'nolan') == ['Christopher Nolan']
+    assert index.people('stars', 'de niro') == ['Robert De Niro']
+    assert index.people('stars', 'niro robert') == ['Robert De Niro']
+    assert index.people('directors', '') == []
+    assert index.people('directors', 'zzzz') == []
+
+
+def test_suggest_completes_any_word_of_a_name(index):
+    assert index.suggest('nol') == [('Christopher Nolan', 'director'), ('Nick Nolte', 'star')]
+    assert index.suggest('christopher n') == [('Christopher Nolan', 'director')]
+    assert index.suggest('the god') == [('The Godfather', 'title'), ('The Godfather Part II', 'title')]
+    assert index.suggest('CHRIST', limit=3) == index.suggest('christ')[:3]
+    assert index.suggest('') == index.suggest('.*') == index.suggest('zzz') == []
+
+
+def test_suggest_lists_each_name_once(index):
+    suggestions = index.suggest('a', limit=500)
+    assert len(suggestions) == len(set(suggestions))
+    # A star credited on many movies is still a single suggestion
+    assert index.suggest('de niro') == [('Robert De Niro', 'star')]
@@ -0,0 +1,113 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from movierec import service
+from movierec.export import EXPORT_COLUMNS
+
+from conftest import DATASET
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    # Resources keep their caches under .cache in the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('service'))
+    os.environ['MOVIEREC_DATA'] = DATASET
+    try:
+        with TestClient(service.app) as client:
+            yield client
+    finally:
+        del os.environ['MOVIEREC_DATA']
+        os.chdir(cwd)
+
+
+def _titles(response):
+    assert response.status_code == 200, response.text
+    return [row['title'] for row in response.json()['results']]
+
+
+def test_version_and_metrics(client):
+    version = client.get('/version').json()
+    assert version['movies'] == 250 and len(version['version']) == 40
+    assert client.get('/search', params={'q': 'heat'}).headers['Server-Timing'].startswith('app;dur=')
+    assert 'movierec_requests_total' in client.get('/metrics').text
+    assert client.get('/metrics.json').status_code == 200
+
+
+def test_search(client):
+    assert _titles(client.get('/search', params={'q': 'godfathr', 'limit': 1})) == ['The Godfather']
+    assert _titles(client.get('/search', params={'q': '.*'})) == []
+    assert client.get('/search').status_code == 422
+    assert client.get('/search', params={'q': 'heat', 'limit': 0}).status_code == 422
+
+
+def test_recommend(client):
+    params = {'mood': 'Tense & Thrilling', 'era': 'Modern (2000-2009)', 'k': 3}
+    body = client.get('/recommend', params=params).json()
+    assert len(body['results']) == 3 and body['full_matches'] > 0
+    assert body['results'][0]['match'] == 1 and 2000 <= body['results'][0]['year'] <= 2009
+    assert all(0 < row['match'] <= 1 for row in body['results'])
+    assert client.get('/recommend', params=params).json() == body  # served from the quiz cache
+    assert client.get('/recommend', params={'k': 0}).status_code == 422
+    assert client.get('/recommend', params={'rating': 'high'}).status_code == 422
+
+
+def test_top(client):
+    assert _titles(client.get('/top', params={'n': 1})) == ['The Shawshank Redemption']
+    nolan = client.get('/top', params={'by': 'director', 'value': 'Christopher Nolan', 'n': 2, 'decade': 2000})
+    assert len(_titles(nolan)) == 2 and nolan.json()['decade'] == 2000
+    assert _titles(client.get('/top', params={'by': 'genre', 'value': 'No Such Genre'})) == []
+
+    for params in ({'by': 'studio'}, {'by': 'genre'}, {'by': 'decade', 'value': 'nineties'},
+                   {'by': 'genre', 'value': 'Drama', 'genre': 'Crime'}, {'n': 501}):
+        assert client.get('/top', params=params).status_code == 422, params
+
+
+def test_similar(client):
+    titles = _titles(client.get('/similar', params={'title': 'The Godfather', 'k': 3}))
+    assert len(titles) == 3 and 'The Godfather' not in titles
+    assert client.get('/similar', params={'title': 'No Such Movie'}).status_code == 404
+    assert client.get('/similar', params={'title': 'The Godfather', 'k': 0}).status_code == 422
+
+
+def test_between(client):
+    titles = _titles(client.get('/between', params={'title': ['Heat', 'Alien'], 'k': 4}))
+    assert len(titles) == 4 and not {'Heat', 'Alien'} & set(titles)
+    response = client.get('/between', params={'title': ['Heat', 'No Such Movie']})
+    assert response.status_code == 404 and 'No Such Movie' in response.json()['detail']
+    assert client.get('/between', params={'title': ['Heat']}).status_code == 422
+
+
+def test_compare(client):
+    body = client.get('/compare', params={'title': ['Heat', 'Alien', 'The Godfather']}).json()
+    assert [movie['title'] for movie in body['movies']] == ['Heat', 'Alien', 'The Godfather']
+    assert body['matrices']
+    assert client.get('/compare', params={'title': ['Heat', 'No Such Movie']}).status_code == 404
+    assert client.get('/compare', params={'title': ['Heat']}).status_code == 422
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl', 'parquet'])
+def test_export(client, fmt):
+    response = client.get('/export', params={'format': fmt, 'genre': 'Crime', 'year_min': 1990,
+                                             'sort_by': 'year', 'descending': False})
+    assert response.status_code == 200
+    assert f'movies.{fmt}' in response.headers['content-disposition']
+    data = io.BytesIO(response.content)
+    table = {'csv': pd.read_csv, 'jsonl': lambda f: pd.read_json(f, lines=True), 'parquet': pd.read_parquet}[fmt](data)
+    assert list(table.columns) == list(EXPORT_COLUMNS)
+    assert len(table) and (table['year'] >= 1990).all() and table['year'].is_monotonic_increasing
+    assert table['genres'].str.split(', ').apply(lambda labels: 'Crime' in labels).all()
+
+
+def test_export_rejects_bad_parameters(client):
+    assert client.get('/export', params={'format': 'xlsx'}).status_code == 422
+    assert client.get('/export', params={'sort_by': 'imdb_id'}).status_code == 422
+    assert client.get('/export', params={'min_rating': 'high'}).status_code == 422
+
+
+def test_unknown_paths_are_404(client):
+    assert client.get('/nope').status_code == 404
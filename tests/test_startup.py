@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from movierec.startup import check, profile
+
+from conftest import ROOT
+
+# Opt in with MOVIEREC_STARTUP_TEST=1; budgets in ms can be overridden for slower machines
+pytestmark = pytest.mark.skipif(not os.environ.get('MOVIEREC_STARTUP_TEST'),
+                                reason="set MOVIEREC_STARTUP_TEST=1 to profile a cold start of the app")
+
+BUDGETS = {
+    'max_first_paint': float(os.environ.get('MOVIEREC_MAX_FIRST_PAINT', 3000)),
+    'max_navigation': float(os.environ.get('MOVIEREC_MAX_NAVIGATION', 1000)),
+    'max_rerun': float(os.environ.get('MOVIEREC_MAX_RERUN', 300)),
+}
+
+
+def test_startup_is_within_budget():
+    report = profile(os.path.join(ROOT, 'app.py'))
+
+    assert set(report['pages']) and report['first_page'] in report['pages']
+    assert check(report, **BUDGETS) == []
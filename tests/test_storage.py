@@ -0,0 +1,154 @@
+import gc
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from movierec import storage
+from movierec.catalog import MULTI_VALUED, load_catalog
+from movierec.storage import Lease, collect, load_cached_catalog, remove_version
+
+from conftest import DATASET
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'movies.csv'
+    shutil.copy(DATASET, path)
+    return str(path)
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return str(tmp_path / 'store')
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Versions built by ``build_store`` during the test, in order."""
+    built = []
+    build_store = storage.build_store
+
+    def counted(csv_path, store_dir):
+        catalog = build_store(csv_path, store_dir)
+        built.append(catalog.version)
+        return catalog
+
+    monkeypatch.setattr(storage, 'build_store', counted)
+    return built
+
+
+def _manifest(store_dir):
+    with open(os.path.join(store_dir, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _edit(csv_path, old, new):
+    with open(csv_path, encoding='utf-8-sig') as f:
+        text = f.read()
+    assert old in text
+    with open(csv_path, 'w', encoding='utf-8-sig') as f:
+        f.write(text.replace(old, new, 1))
+
+
+def _versions(store_dir):
+    return sorted(entry.name for entry in os.scandir(store_dir) if entry.is_dir() and not entry.name.startswith('.'))
+
+
+def test_round_trip_equals_the_parsed_csv(csv_path, store_dir, builds):
+    parsed = load_catalog(csv_path)
+    stored = load_cached_catalog(csv_path, store_dir)
+    mapped = load_cached_catalog(csv_path, store_dir)
+
+    assert builds == [parsed.version]  # the second load maps the store
+    for catalog in (stored, mapped):
+        assert catalog.version == parsed.version
+        assert list(catalog.df.columns) == list(parsed.df.columns)
+        assert catalog.df.astype(object).values.tolist() == parsed.df.astype(object).values.tolist()
+        for name in ('year', 'rating', 'minutes', 'decade', 'era'):
+            np.testing.assert_array_equal(getattr(catalog, name), getattr(parsed, name))
+        for name in MULTI_VALUED:
+            column, expected = getattr(catalog, name), getattr(parsed, name)
+            assert list(column.vocab) == list(expected.vocab)
+            np.testing.assert_array_equal(column.offsets, expected.offsets)
+            np.testing.assert_array_equal(column.codes, expected.codes)
+            np.testing.assert_array_equal(catalog.index[name].postings, parsed.index[name].postings)
+            np.testing.assert_array_equal(catalog.index[name].offsets, parsed.index[name].offsets)
+        assert list(catalog.title) == list(parsed.title)
+        assert catalog.find('Heat') == parsed.find('Heat')
+
+
+def test_a_touched_csv_is_rehashed_but_not_rebuilt(csv_path, store_dir, builds):
+    first = load_cached_catalog(csv_path, store_dir)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    again = load_cached_catalog(csv_path, store_dir)
+    assert again.version == first.version
+    assert builds == [first.version]
+    assert _manifest(store_dir)['mtime_ns'] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_content_is_rebuilt(csv_path, store_dir, builds):
+    first = load_cached_catalog(csv_path, store_dir)
+
+    # Same size, new mtime: only the hash can tell
+    _edit(csv_path, ',9.3,', ',9.4,')
+    assert os.path.getsize(csv_path) == _manifest(store_dir)['size']
+    same_size = load_cached_catalog(csv_path, store_dir)
+    assert same_size.version != first.version
+    assert same_size.rating[0] == pytest.approx(9.4)
+
+    # New size
+    _edit(csv_path, 'The Shawshank Redemption', 'The Shawshank Redemption (Director\'s Cut)')
+    resized = load_cached_catalog(csv_path, store_dir)
+    assert resized.title[0] == "The Shawshank Redemption (Director's Cut)"
+    assert builds == [first.version, same_size.version, resized.version]
+    assert _manifest(store_dir)['version'] == resized.version
+
+
+def test_collect_keeps_a_version_while_it_is_leased(csv_path, store_dir):
+    old = load_cached_catalog(csv_path, store_dir)
+    old_version = old.version
+    _edit(csv_path, ',9.3,', ',9.4,')
+    new = load_cached_catalog(csv_path, store_dir)
+
+    # build_store collected, but the first catalog still holds its lease
+    assert _versions(store_dir) == sorted([old_version, new.version])
+    assert collect(store_dir, keep=(new.version,)) == []
+    assert old.rating[0] == pytest.approx(9.3)  # its mapping is still readable
+    assert not remove_version(os.path.join(store_dir, old_version))
+
+    del old
+    gc.collect()  # the Catalog's finalizer releases the lease
+    assert collect(store_dir, keep=(new.version,)) == [old_version]
+    assert _versions(store_dir) == [new.version]
+
+
+def test_a_lease_cannot_be_taken_on_a_removed_version(csv_path, store_dir):
+    catalog = load_cached_catalog(csv_path, store_dir)
+    version_dir = os.path.join(store_dir, catalog.version)
+    catalog.lease.release()
+
+    assert remove_version(version_dir)
+    with pytest.raises(OSError):
+        Lease(version_dir)
+
+
+@pytest.mark.parametrize('stale', [
+    {'version': '0' * 40},  # removed meanwhile
+    {'format': storage.FORMAT_VERSION - 1},
+    {'source': '/elsewhere/movies.csv'},
+])
+def test_a_stale_manifest_is_ignored(csv_path, store_dir, builds, stale):
+    first = load_cached_catalog(csv_path, store_dir)
+    storage._write_manifest(store_dir, {**_manifest(store_dir), **stale})
+
+    catalog = load_cached_catalog(csv_path, store_dir)
+    assert catalog.version == first.version
+    assert len(catalog) == len(first)
+    assert builds == [first.version, first.version]
+    assert _manifest(store_dir)['version'] == first.version
+    assert _manifest(store_dir)['source'] == os.path.abspath(csv_path)
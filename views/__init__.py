@@ -0,0 +1,5 @@
+"""One module per page of app.py, each with a ``render(resources)`` function.
+
+Modules are imported on first navigation to their page, so a worker only
+pays for the pages (and libraries, such as Plotly) it actually serves.
+"""
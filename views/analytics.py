@@ -0,0 +1,89 @@
+"""Analytics page: trends, genres, directors and ratings of the whole catalog."""
+
+import streamlit as st
+
+from components import static_chart
+from movierec.aggregates import get_aggregates
+
+
+def render(resources):
+    catalog = resources.catalog
+    aggregates = get_aggregates(catalog)
+    
+    st.markdown('<h1 class="main-header">📊 Movie Analytics</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["📈 Trends", "🎭 Genres", "🎬 Directors", "⭐ Ratings"])
+    
+    with tab1:
+        st.markdown("### Year-based Trends")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Movies over time
+            static_chart(catalog, 'analytics/per year')
+        
+        with col2:
+            # Average rating by decade
+            static_chart(catalog, 'analytics/decade rating')
+        
+        # Duration analysis
+        st.markdown("### Duration Analysis")
+        static_chart(catalog, 'analytics/duration')
+    
+    with tab2:
+        st.markdown("### Genre Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Top genres bar chart
+            static_chart(catalog, 'analytics/top genres')
+        
+        with col2:
+            # Genre distribution pie chart (top 10)
+            static_chart(catalog, 'analytics/genre share')
+        
+        # Genre combinations
+        st.markdown("### Popular Genre Combinations")
+        st.dataframe(aggregates.genre_combinations.head(10), use_container_width=True)
+    
+    with tab3:
+        st.markdown("### Director Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Top directors chart
+            static_chart(catalog, 'analytics/director counts')
+        
+        with col2:
+            # Director average ratings (only directors with at least 2 movies)
+            static_chart(catalog, 'analytics/director ratings')
+    
+    with tab4:
+        st.markdown("### Rating Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Rating distribution
+            static_chart(catalog, 'analytics/ratings')
+        
+        with col2:
+            # Rating vs Year scatter
+            static_chart(catalog, 'analytics/rating vs year')
+        
+        # Statistics
+        st.markdown("### Rating Statistics")
+        stats = aggregates.rating_stats
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Mean", f"{stats['mean']:.2f}")
+        with col2:
+            st.metric("Median", f"{stats['median']:.2f}")
+        with col3:
+            st.metric("Std Dev", f"{stats['std']:.2f}")
+        with col4:
+            st.metric("Range", f"{stats['min']:.1f} - {stats['max']:.1f}")
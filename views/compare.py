@@ -0,0 +1,126 @@
+"""Compare Movies page: any number of movies side by side, and what else is like them."""
+
+import plotly.express as px
+import streamlit as st
+
+from movierec import metrics
+from movierec.compare import Comparison
+
+COLORS = ['#E50914', '#667eea', '#764ba2']
+
+MATRICES = {
+    "Overall": 'similarity',
+    "Genres": 'genres',
+    "Directors": 'directors',
+    "Stars": 'stars',
+    "Runtime (minutes apart)": 'minutes difference',
+    "Year (years apart)": 'year difference',
+    "Rating (points apart)": 'rating difference',
+}
+
+DIFFERENCE_FORMATS = {'rating difference': '.1f'}
+
+
+def _grid(items, per_row=3):
+    """Yield (column, item) pairs, ``per_row`` columns at a time."""
+    for start in range(0, len(items), per_row):
+        for col, item in zip(st.columns(per_row), items[start:start + per_row]):
+            yield col, item
+
+
+def render(resources):
+    catalog = resources.catalog
+    titles = catalog.titles
+
+    st.markdown('<h1 class="main-header">🎭 Compare Movies</h1>', unsafe_allow_html=True)
+
+    st.markdown("### Select movies to compare")
+
+    picked = st.multiselect("Movies", titles.sorted_labels, default=titles.sorted_labels[:2],
+                            help="Pick two or more; titles carry their year so remakes stay apart")
+
+    if len(picked) < 2:
+        st.info("👆 Pick at least two movies to compare.")
+        return
+
+    with metrics.timer('movierec_compare_seconds'):
+        comparison = Comparison(catalog, titles.ids(picked))
+    rows = comparison.rows
+
+    # Display comparison
+    st.markdown("---")
+
+    # Basic info comparison
+    st.markdown("### Basic Information")
+
+    for col, (_, movie_data) in _grid(list(rows.iterrows())):
+        with col:
+            st.markdown(f"""
+            <div class="movie-card">
+                <h3>{movie_data['title']}</h3>
+                <p><strong>Year:</strong> {movie_data['year']}</p>
+                <p><strong>Rating:</strong> ⭐ {movie_data['rating']}</p>
+                <p><strong>Duration:</strong> {movie_data['duration']}</p>
+                <p><strong>Genres:</strong> {movie_data['genres']}</p>
+                <p><strong>Director:</strong> {movie_data['directors']}</p>
+                <p><strong>Stars:</strong> {movie_data['stars']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Visual comparison
+    st.markdown("### Visual Comparison")
+
+    labels = list(comparison.labels)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Rating comparison
+        with metrics.timer('movierec_chart_seconds', chart='compare/rating'):
+            fig = px.bar(x=labels, y=rows['rating'].to_numpy(),
+                        title='Rating Comparison',
+                        labels={'x': 'Movie', 'y': 'Rating'})
+            fig.update_traces(marker_color=[COLORS[i % len(COLORS)] for i in range(len(labels))])
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        # Year comparison
+        with metrics.timer('movierec_chart_seconds', chart='compare/year'):
+            fig = px.bar(x=labels, y=rows['year'].to_numpy(),
+                        title='Release Year Comparison',
+                        labels={'x': 'Movie', 'y': 'Year'})
+            fig.update_traces(marker_color=[COLORS[(i + 2) % len(COLORS)] for i in range(len(labels))])
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Pairwise matrix
+    st.markdown("### 🧮 How Alike Are They?")
+
+    matrix_name = st.selectbox("Compare by", list(MATRICES), key="compare_matrix")
+    matrix = comparison.matrices()[MATRICES[matrix_name]]
+    is_difference = MATRICES[matrix_name].endswith('difference')
+    # Ratings are apart by fractions of a point; runtimes and years by whole units
+    text_format = DIFFERENCE_FORMATS.get(MATRICES[matrix_name], '.0f') if is_difference else '.0%'
+    with metrics.timer('movierec_chart_seconds', chart='compare/matrix'):
+        fig = px.imshow(matrix, x=labels, y=labels, text_auto=text_format,
+                        zmin=None if is_difference else 0, zmax=None if is_difference else 1,
+                        color_continuous_scale='Reds_r' if is_difference else 'Reds')
+        fig.update_layout(height=max(400, 40 * len(labels)))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # More like this
+    st.markdown("### 🎞️ More Like This")
+
+    similarity = resources.similarity
+
+    for col, label in _grid(labels):
+        with col:
+            st.markdown(f"**Because you picked {label}:**")
+            for _, row in similarity.similar(label, k=5).iterrows():
+                st.markdown(f"- {row['title']} ({row['year']}) · ⭐ {row['rating']} · {row['similarity']:.0%} similar")
+
+    st.markdown("### 🧭 Somewhere In Between")
+    st.caption("Movies closest to all of your picks at once")
+
+    between_ids, scores = resources.ann.between_ids(comparison.ids, k=5)
+    for (_, row), score in zip(catalog.df.iloc[between_ids].iterrows(), scores):
+        st.markdown(f"- {row['title']} ({row['year']}) · ⭐ {row['rating']} · {score:.0%} similar")
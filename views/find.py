@@ -0,0 +1,111 @@
+"""Find Movies page: filters, search with suggestions, paginated results and exports."""
+
+import streamlit as st
+
+from components import download_export, paginate
+from movierec import metrics
+from movierec.pipeline import FilterPipeline
+
+
+def render(resources):
+    catalog = resources.catalog
+    df = catalog.df
+    
+    st.markdown('<h1 class="main-header">🔍 Find Your Perfect Movie</h1>', unsafe_allow_html=True)
+    
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        # Genre filter
+        selected_genres = st.multiselect("Select Genres", catalog.genres.vocab.tolist(), default=[])
+        genre_match = st.radio("Match", ["Any selected genre", "All selected genres"],
+                               horizontal=True, label_visibility="collapsed")
+    
+    with col2:
+        # Year range
+        year_range = st.slider("Year Range", 
+                               int(df['year'].min()), 
+                               int(df['year'].max()),
+                               (int(df['year'].min()), int(df['year'].max())))
+    
+    with col3:
+        # Rating filter
+        min_rating = st.slider("Minimum Rating", 
+                              float(df['rating'].min()), 
+                              float(df['rating'].max()),
+                              float(df['rating'].min()))
+    
+    # Search box with autocomplete suggestions
+    def use_suggestion(label):
+        st.session_state.search_term = label
+    
+    search_term = st.text_input("🔎 Search by title, director, or actor", key="search_term")
+    
+    suggestions = catalog.search_index.suggest(search_term, limit=5) if len(search_term.strip()) >= 2 else []
+    suggestions = [(label, kind) for label, kind in suggestions if label != search_term]
+    if suggestions:
+        kind_icons = {'title': '🎬', 'director': '🎥', 'star': '⭐'}
+        cols = st.columns(len(suggestions))
+        for col, (label, kind) in zip(cols, suggestions):
+            with col:
+                st.button(f"{kind_icons[kind]} {label}", key=f"suggest_{kind}_{label}",
+                          on_click=use_suggestion, args=(label,), use_container_width=True)
+    
+    # Apply filters, reusing cached stages whose inputs did not change
+    if st.session_state.get('find_movies_pipeline') is None or \
+            st.session_state.find_movies_pipeline.catalog is not catalog:
+        st.session_state.find_movies_pipeline = FilterPipeline(catalog)
+    pipeline = st.session_state.find_movies_pipeline
+    
+    filters = dict(
+        genres=selected_genres,
+        match_all=genre_match == "All selected genres",
+        years=year_range,
+        min_rating=min_rating,
+        search=search_term,
+    )
+    movie_ids = pipeline.run(**filters)
+    
+    # Display results
+    st.markdown(f"### Found {len(movie_ids)} movies")
+    
+    if len(movie_ids) > 0:
+        # Sort options
+        sort_options = {
+            "Relevance": (None, False),
+            "Rating (High to Low)": ('rating', True),
+            "Rating (Low to High)": ('rating', False),
+            "Year (Newest)": ('year', True),
+            "Year (Oldest)": ('year', False),
+            "Title (A-Z)": ('title', False),
+        }
+        if not search_term.strip():
+            del sort_options["Relevance"]
+        sort_by = st.selectbox("Sort by", list(sort_options))
+        
+        column, descending = sort_options[sort_by]
+        movie_ids = pipeline.run(**filters, sort_by=column, descending=descending)
+        
+        # Display movies, one page at a time
+        page_ids, _ = paginate(movie_ids, key="find_movies")
+        with metrics.timer('movierec_render_seconds', section='find/results'):
+            for idx, row in df.iloc[page_ids].iterrows():
+                with st.expander(f"⭐ {row['rating']} | {row['title']} ({row['year']})"):
+                    col1, col2 = st.columns([2, 1])
+                
+                    with col1:
+                        st.markdown(f"**🎭 Genres:** {row['genres']}")
+                        st.markdown(f"**🎬 Director:** {row['directors']}")
+                        st.markdown(f"**⭐ Stars:** {row['stars']}")
+                        st.markdown(f"**⏱️ Duration:** {row['duration']}")
+                
+                    with col2:
+                        st.metric("Rating", row['rating'])
+                        st.metric("Year", row['year'])
+        
+        # Download option
+        st.markdown("---")
+        download_export(catalog, movie_ids, key="find", file_stem="filtered_movies", label="📥 Download Results")
+    else:
+        st.warning("No movies found with the selected filters. Try adjusting your criteria.")
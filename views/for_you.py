@@ -0,0 +1,88 @@
+"""For You page: personal ratings and collaborative-filtering picks."""
+
+import streamlit as st
+
+from movierec.collaborative import CollaborativeRecommender
+from movierec.ratings import RatingStore, movie_keys
+
+
+# Ratings are shared by every session; new ones count straight away (folded into the
+# user's vector), the model retrains in the background as they pile up and is rebuilt
+# for each dataset version
+@st.cache_resource
+def load_ratings():
+    return RatingStore()
+
+
+@st.cache_resource(max_entries=2)
+def load_recommender(version, _catalog):
+    return CollaborativeRecommender(load_ratings(), _catalog)
+
+
+def render(resources):
+    catalog = resources.catalog
+    df = catalog.df
+    
+    st.markdown('<h1 class="main-header">💖 For You</h1>', unsafe_allow_html=True)
+    
+    store = load_ratings()
+    recommender = load_recommender(catalog.version, catalog)
+    keys = movie_keys(catalog)
+    key_ids = {key: i for i, key in enumerate(keys)}
+    
+    user = st.text_input("Your name", key="rating_user", help="Ratings are saved under this name").strip()
+    
+    if not user:
+        st.info("👆 Enter a name to rate movies and get picks based on what people with similar taste liked.")
+    else:
+        st.markdown("### ⭐ Rate a movie")
+        
+        titles = catalog.titles
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            movie = titles.id(st.selectbox("Movie", titles.sorted_labels))
+        with col2:
+            score = st.slider("Your rating", 1, 10, 8)
+        with col3:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("💾 Save", use_container_width=True):
+                store.rate(user, keys[movie], score)
+                recommender.refresh()
+        
+        user_ratings = store.user_ratings(user)
+        rated = [(key_ids[key], value) for key, value in user_ratings.items() if key in key_ids]
+        
+        with st.expander(f"📝 Your ratings ({len(rated)})"):
+            for i, value in rated:
+                col1, col2 = st.columns([5, 1])
+                col1.markdown(f"{titles.label(i)} · **{value:g}**/10")
+                if col2.button("🗑️", key=f"unrate_{keys[i]}"):
+                    store.unrate(user, keys[i])
+                    recommender.refresh()
+                    st.rerun()
+        
+        st.markdown("### 🎬 Recommended for you")
+        
+        result = recommender.recommend(user, k=10)
+        model = recommender.model
+        if result is None:
+            st.info("⏳ The recommender is training on everyone's ratings; check back in a moment.")
+        elif not rated:
+            st.info("Rate a few movies you've seen to get personal picks.")
+        else:
+            ids, predicted = result
+            for idx, (i, row) in enumerate(df.iloc[ids].iterrows(), 1):
+                st.markdown(f"""
+                <div class="movie-card">
+                    <h4>#{idx} - {row['title']} ({row['year']})</h4>
+                    <p>🔮 Predicted: {min(predicted[idx - 1], 10):.1f} | ⭐ IMDB: {row['rating']} | 🎭 {row['genres']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        count, users = store.stats()
+        status = f"{count} ratings from {users} people"
+        if model is not None:
+            status += f" · model trained on {model.ratings} ratings"
+        if recommender.training:
+            status += " · retraining…"
+        st.caption(status)
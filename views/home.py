@@ -0,0 +1,80 @@
+"""Home page: headline numbers, top rated and recent movies, and quick charts."""
+
+import streamlit as st
+
+from components import static_chart
+from movierec.aggregates import get_aggregates
+
+
+def render(resources):
+    catalog = resources.catalog
+    df = catalog.df
+    aggregates = get_aggregates(catalog)
+    
+    st.markdown('<h1 class="main-header">🎬 IMDB Top 250 Movie Recommender</h1>', unsafe_allow_html=True)
+    
+    # Statistics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.metric("Total Movies", aggregates.total_movies)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.metric("Avg Rating", f"{aggregates.rating_stats['mean']:.2f}")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.metric("Year Range", "{}-{}".format(*aggregates.year_range))
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.metric("Unique Genres", aggregates.unique_genres)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Featured Section
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<h2 class="sub-header">🏆 Top Rated Movies</h2>', unsafe_allow_html=True)
+        top_5 = df.nlargest(5, 'rating')[['title', 'year', 'rating', 'genres']]
+        for idx, row in top_5.iterrows():
+            st.markdown(f"""
+            <div class="movie-card">
+                <h3>{row['title']} ({row['year']})</h3>
+                <p>⭐ Rating: {row['rating']}</p>
+                <p>🎭 Genres: {row['genres']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<h2 class="sub-header">🎬 Recent Additions</h2>', unsafe_allow_html=True)
+        recent_5 = df.nlargest(5, 'year')[['title', 'year', 'rating', 'genres']]
+        for idx, row in recent_5.iterrows():
+            st.markdown(f"""
+            <div class="movie-card">
+                <h3>{row['title']} ({row['year']})</h3>
+                <p>⭐ Rating: {row['rating']}</p>
+                <p>🎭 Genres: {row['genres']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Quick Stats Visualization
+    st.markdown("---")
+    st.markdown('<h2 class="sub-header">📈 Quick Insights</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Movies per decade
+        static_chart(catalog, 'home/decades')
+    
+    with col2:
+        # Rating distribution
+        static_chart(catalog, 'home/ratings')
@@ -0,0 +1,180 @@
+"""Movie Quiz page: a short questionnaire scored against the whole catalog."""
+
+import streamlit as st
+
+from components import download_export
+from movierec import metrics
+from movierec.engine import DURATIONS, MOOD_GENRES, STORY_GENRES
+
+
+def render(resources):
+    catalog = resources.catalog
+    df = catalog.df
+    
+    st.markdown('<h1 class="main-header">🎯 Find Your Perfect Movie</h1>', unsafe_allow_html=True)
+    st.markdown("### Answer a few questions to get personalized movie recommendations!")
+    
+    # Initialize session state
+    if 'quiz_completed' not in st.session_state:
+        st.session_state.quiz_completed = False
+    if 'quiz_answers' not in st.session_state:
+        st.session_state.quiz_answers = {}
+    
+    # Quiz form
+    with st.form("movie_quiz"):
+        st.markdown("#### 1️⃣ What's your mood today?")
+        mood = st.radio(
+            "Select your mood:",
+            list(MOOD_GENRES),
+            key="mood"
+        )
+        
+        st.markdown("#### 2️⃣ What type of story interests you?")
+        story_type = st.multiselect(
+            "Choose up to 3 story types:",
+            list(STORY_GENRES),
+            max_selections=3,
+            key="story_type"
+        )
+        
+        st.markdown("#### 3️⃣ How much time do you have?")
+        duration_pref = st.radio(
+            "Movie length preference:",
+            list(DURATIONS),
+            key="duration"
+        )
+        
+        st.markdown("#### 4️⃣ When do you prefer movies from?")
+        era = st.radio(
+            "Time period:",
+            catalog.era_labels + ["Any era"],
+            key="era"
+        )
+        
+        st.markdown("#### 5️⃣ What rating range are you looking for?")
+        rating_pref = st.slider(
+            "Minimum rating:",
+            float(df['rating'].min()), 
+            float(df['rating'].max()),
+            8.0,
+            0.1,
+            key="rating"
+        )
+        
+        st.markdown("#### 6️⃣ Do you have a favorite director?")
+        favorite_director = st.selectbox(
+            "Select a director (optional):",
+            ["Any"] + catalog.directors.vocab.tolist(),
+            key="director"
+        )
+        
+        st.markdown("#### 7️⃣ Any specific actor you'd like to see?")
+        actor_search = st.text_input(
+            "Enter actor name (optional):",
+            key="actor"
+        )
+        
+        # Submit button
+        submitted = st.form_submit_button("🎬 Get My Recommendations!", use_container_width=True)
+        
+        if submitted:
+            st.session_state.quiz_completed = True
+            st.session_state.quiz_answers = {
+                'mood': mood,
+                'story_type': story_type,
+                'duration': duration_pref,
+                'era': era,
+                'rating': rating_pref,
+                'director': favorite_director,
+                'actor': actor_search
+            }
+    
+    # Show recommendations if quiz completed
+    if st.session_state.quiz_completed:
+        st.markdown("---")
+        st.markdown('<h2 class="sub-header">🎯 Your Personalized Recommendations</h2>', unsafe_allow_html=True)
+        
+        answers = st.session_state.quiz_answers
+        
+        # Score every movie against the answers, or reuse the result of an earlier identical quiz
+        quiz_result = resources.quiz_cache.recommend(resources.engine, answers, k=10)
+        recommendations = quiz_result.recommendations
+        full_matches = recommendations.full_matches
+        
+        # Display results
+        st.markdown(f"### 🎬 Found {len(full_matches)} movies matching your preferences!")
+        
+        if len(recommendations) > 0:
+            if len(full_matches) == 0:
+                st.warning("😅 No movie matches all your preferences, so here are the closest matches instead.")
+            
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.markdown("#### 🏆 Top Recommendations")
+            with col2:
+                if st.button("🔄 Reset Quiz"):
+                    st.session_state.quiz_completed = False
+                    st.session_state.quiz_answers = {}
+                    st.rerun()
+            
+            feature_labels = {'mood': 'Mood', 'story': 'Story', 'duration': 'Length', 'era': 'Era',
+                              'rating': 'Rating', 'director': 'Director', 'actor': 'Actor'}
+            top_recommendations = df.iloc[recommendations.ids]
+            
+            with metrics.timer('movierec_render_seconds', section='quiz/results'):
+                for idx, (i, row) in enumerate(top_recommendations.iterrows(), 1):
+                    breakdown = recommendations.breakdown[idx - 1]
+                    checks = ' '.join(
+                        f"{'✅' if breakdown[j] >= 1 else '➖' if breakdown[j] > 0 else '❌'} {feature_labels[feature]}"
+                        for j, feature in enumerate(recommendations.features)
+                        if feature in feature_labels and feature in recommendations.active
+                    )
+                    st.markdown(f"""
+                    <div class="movie-card">
+                        <h3>#{idx} - {row['title']} ({row['year']})</h3>
+                        <p><strong>🎯 Match:</strong> {recommendations.match[idx - 1]:.0%} &nbsp; {checks}</p>
+                        <p><strong>⭐ Rating:</strong> {row['rating']}</p>
+                        <p><strong>🎭 Genres:</strong> {row['genres']}</p>
+                        <p><strong>🎬 Director:</strong> {row['directors']}</p>
+                        <p><strong>⭐ Stars:</strong> {row['stars']}</p>
+                        <p><strong>⏱️ Duration:</strong> {row['duration']}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            
+            # Nearest neighbours of the answers themselves, beyond the ranked list
+            st.markdown("#### 🧭 Also Close to Your Answers")
+            nearby_ids, _ = resources.ann.answer_ids(answers, k=5, exclude=recommendations.ids)
+            for _, row in df.iloc[nearby_ids].iterrows():
+                st.markdown(f"- {row['title']} ({row['year']}) · ⭐ {row['rating']} · {row['genres']}")
+            
+            # Show match breakdown
+            st.markdown("---")
+            st.markdown("#### 📊 Your Preference Summary")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.info(f"**Mood:** {answers['mood']}")
+                st.info(f"**Era:** {answers['era']}")
+            
+            with col2:
+                story_types = ', '.join(answers['story_type']) if answers['story_type'] else "Any"
+                st.info(f"**Story Types:** {story_types}")
+                st.info(f"**Min Rating:** {answers['rating']}")
+            
+            with col3:
+                st.info(f"**Duration:** {answers['duration']}")
+                director_display = answers['director'] if answers['director'] != "Any" else "Any"
+                st.info(f"**Director:** {director_display}")
+            
+            # Download option
+            st.markdown("---")
+            export_ids = full_matches if len(full_matches) > 0 else recommendations.ids
+            download_export(catalog, export_ids, key="quiz", file_stem="my_movie_recommendations",
+                            label="📥 Download All Recommendations")
+        else:
+            st.warning("😅 No movies found matching all your preferences. Try adjusting your answers!")
+            if st.button("🔄 Try Again"):
+                st.session_state.quiz_completed = False
+                st.session_state.quiz_answers = {}
+                st.rerun()
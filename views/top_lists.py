@@ -0,0 +1,89 @@
+"""Top Lists page: best movies overall and by decade, genre and director."""
+
+import streamlit as st
+
+from components import paginate
+from movierec import core
+from movierec.ranked import get_ranked
+
+
+def render(resources):
+    catalog = resources.catalog
+    df = catalog.df
+    ranked = get_ranked(catalog)
+    decades = ranked.labels('decade')[::-1].tolist()
+    
+    st.markdown('<h1 class="main-header">⭐ Top Lists</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["🏆 Top Rated", "📅 By Decade", "🎭 By Genre", "🎬 By Director"])
+    
+    with tab1:
+        st.markdown("### Top 20 Highest Rated Movies")
+        
+        top_20 = df.iloc[core.top_ids(catalog, 'rating', n=20)]
+        
+        for idx, (i, row) in enumerate(top_20.iterrows(), 1):
+            with st.expander(f"#{idx} - {row['title']} ({row['year']}) - ⭐ {row['rating']}"):
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Genres:** {row['genres']}")
+                    st.markdown(f"**Director:** {row['directors']}")
+                with col2:
+                    st.metric("Rating", row['rating'])
+    
+    with tab2:
+        st.markdown("### Top Movies by Decade")
+        
+        decade = st.selectbox("Select Decade", decades)
+        
+        decade_movies = df.iloc[core.top_ids(catalog, 'decade', decade, n=10)]
+        
+        for idx, (i, row) in enumerate(decade_movies.iterrows(), 1):
+            st.markdown(f"""
+            <div class="movie-card">
+                <h4>#{idx} - {row['title']} ({row['year']})</h4>
+                <p>⭐ Rating: {row['rating']} | 🎭 {row['genres']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with tab3:
+        st.markdown("### Top Movies by Genre")
+        
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            selected_genre = st.selectbox("Select Genre", catalog.genres.vocab.tolist())
+        with col2:
+            genre_decade = st.selectbox("Decade", ["Any decade"] + [f"{d}s" for d in decades], key="top_genre_decade")
+        
+        if genre_decade == "Any decade":
+            genre_ids = core.top_ids(catalog, 'genre', selected_genre)
+        else:
+            genre_ids = core.top_ids(catalog, 'genre', selected_genre, decade=int(genre_decade[:-1]))
+        page_ids, start = paginate(genre_ids, key="top_genre", page_size=10)
+        
+        for idx, (i, row) in enumerate(df.iloc[page_ids].iterrows(), start + 1):
+            st.markdown(f"""
+            <div class="movie-card">
+                <h4>#{idx} - {row['title']} ({row['year']})</h4>
+                <p>⭐ Rating: {row['rating']} | 🎬 Director: {row['directors']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with tab4:
+        st.markdown("### Movies by Director")
+        
+        selected_director = st.selectbox("Select Director", catalog.directors.vocab.tolist())
+        
+        director_ids = core.top_ids(catalog, 'director', selected_director)
+        
+        st.markdown(f"**{selected_director}** has **{len(director_ids)}** movie(s) in Top 250")
+        
+        page_ids, _ = paginate(director_ids, key="top_director", page_size=10)
+        for idx, (i, row) in enumerate(df.iloc[page_ids].iterrows(), 1):
+            st.markdown(f"""
+            <div class="movie-card">
+                <h4>{row['title']} ({row['year']})</h4>
+                <p>⭐ Rating: {row['rating']} | 🎭 {row['genres']}</p>
+                <p>⏱️ Duration: {row['duration']}</p>
+            </div>
+            """, unsafe_allow_html=True)